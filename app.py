@@ -3,18 +3,34 @@ SpamShield AI - Premium Spam Detection Platform
 Enterprise-grade spam detection powered by advanced AI
 """
 
-from flask import Flask, render_template, request, jsonify
-from src.pipeline.predict_pipeline import predict, customdata
 import os
 import logging
+import functools
 import traceback
+import time
 import secrets
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from src.pipeline.memory_report import start_tracing_from_env, memory_debug_mode, memory_report
+from src.pipeline.startup import startup_timer, startup_profile_enabled
+
+# MEMORY_DEBUG=trace: trace Python allocations from here on, so the imports
+# below are attributed in /debug/memory
+start_tracing_from_env()
+from src.pipeline.structured_logging import configure_logging, logging_stats, RequestLogSampler
+
+# Queue-backed JSON logs (LOG_FORMAT=text for the classic format); request
+# threads never wait on log I/O
+configure_logging()
+
+with startup_timer.phase("import flask"):
+    from flask import Flask, Response, g, render_template, request, jsonify
+with startup_timer.phase("import prediction pipeline"):
+    from src.pipeline.predict_pipeline import predict, customdata
+    from src.pipeline.micro_batcher import MicroBatcher
+    from src.pipeline.model_reloader import ModelReloader
+    from src.pipeline.admission import AdmissionController, Overloaded
+    from src.pipeline.metrics import metrics_registry, stage_timer, format_labels
+    from src.pipeline.request_profiler import RequestProfiler, PROFILE_HEADER, SORT_KEYS
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -24,12 +40,168 @@ app.config['JSON_SORT_KEYS'] = False
 # Initialize predictor
 predictor = predict()
 
+# One sampled record per prediction request, with the message redacted
+# (LOG_SAMPLE_RATE, LOG_MESSAGE_MODE, LOG_MESSAGE_CHARS)
+request_log_sampler = RequestLogSampler.from_env()
+
+# Upper bound on messages accepted by /predict/batch in one request
+MAX_BATCH_SIZE = int(os.environ.get('PREDICT_BATCH_MAX_SIZE', '1000'))
+
+# Optional request profiling: PROFILE_SAMPLE_RATE of prediction requests (and
+# any with an X-Profile header equal to PROFILE_HEADER_TOKEN) run under
+# cProfile; .prof files go to PROFILE_DIR. Off by default at no cost.
+profiler = RequestProfiler.from_env()
+if profiler is not None:
+    logging.info(f"🔬 Request profiling enabled ({profiler.sample_rate * 100:g}% sampled, "
+                 f"header {'on' if profiler.header_token else 'off'}) -> {profiler.output_dir}")
+
+# Admission control: at most INFERENCE_MAX_CONCURRENCY inferences at once
+# (default: CPU count, 0 disables), INFERENCE_QUEUE_SIZE waiting; the rest get
+# 429 + Retry-After, or the fallback heuristic with OVERLOAD_ACTION=fallback.
+admission = AdmissionController.from_env()
+if admission is not None:
+    logging.info(f"🚦 Admission control: {admission.max_concurrency} concurrent inferences, "
+                 f"queue {admission.max_queue_size}, overload action '{admission.overload_action}'")
+
+# Optional micro-batching: concurrent /predict calls share one model call.
+# Enable with MICRO_BATCH_ENABLED=1; tune with MICRO_BATCH_MAX_SIZE,
+# MICRO_BATCH_MAX_WAIT_MS and MICRO_BATCH_MAX_PENDING. Admission control then
+# applies to each flushed batch, not to each /predict request.
+batcher = None
+if os.environ.get('MICRO_BATCH_ENABLED', '').lower() in ('1', 'true', 'yes', 'on'):
+    batcher = MicroBatcher(
+        predictor,
+        max_batch_size=int(os.environ.get('MICRO_BATCH_MAX_SIZE', '32')),
+        max_wait_ms=float(os.environ.get('MICRO_BATCH_MAX_WAIT_MS', '5')),
+        # Inference runs in the batcher's thread, so profile it there
+        profiler=profiler,
+        admission=admission,
+        # Default: four full batches (MicroBatcher)
+        max_pending=int(os.environ['MICRO_BATCH_MAX_PENDING']) if 'MICRO_BATCH_MAX_PENDING' in os.environ else None
+    )
+    logging.info(f"⚡ Micro-batching enabled (max size {batcher.max_batch_size}, max wait {batcher.max_wait * 1000:.1f} ms, "
+                 f"max pending {batcher.max_pending or 'unbounded'})")
+
+# Optional hot reload: MODEL_RELOAD_INTERVAL=<seconds> watches the served
+# artifacts and swaps in a retrained model without a restart.
+reloader = None
+reload_interval = float(os.environ.get('MODEL_RELOAD_INTERVAL', '0'))
+if reload_interval > 0:
+    reloader = ModelReloader(predictor, interval=reload_interval)
+    logging.info(f"♻️  Hot model reload enabled (polling every {reloader.interval:.0f}s)")
+
+def profiled(endpoint, batched=False):
+    """
+    Decorate a view so sampled requests run under the request profiler
+
+    With batched (micro-batching on), inference runs in the batcher's
+    thread, which profiles its own sampled batches; the request thread
+    would only show the wait. A request with a matching X-Profile header
+    sets g.profile_batch so the batch carrying its message is profiled.
+    """
+    def decorator(view):
+        if profiler is None:
+            # Profiling off: the view is left untouched
+            return view
+        if batched:
+            @functools.wraps(view)
+            def flagging_wrapper(*args, **kwargs):
+                g.profile_batch = profiler.forced(request.headers.get(PROFILE_HEADER))
+                return view(*args, **kwargs)
+            return flagging_wrapper
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if profiler.wants(request.headers.get(PROFILE_HEADER)):
+                return profiler.run(endpoint, view, *args, **kwargs)
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def run_admitted(infer, fallback, admitted_inside=False):
+    """
+    Run an inference under admission control
+
+    Args:
+        infer (callable): The model prediction
+        fallback (callable): Heuristic answer used when overloaded and
+            OVERLOAD_ACTION=fallback
+        admitted_inside (bool): infer takes its own slot (the micro-batcher
+            admits each flushed batch), so only its Overloaded is handled here
+
+    Returns:
+        tuple: (result, degraded) where degraded is True for a fallback answer
+
+    Raises:
+        Overloaded: No inference slot and OVERLOAD_ACTION=reject
+    """
+    if admission is None:
+        return infer(), False
+    try:
+        if admitted_inside:
+            return infer(), False
+        admission.acquire()
+    except Overloaded:
+        if admission.overload_action != 'fallback':
+            raise
+        return fallback(), True
+    try:
+        return infer(), False
+    finally:
+        admission.release()
+
+def overloaded_response(e):
+    """Build the 429 response for a request turned away by admission control"""
+    response = jsonify({
+        'error': True,
+        'message': 'Server is busy. Please retry shortly.'
+    })
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 429
+
+@app.before_request
+def start_background_workers():
+    """Start the reloader thread in this process (after a gunicorn fork too)"""
+    g.request_started = time.perf_counter()
+    if reloader is not None:
+        reloader.start()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and time it by endpoint (route pattern, not raw path)"""
+    started = g.get('request_started')
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics_registry.inc('spamshield_requests_total', format_labels(endpoint=endpoint, status=response.status_code))
+    if started is not None:
+        metrics_registry.observe(
+            'spamshield_request_duration_seconds', time.perf_counter() - started, format_labels(endpoint=endpoint)
+        )
+    metrics_registry.maybe_flush()
+    log_request(endpoint, response.status_code, started)
+    return response
+
+def log_request(endpoint, status, started):
+    """Write the per-request record for prediction routes (errors always, the rest sampled)"""
+    fields = g.get('log_fields')
+    if fields is None and status < 500:
+        return
+    if not request_log_sampler.sampled(error=status >= 500):
+        return
+    logging.info("request", extra={
+        'event': 'request',
+        'method': request.method,
+        'endpoint': endpoint,
+        'status': status,
+        'duration_ms': round((time.perf_counter() - started) * 1000.0, 3) if started is not None else None,
+        **(fields or {})
+    })
+
 @app.route('/')
 def home():
     """Render the home page"""
     return render_template('index.html')
 
 @app.route('/predict', methods=['POST'])
+@profiled('predict', batched=batcher is not None)
 def predict_spam():
     """
     Handle spam prediction request
@@ -39,11 +211,12 @@ def predict_spam():
     """
     try:
         # Get message from request
-        if request.is_json:
-            data = request.get_json()
-            message_text = data.get('message', '')
-        else:
-            message_text = request.form.get('message', '')
+        with stage_timer('handler', 'parse'):
+            if request.is_json:
+                data = request.get_json()
+                message_text = data.get('message', '')
+            else:
+                message_text = request.form.get('message', '')
         
         # Validate input
         if not message_text or message_text.strip() == '':
@@ -52,16 +225,24 @@ def predict_spam():
                 'message': 'Please enter a message to analyze'
             }), 400
         
-        logging.info(f"📨 Received prediction request for message: {message_text[:50]}...")
+        g.log_fields = request_log_sampler.message_fields(message_text)
         
         # Create custom data object
-        custom_data = customdata(message_text)
+        with stage_timer('handler', 'validate'):
+            custom_data = customdata(message_text)
         
-        # Convert to DataFrame
-        data_df = custom_data.data_frame()
-        
-        # Get prediction
-        prediction, confidence = predictor.get_predict(data_df)
+        # Get prediction (the plain text skips building a one-row DataFrame)
+        with stage_timer('handler', 'predict'):
+            if batcher is not None:
+                profile_batch = g.get('profile_batch', False)
+                predict_one = lambda text: batcher.predict(text, profile=profile_batch)
+            else:
+                predict_one = predictor.get_predict
+            (prediction, confidence), degraded = run_admitted(
+                lambda: predict_one(custom_data.message_text),
+                lambda: predictor.fallback_predict_counted(custom_data.message_text),
+                admitted_inside=batcher is not None
+            )
         
         # Prepare response
         response = {
@@ -71,11 +252,17 @@ def predict_spam():
             'message': message_text,
             'is_spam': prediction == 'Spam'
         }
+        if degraded:
+            # Answered by the keyword heuristic because the model was overloaded
+            response['degraded'] = True
         
-        logging.info(f"✅ Prediction: {prediction} ({confidence*100:.2f}% confidence)")
+        g.log_fields.update(prediction=prediction, confidence=response['confidence'])
         
         return jsonify(response)
         
+    except Overloaded as oe:
+        return overloaded_response(oe)
+        
     except ValueError as ve:
         logging.error(f"Validation error: {str(ve)}")
         return jsonify({
@@ -85,29 +272,107 @@ def predict_spam():
         
     except Exception as e:
         logging.error(f"Prediction error: {str(e)}")
-        tb = traceback.format_exc()
-        logging.error(tb)
-
-        # In production we return a generic message. When debugging is enabled
-        # via environment variable DEBUG_PREDICT_ERRORS (truthy values: 1,true,yes),
-        # include the exception message and traceback in the JSON response to
-        # make diagnosing Render deployment errors easier.
-        generic_msg = 'An error occurred during prediction. Please try again.'
-        debug_val = os.environ.get('DEBUG_PREDICT_ERRORS', '')
-        debug_truthy = str(debug_val).lower() in ('1', 'true', 'yes', 'on')
-
-        if debug_truthy:
-            payload = {
+        return prediction_error_response(e)
+
+@app.route('/predict/batch', methods=['POST'])
+@profiled('predict_batch')
+def predict_spam_batch():
+    """
+    Handle batch spam prediction request
+
+    Expects JSON {"messages": ["...", "..."]}. Each message gets its own
+    result; an invalid message does not fail the rest of the batch.
+
+    Returns:
+        JSON response with one result per message, in input order
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        messages = data.get('messages')
+
+        # Validate input
+        if not isinstance(messages, list) or len(messages) == 0:
+            return jsonify({
                 'error': True,
-                'message': str(e),
-                'traceback': tb
-            }
-            return jsonify(payload), 500
+                'message': "Please provide a non-empty 'messages' list"
+            }), 400
+        if len(messages) > MAX_BATCH_SIZE:
+            return jsonify({
+                'error': True,
+                'message': f'Batch too large: at most {MAX_BATCH_SIZE} messages per request'
+            }), 413
+
+        g.log_fields = {'messages': len(messages)}
+
+        batch_results, degraded = run_admitted(
+            lambda: predictor.get_predict_batch(messages),
+            lambda: predictor.fallback_predict_batch(messages)
+        )
+        results = []
+        for index, result in enumerate(batch_results):
+            if 'error' in result:
+                results.append({
+                    'index': index,
+                    'error': True,
+                    'message': result['error']
+                })
+            else:
+                results.append({
+                    'index': index,
+                    'error': False,
+                    'prediction': result['prediction'],
+                    'confidence': round(result['confidence'] * 100, 2),
+                    'is_spam': result['prediction'] == 'Spam'
+                })
+
+        payload = {
+            'error': False,
+            'count': len(results),
+            'results': results
+        }
+        if degraded:
+            payload['degraded'] = True
+        return jsonify(payload)
+
+    except Overloaded as oe:
+        return overloaded_response(oe)
 
+    except ValueError as ve:
+        logging.error(f"Validation error: {str(ve)}")
         return jsonify({
             'error': True,
-            'message': generic_msg
-        }), 500
+            'message': str(ve)
+        }), 400
+
+    except Exception as e:
+        logging.error(f"Batch prediction error: {str(e)}")
+        return prediction_error_response(e)
+
+def prediction_error_response(e):
+    """Build the 500 response for a failed prediction"""
+    tb = traceback.format_exc()
+    logging.error(tb)
+
+    # In production we return a generic message. When debugging is enabled
+    # via environment variable DEBUG_PREDICT_ERRORS (truthy values: 1,true,yes),
+    # include the exception message and traceback in the JSON response to
+    # make diagnosing Render deployment errors easier.
+    generic_msg = 'An error occurred during prediction. Please try again.'
+    debug_val = os.environ.get('DEBUG_PREDICT_ERRORS', '')
+    debug_truthy = str(debug_val).lower() in ('1', 'true', 'yes', 'on')
+
+    if debug_truthy:
+        payload = {
+            'error': True,
+            'message': str(e),
+            'traceback': tb
+        }
+        return jsonify(payload), 500
+
+    return jsonify({
+        'error': True,
+        'message': generic_msg
+    }), 500
 
 @app.route('/health')
 def health_check():
@@ -115,17 +380,82 @@ def health_check():
     try:
         # Try to load model
         predictor.load_model()
-        return jsonify({
+        health = {
             'status': 'healthy',
-            'model_loaded': predictor.model is not None,
+            'model_loaded': predictor.engine is not None,
+            'engine': predictor.engine_name,
             'fallback': getattr(predictor, 'fallback', False)
-        })
+        }
+        if predictor.model_version is not None:
+            health['model_version'] = predictor.model_version
+        if predictor.cache is not None:
+            health['prediction_cache'] = predictor.cache.stats()
+        if predictor.cascade_enabled:
+            health['cascade'] = predictor.cascade_stats()
+        if batcher is not None:
+            health['micro_batching'] = batcher.stats()
+        if reloader is not None:
+            health['model_reload'] = reloader.stats()
+        if predictor.candidate is not None:
+            health['candidate_model'] = predictor.candidate.stats()
+        if admission is not None:
+            health['admission'] = admission.stats()
+        if profiler is not None:
+            health['profiling'] = profiler.stats()
+        health['logging'] = logging_stats()
+        return jsonify(health)
     except Exception as e:
         return jsonify({
             'status': 'unhealthy',
             'error': str(e)
         }), 500
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics, summed over all gunicorn workers"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/admin/profiles')
+def profile_summary():
+    """
+    Hottest functions over the newest request profiles (all workers)
+
+    Query parameters: last (profiles merged, default 50), sort (tottime,
+    cumulative or calls) and limit (functions listed, default 25). The
+    X-Profile header must carry PROFILE_HEADER_TOKEN; without a token
+    configured the endpoint is disabled (profiles name internal code paths).
+    """
+    if profiler is None:
+        return jsonify({'error': True, 'message': 'Request profiling is disabled'}), 404
+    if profiler.header_token is None:
+        return jsonify({'error': True, 'message': 'Set PROFILE_HEADER_TOKEN to enable profile summaries'}), 404
+    if not profiler.forced(request.headers.get(PROFILE_HEADER)):
+        return jsonify({'error': True, 'message': 'Missing or wrong X-Profile token'}), 403
+    sort = request.args.get('sort', 'tottime')
+    if sort not in SORT_KEYS:
+        return jsonify({'error': True, 'message': f"sort must be one of: {', '.join(SORT_KEYS)}"}), 400
+    try:
+        last = int(request.args.get('last', 50))
+        limit = int(request.args.get('limit', 25))
+    except ValueError:
+        return jsonify({'error': True, 'message': 'last and limit must be integers'}), 400
+    return jsonify(profiler.summary(last=last, sort=sort, limit=limit))
+
+@app.route('/debug/memory')
+def debug_memory():
+    """
+    Memory footprint of this worker by component (MEMORY_DEBUG=1 or trace)
+
+    Query parameter: top (allocating files listed when tracing, default 10)
+    """
+    if not memory_debug_mode():
+        return jsonify({'error': True, 'message': 'Memory debugging is disabled'}), 404
+    try:
+        top = int(request.args.get('top', 10))
+    except ValueError:
+        return jsonify({'error': True, 'message': 'top must be an integer'}), 400
+    return jsonify(memory_report(predictor, top=top))
+
 @app.route('/features')
 def features():
     """Render features page"""
@@ -159,5 +489,9 @@ if __name__ == '__main__':
     print("💼 Premium Edition - Professional Grade Protection")
     print("\n📝 Press CTRL+C to stop the server\n")
     
+    # STARTUP_PROFILE=1: load the model now and log the startup breakdown
+    if startup_profile_enabled():
+        predictor.warmup()
+    
     # Run Flask app (use_reloader=False fixes Windows compatibility issue)
     app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
@@ -0,0 +1,570 @@
+"""
+Inference Benchmarks for SMS Spam Detection
+
+Measures prediction latency of the serving pipeline on real messages from
+artifacts/test.csv.
+
+Usage:
+    python benchmark.py engines                        # compare inference engines
+    python benchmark.py engines --engines keras compiled numpy --messages 300
+    python benchmark.py parity --engines compiled numpy   # compare outputs with Keras
+    python benchmark.py lengths                           # length-aware vs padded NumPy inference
+    python benchmark.py tokenizer                         # VocabTokenizer vs Keras Tokenizer on spam.csv
+    python benchmark.py cleaner                           # shared text cleaner vs legacy cleaner on spam.csv
+    python benchmark.py suite --output benchmarks/current.json    # full serving-path suite
+    python benchmark.py suite --baseline benchmarks/baseline.json --threshold 0.2
+    python benchmark.py compare benchmarks/current.json benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+TEST_CSV = os.path.join(PROJECT_ROOT, 'artifacts', 'test.csv')
+TEST_SEQUENCES = os.path.join(PROJECT_ROOT, 'artifacts', 'test_sequences')
+PREPROCESSING = os.path.join(PROJECT_ROOT, 'artifacts', 'preprocessing.pkl')
+SPAM_CSV = os.path.join(PROJECT_ROOT, 'spam.csv')
+
+
+def load_corpus(path=SPAM_CSV):
+    """Load every message of the raw spam.csv corpus"""
+    return pd.read_csv(path, encoding='latin-1')['v2'].astype(str).tolist()
+
+
+def best_of(func, repeats):
+    """Fastest wall time of several runs, in seconds"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def load_messages(limit=None, path=TEST_CSV):
+    """Load message texts from a CSV with a 'text' column"""
+    texts = pd.read_csv(path)['text'].astype(str).tolist()
+    return texts[:limit] if limit else texts
+
+
+def percentiles(latencies_ms):
+    """p50/p95/p99 and mean of a list of latencies in milliseconds"""
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+    }
+
+
+def benchmark_engine(engine_name, messages, batch_size):
+    """
+    Time model loading, single-message latency and batch throughput
+
+    Returns:
+        dict: Benchmark results for one engine
+    """
+    from src.pipeline.predict_pipeline import predict
+
+    predictor = predict()
+    predictor.engine_name = engine_name
+
+    start = time.perf_counter()
+    predictor.load_model()
+    load_seconds = time.perf_counter() - start
+    if predictor.fallback:
+        raise RuntimeError(f"Engine '{engine_name}' failed to load")
+
+    # One untimed call so lazy initialisation is not counted
+    predictor.get_predict(messages[0])
+
+    latencies = []
+    for message in messages:
+        start = time.perf_counter()
+        predictor.get_predict(message)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+
+    start = time.perf_counter()
+    for i in range(0, len(messages), batch_size):
+        predictor.get_predict_batch(messages[i:i + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    result = {'engine': engine_name, 'load_s': load_seconds}
+    result.update(percentiles(latencies))
+    result['batch_msgs_per_s'] = len(messages) / batch_seconds
+    return result
+
+
+def run_engines(args):
+    messages = load_messages(args.messages)
+    results = [benchmark_engine(name, messages, args.batch_size) for name in args.engines]
+
+    print("\n" + "=" * 78)
+    print(f"ENGINE BENCHMARK ({len(messages)} messages, batch size {args.batch_size})")
+    print("=" * 78)
+    print(f"{'engine':<10}{'load s':>9}{'mean ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'batch msg/s':>13}{'speedup':>9}")
+    baseline = results[0]['p50_ms']
+    for r in results:
+        print(f"{r['engine']:<10}{r['load_s']:>9.2f}{r['mean_ms']:>10.2f}{r['p50_ms']:>9.2f}"
+              f"{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['batch_msgs_per_s']:>13.1f}"
+              f"{baseline / r['p50_ms']:>8.1f}x")
+    print("=" * 78 + "\n")
+    return results
+
+
+def run_parity(args):
+    """
+    Check that engines reproduce the Keras model on the test sequences
+
+    Returns:
+        bool: True when every engine stays within the tolerance
+    """
+    from src.components.sequence_store import load_sequences
+    from src.pipeline.inference_engine import create_engine
+    from src.pipeline.predict_pipeline import predict
+
+    predictor = predict()
+    X = np.asarray(load_sequences(TEST_SEQUENCES)[0], dtype=np.int32)
+    if args.limit:
+        X = X[:args.limit]
+    max_length = X.shape[1]
+
+    reference = create_engine('keras', predictor.model_path, max_length).predict_proba(X)
+
+    print("\n" + "=" * 60)
+    print(f"ENGINE PARITY vs keras ({len(X)} test sequences, tolerance {args.tolerance:g})")
+    print("=" * 60)
+    ok = True
+    for name in args.engines:
+        proba = create_engine(name, predictor.model_path, max_length).predict_proba(X)
+        max_diff = float(np.max(np.abs(proba - reference)))
+        agreement = float(np.mean((proba > 0.5) == (reference > 0.5)))
+        passed = max_diff <= args.tolerance
+        ok = ok and passed
+        print(f"{name:<10} max |Δp| = {max_diff:.2e}   label agreement = {agreement * 100:.2f}%   "
+              f"{'PASS' if passed else 'FAIL'}")
+    print("=" * 60 + "\n")
+    return ok
+
+
+def run_lengths(args):
+    """
+    Compare padded and length-aware NumPy inference on the real test set
+
+    Returns:
+        bool: True when both modes agree within the tolerance
+    """
+    from src.components.sequence_store import load_sequences
+    from src.pipeline.inference_engine import ENGINES
+    from src.pipeline.predict_pipeline import predict
+
+    predictor = predict()
+    X = np.asarray(load_sequences(TEST_SEQUENCES)[0], dtype=np.int32)
+    lengths = (X != 0).sum(axis=1)
+    engine_class = ENGINES[args.engine]
+    model_path = predictor.model_path
+    if args.engine == 'int8':
+        model_path = os.path.join(os.path.dirname(model_path), 'model_int8.npz')
+
+    padded = engine_class(model_path, X.shape[1], length_aware=False)
+    length_aware = engine_class(model_path, X.shape[1], length_aware=True)
+    max_diff = float(np.max(np.abs(padded.predict_proba(X) - length_aware.predict_proba(X))))
+
+    print("\n" + "=" * 66)
+    print(f"LENGTH-AWARE INFERENCE ({args.engine} engine, {len(X)} test sequences)")
+    print(f"Token lengths: mean {lengths.mean():.1f}, median {np.median(lengths):.0f}, "
+          f"p95 {np.percentile(lengths, 95):.0f}, padded to {X.shape[1]}")
+    print("=" * 66)
+    print(f"{'batch size':<12}{'padded msg/s':>16}{'length-aware msg/s':>22}{'gain':>10}")
+    for batch_size in args.batch_sizes:
+        throughput = []
+        for engine in (padded, length_aware):
+            engine.predict_proba(X[:batch_size])
+            start = time.perf_counter()
+            for i in range(0, len(X), batch_size):
+                engine.predict_proba(X[i:i + batch_size])
+            throughput.append(len(X) / (time.perf_counter() - start))
+        print(f"{batch_size:<12}{throughput[0]:>16.1f}{throughput[1]:>22.1f}{throughput[1] / throughput[0]:>9.2f}x")
+    passed = max_diff <= args.tolerance
+    print(f"max |Δp| = {max_diff:.2e} ({'PASS' if passed else 'FAIL'}, tolerance {args.tolerance:g})")
+    print("=" * 66 + "\n")
+    return passed
+
+
+def run_tokenizer(args):
+    """
+    Compare VocabTokenizer with the Keras Tokenizer on the full corpus
+
+    Returns:
+        bool: True when both produce identical padded id arrays
+    """
+    import joblib
+    from src.pipeline.text_cleaner import clean_texts
+    from src.pipeline.vocab_tokenizer import VocabTokenizer
+
+    preprocessing_obj = joblib.load(PREPROCESSING)
+    keras_tokenizer = preprocessing_obj['tokenizer']
+    max_length = preprocessing_obj['max_length']
+    tokenizer = VocabTokenizer.from_keras(keras_tokenizer)
+
+    texts = clean_texts(load_corpus())
+
+    def keras_path():
+        # Same post padding/truncation the serving path used with pad_sequences
+        padded = np.zeros((len(texts), max_length), dtype=np.int32)
+        for row, sequence in enumerate(keras_tokenizer.texts_to_sequences(texts)):
+            sequence = sequence[:max_length]
+            padded[row, :len(sequence)] = sequence
+        return padded
+
+    out = np.zeros((len(texts), max_length), dtype=np.int32)
+
+    def vocab_path():
+        return tokenizer.texts_to_array(texts, max_length, out=out)[0]
+
+    identical = bool(np.array_equal(keras_path(), vocab_path()))
+    keras_seconds = best_of(keras_path, args.repeats)
+    vocab_seconds = best_of(vocab_path, args.repeats)
+
+    print("\n" + "=" * 60)
+    print(f"TOKENIZER BENCHMARK ({len(texts)} cleaned spam.csv messages)")
+    print("=" * 60)
+    print(f"Keras Tokenizer + padding:       {keras_seconds * 1000:8.1f} ms "
+          f"({len(texts) / keras_seconds:,.0f} msg/s)")
+    print(f"VocabTokenizer.texts_to_array:   {vocab_seconds * 1000:8.1f} ms "
+          f"({len(texts) / vocab_seconds:,.0f} msg/s)")
+    print(f"Speedup: {keras_seconds / vocab_seconds:.1f}x   "
+          f"vocabulary: {len(keras_tokenizer.word_index)} → {len(tokenizer.vocab)} words")
+    print(f"Identical ids: {'PASS' if identical else 'FAIL'}")
+    print("=" * 60 + "\n")
+    return identical
+
+
+def legacy_clean_text(text):
+    """The per-message cleaner training and serving used before text_cleaner.py"""
+    text = str(text).lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', '', text)
+    text = ' '.join(text.split())
+    return text
+
+
+def run_cleaner(args):
+    """
+    Compare the shared text cleaner with the legacy per-row cleaner
+
+    Returns:
+        bool: True when every cleaned message is byte-identical
+    """
+    from src.pipeline.text_cleaner import clean_text, clean_texts
+
+    series = pd.read_csv(SPAM_CSV, encoding='latin-1')['v2']
+    texts = series.astype(str).tolist()
+
+    expected = [legacy_clean_text(text) for text in texts]
+    identical = clean_texts(series) == expected and [clean_text(text) for text in texts] == expected
+
+    candidates = (
+        ("legacy Series.apply", lambda: series.apply(legacy_clean_text).tolist()),
+        ("clean_text per message", lambda: [clean_text(text) for text in texts]),
+        ("clean_texts (Series)", lambda: clean_texts(series)),
+    )
+    timings = [(label, best_of(func, args.repeats)) for label, func in candidates]
+    legacy_seconds = timings[0][1]
+
+    print("\n" + "=" * 60)
+    print(f"TEXT CLEANER BENCHMARK ({len(texts)} spam.csv messages)")
+    print("=" * 60)
+    for label, seconds in timings:
+        print(f"{label:<24} {seconds * 1000:8.1f} ms  ({len(texts) / seconds:,.0f} msg/s, "
+              f"{legacy_seconds / seconds:.1f}x)")
+    print(f"Byte-identical output: {'PASS' if identical else 'FAIL'}")
+    print("=" * 60 + "\n")
+    return identical
+
+
+def suite_predictor(engine_name, predictors):
+    """One loaded predictor per engine, without the prediction cache (repeats would be cache hits)"""
+    from src.pipeline.predict_pipeline import predict
+
+    if engine_name not in predictors:
+        predictor = predict()
+        predictor.engine_name = engine_name
+        predictor.cache = None
+        predictor.load_model()
+        if predictor.fallback:
+            raise RuntimeError(f"Engine '{engine_name}' failed to load")
+        predictors[engine_name] = predictor
+    return predictors[engine_name]
+
+
+def suite_caller(mode, predictor, batch_size):
+    """
+    Build a function that scores one request's worth of messages
+
+    Direct mode calls get_predict (batch size 1) or get_predict_batch;
+    flask mode posts to /predict or /predict/batch through the test client,
+    so routing, JSON and the request hooks are included.
+    """
+    if mode == 'direct':
+        if batch_size == 1:
+            return lambda batch: predictor.get_predict(batch[0])
+        return predictor.get_predict_batch
+
+    import app as app_module
+    # The views read these module globals on every request; benchmark the
+    # model, not admission control
+    app_module.predictor = predictor
+    app_module.admission = None
+    client_local = threading.local()
+
+    def call(batch):
+        client = getattr(client_local, 'client', None)
+        if client is None:
+            client = client_local.client = app_module.app.test_client()
+        if batch_size == 1:
+            response = client.post('/predict', json={'message': batch[0]})
+        else:
+            response = client.post('/predict/batch', json={'messages': batch})
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return call
+
+
+def run_scenario(call, messages, batch_size, threads, min_requests):
+    """
+    Send the messages in batches from several threads
+
+    Every message is sent once; the list is cycled when that gives fewer
+    than min_requests requests, so large batches still get meaningful
+    percentiles.
+
+    Returns:
+        dict: Throughput (messages/s), request count and latency percentiles
+    """
+    needed = max(len(messages), min_requests * batch_size)
+    messages = [messages[i % len(messages)] for i in range(needed)]
+    batches = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    call(batches[0])  # untimed: lazy initialisation
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        barrier.wait()
+        for batch in batches[index::threads]:
+            start = time.perf_counter()
+            call(batch)
+            latencies[index].append((time.perf_counter() - start) * 1000.0)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    result = {'requests': len(batches), 'msgs_per_s': len(messages) / seconds}
+    result.update(percentiles([value for values in latencies for value in values]))
+    return result
+
+
+def run_suite(args):
+    """
+    Benchmark the serving path over modes, engines, batch sizes and threads
+
+    Returns:
+        bool: False when a baseline was given and a scenario regressed
+    """
+    messages = load_corpus() if args.source == 'spam' else load_messages()
+    messages = messages[:args.messages]
+
+    predictors = {}
+    scenarios = {}
+    print("\n" + "=" * 92)
+    print(f"BENCHMARK SUITE ({len(messages)} messages from {args.source}, at least {args.min_requests} "
+          f"requests per scenario, median of {args.repeats} runs)")
+    print("=" * 92)
+    print(f"{'scenario':<40}{'requests':>9}{'msg/s':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for engine_name in args.engines:
+        predictor = suite_predictor(engine_name, predictors)
+        for mode in args.modes:
+            for batch_size in args.batch_sizes:
+                call = suite_caller(mode, predictor, batch_size)
+                for threads in args.threads:
+                    key = f"{mode}/{engine_name}/batch{batch_size}/threads{threads}"
+                    runs = [run_scenario(call, messages, batch_size, threads, args.min_requests)
+                            for _ in range(args.repeats)]
+                    # Median of each metric over the repeats
+                    result = {metric: float(np.median([run[metric] for run in runs])) for metric in runs[0]}
+                    result['requests'] = runs[0]['requests']
+                    scenarios[key] = result
+                    print(f"{key:<40}{result['requests']:>9}{result['msgs_per_s']:>11.1f}"
+                          f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}")
+    print("=" * 92 + "\n")
+
+    report = {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'source': args.source,
+            'messages': len(messages),
+            'min_requests': args.min_requests,
+            'repeats': args.repeats,
+            'setup': args.setup,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'scenarios': scenarios
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return compare_reports(report, baseline, args.threshold, args.metrics)
+    return True
+
+
+# Higher is worse for latencies, lower is worse for throughput
+LOWER_IS_BETTER = {'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'}
+
+# Report metadata that must match for timings to be comparable
+SETUP_FIELDS = ('machine', 'cpu_count', 'python', 'numpy')
+
+
+def compare_reports(report, baseline, threshold, metrics):
+    """
+    Gate a suite report against a stored baseline
+
+    A scenario regresses when a latency metric grew, or throughput fell,
+    by more than threshold (a fraction, 0.1 = 10%). Scenarios missing from
+    either report are listed but never fail the comparison.
+
+    Returns:
+        bool: True when no scenario regressed
+    """
+    current, previous = report['scenarios'], baseline['scenarios']
+    print("\n" + "=" * 92)
+    print(f"BASELINE COMPARISON (fail above {threshold * 100:.0f}% regression on {', '.join(metrics)})")
+    print("=" * 92)
+    baseline_meta, report_meta = baseline.get('meta', {}), report.get('meta', {})
+    print(f"Baseline setup: {baseline_meta.get('setup') or 'unnamed'} ({baseline_meta.get('created', '?')})")
+    differences = [f"{field} {baseline_meta.get(field)}→{report_meta.get(field)}"
+                   for field in SETUP_FIELDS if baseline_meta.get(field) != report_meta.get(field)]
+    if differences:
+        print(f"⚠️  Different setup than the baseline ({', '.join(differences)}): "
+              f"timings may not be comparable; record a baseline on this machine")
+    ok = True
+    for key in sorted(set(current) | set(previous)):
+        if key not in current or key not in previous:
+            print(f"{key:<40} only in {'baseline' if key in previous else 'this run'}")
+            continue
+        changes = []
+        failed = False
+        for metric in metrics:
+            old, new = previous[key][metric], current[key][metric]
+            change = (new - old) / old if old else 0.0
+            regression = change if metric in LOWER_IS_BETTER else -change
+            failed = failed or regression > threshold
+            changes.append(f"{metric} {old:.2f}→{new:.2f} ({change * 100:+.1f}%)")
+        ok = ok and not failed
+        print(f"{key:<40} {'FAIL' if failed else 'ok  '} {'  '.join(changes)}")
+    print(f"Result: {'PASS' if ok else 'FAIL'}")
+    print("=" * 92 + "\n")
+    return ok
+
+
+def run_compare(args):
+    with open(args.report) as f:
+        report = json.load(f)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    return compare_reports(report, baseline, args.threshold, args.metrics)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SMS spam inference benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    engines = subparsers.add_parser('engines', help="Compare inference engines")
+    engines.add_argument('--engines', nargs='+', default=['keras', 'compiled'])
+    engines.add_argument('--messages', type=int, default=200, help="Number of test messages")
+    engines.add_argument('--batch-size', type=int, default=32)
+    engines.set_defaults(func=run_engines)
+
+    parity = subparsers.add_parser('parity', help="Compare engine outputs with the Keras model")
+    parity.add_argument('--engines', nargs='+', default=['compiled', 'numpy'])
+    parity.add_argument('--tolerance', type=float, default=1e-4, help="Max allowed |Δ probability|")
+    parity.add_argument('--limit', type=int, default=None, help="Only use the first N sequences")
+    parity.set_defaults(func=run_parity)
+
+    lengths = subparsers.add_parser('lengths', help="Length-aware vs padded NumPy inference")
+    lengths.add_argument('--engine', choices=['numpy', 'int8'], default='numpy')
+    lengths.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 256])
+    lengths.add_argument('--tolerance', type=float, default=1e-5, help="Max allowed |Δ probability|")
+    lengths.set_defaults(func=run_lengths)
+
+    tokenizer = subparsers.add_parser('tokenizer', help="VocabTokenizer vs Keras Tokenizer on spam.csv")
+    tokenizer.add_argument('--repeats', type=int, default=5)
+    tokenizer.set_defaults(func=run_tokenizer)
+
+    cleaner = subparsers.add_parser('cleaner', help="Shared text cleaner vs legacy cleaner on spam.csv")
+    cleaner.add_argument('--repeats', type=int, default=5)
+    cleaner.set_defaults(func=run_cleaner)
+
+    suite = subparsers.add_parser('suite', help="Serving-path benchmark over modes, engines, batch sizes and threads")
+    suite.add_argument('--modes', nargs='+', choices=['direct', 'flask'], default=['direct', 'flask'])
+    suite.add_argument('--engines', nargs='+', default=['numpy'])
+    suite.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32])
+    suite.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    suite.add_argument('--source', choices=['test', 'spam'], default='test',
+                       help="Messages from artifacts/test.csv or the raw spam.csv")
+    suite.add_argument('--messages', type=int, default=500, help="Distinct messages sent per scenario")
+    suite.add_argument('--min-requests', type=int, default=50,
+                       help="Cycle the messages until every scenario makes at least this many requests")
+    suite.add_argument('--repeats', type=int, default=3, help="Runs per scenario (metrics are medians)")
+    suite.add_argument('--output', help="Write the results to this JSON file")
+    suite.add_argument('--baseline', help="Compare against this results file; exit 1 on regression")
+    suite.add_argument('--setup', help="Name of the machine/setup, stored in the results (e.g. 'ci-2cpu')")
+    suite.add_argument('--threshold', type=float, default=0.20, help="Allowed regression (0.20 = 20%%)")
+    suite.add_argument('--metrics', nargs='+', default=['p50_ms', 'p95_ms', 'msgs_per_s'],
+                       help="Metrics gated against the baseline")
+    suite.set_defaults(func=run_suite)
+
+    compare = subparsers.add_parser('compare', help="Gate a suite results file against a baseline")
+    compare.add_argument('report')
+    compare.add_argument('baseline')
+    compare.add_argument('--threshold', type=float, default=0.20, help="Allowed regression (0.20 = 20%%)")
+    compare.add_argument('--metrics', nargs='+', default=['p50_ms', 'p95_ms', 'msgs_per_s'])
+    compare.set_defaults(func=run_compare)
+
+    args = parser.parse_args(argv)
+
+    # Per-request INFO logs would dominate the measurements
+    logging.disable(logging.INFO)
+    result = args.func(args)
+    return 1 if result is False else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Gunicorn configuration for SpamShield AI
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+
+The app, tokenizer and model are loaded once in the master process
+(preload_app), so forked workers share the weight arrays through
+copy-on-write instead of each loading its own copy. Each worker then runs
+one warmup inference after fork, so the first user on a worker does not
+pay the model load.
+
+TensorFlow is not fork-safe once its runtime has started, so the model is
+only loaded in the master for the TensorFlow-free engines (numpy, int8).
+With the TensorFlow engines every worker loads the model itself right
+after fork (still before it accepts requests).
+
+Every worker keeps its own /metrics counters. They are shared through
+per-worker snapshot files in METRICS_MULTIPROC_DIR (a fresh temporary
+directory unless set), so a scrape answered by any worker reports the
+totals of all of them.
+"""
+
+import gc
+import os
+import glob
+import time
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+preload_app = True
+
+FORK_SAFE_ENGINES = ('numpy', 'int8')
+
+# Must be set before preload_app imports the app (the registry reads it once)
+TEMPORARY_METRICS_DIR = None
+if not os.environ.get('METRICS_MULTIPROC_DIR'):
+    TEMPORARY_METRICS_DIR = tempfile.mkdtemp(prefix='spamshield-metrics-')
+    os.environ['METRICS_MULTIPROC_DIR'] = TEMPORARY_METRICS_DIR
+
+
+def _predictor():
+    # Already imported by preload_app; this returns the same module
+    import app
+    return app.predictor
+
+
+def on_starting(server):
+    """Drop metric snapshots left over from a previous run"""
+    for path in glob.glob(os.path.join(os.environ['METRICS_MULTIPROC_DIR'], 'metrics-*.json')):
+        os.remove(path)
+
+
+def when_ready(server):
+    """Load the model in the master before the first fork"""
+    predictor = _predictor()
+    engines = [predictor.engine_name]
+    if predictor.candidate is not None:
+        engines.append(predictor.candidate.engine_name)
+    if all(name.lower() in FORK_SAFE_ENGINES for name in engines):
+        start = time.perf_counter()
+        loaded = predictor.warmup()
+        server.log.info(
+            f"Model preloaded in master ({predictor.engine_name}, loaded={loaded}) "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+    else:
+        server.log.info(f"Engines {engines} are not all fork-safe; workers load the model after fork")
+    # Keep the garbage collector from writing to (and un-sharing) the
+    # preloaded objects in every worker
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Warm up each worker (and start its model reloader) before it accepts requests"""
+    import app
+    # Counts recorded in the master would otherwise be reported once per worker
+    app.metrics_registry.reset()
+    start = time.perf_counter()
+    loaded = app.predictor.warmup()
+    if app.reloader is not None:
+        app.reloader.start()
+    server.log.info(f"Worker {worker.pid} warm (loaded={loaded}) in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def worker_exit(server, worker):
+    """Write out the worker's queued log records before it exits"""
+    from src.pipeline.structured_logging import shutdown_logging
+    shutdown_logging()
+
+
+def child_exit(server, worker):
+    """Keep the exited worker's counts in the /metrics totals"""
+    import app
+    app.metrics_registry.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    """Remove the metrics directory created for this run"""
+    if TEMPORARY_METRICS_DIR is not None:
+        shutil.rmtree(TEMPORARY_METRICS_DIR, ignore_errors=True)
@@ -0,0 +1,403 @@
+"""
+HTTP Load Generator for SpamShield AI
+
+Drives /predict (or /predict/batch) of a running server, or of the Flask
+app in-process, with messages sampled from spam.csv, and reports
+throughput, a latency histogram, error and 429 rates and fallback use.
+
+Modes:
+    open    fixed request rate (open loop): requests are sent on schedule
+            whether or not earlier ones finished, and latency is measured
+            from the scheduled time, so server queueing is not hidden
+    closed  fixed number of concurrent clients (closed loop): each client
+            sends its next request as soon as the previous one returns
+    replay  recorded traffic from a JSONL file, one request per line:
+            {"offset": 0.25, "path": "/predict", "body": {"message": "..."}}
+            ("offset" = seconds since the first request; a line may also
+            be just {"message": "..."} or {"messages": [...]})
+    smoke   five known messages, checking the expected labels
+
+Usage:
+    python load_test.py closed --concurrency 8 --duration 30
+    python load_test.py open --rate 200 --duration 30 --url http://127.0.0.1:8000
+    python load_test.py replay traffic.jsonl --speed 2
+    python load_test.py closed --app --concurrency 4 --requests 500   # no server needed
+    python load_test.py smoke
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+SPAM_CSV = os.path.join(PROJECT_ROOT, 'spam.csv')
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+SMOKE_MESSAGES = [
+    ("Obvious Spam", "CONGRATULATIONS! You've won a $1000 gift card! Click here to claim: http://bit.ly/free-gift", "Spam"),
+    ("Legitimate Message", "Hi John, just wanted to remind you about our meeting tomorrow at 3 PM. See you there!", "Legitimate"),
+    ("Urgent Spam", "URGENT: Your account will be closed! Call this number immediately: 1-800-FAKE-NUM", "Spam"),
+    ("Normal Text", "Thanks for the dinner last night, it was great catching up with you!", "Legitimate"),
+    ("Prize Spam", "You are a winner! Claim your prize now by clicking this link before it expires!", "Spam"),
+]
+
+
+def load_spam_messages(path=SPAM_CSV):
+    """Message bodies of spam.csv (label column v1, text column v2)"""
+    import csv
+    with open(path, encoding='latin-1', newline='') as f:
+        return [row['v2'] for row in csv.DictReader(f) if row.get('v2')]
+
+
+class HttpTarget:
+    """POSTs JSON over one keep-alive connection per thread"""
+
+    def __init__(self, url, timeout=30.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.https = parts.scheme == 'https'
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.name = url
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self._local.connection = connection_class(self.host, self.port, timeout=self.timeout)
+        return connection
+
+    def request(self, method, path, payload=None):
+        """
+        Send one request
+
+        Returns:
+            tuple: (status code, decoded JSON body or None, headers dict)
+        """
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, self.prefix + path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed the kept-alive connection: reconnect once
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        try:
+            decoded = json.loads(data) if data else None
+        except ValueError:
+            decoded = None
+        return response.status, decoded, dict(response.getheaders())
+
+
+class AppTarget:
+    """Calls the Flask app in this process through its test client"""
+
+    def __init__(self):
+        from app import app
+        self.app = app
+        self.name = 'in-process Flask app'
+        self._local = threading.local()
+
+    def request(self, method, path, payload=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=payload)
+        return response.status_code, response.get_json(silent=True), dict(response.headers)
+
+
+class Recorder:
+    """Thread-safe tally of latencies and outcomes"""
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.degraded = 0
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms, status=None, body=None, error=None, messages=1):
+        with self._lock:
+            self.latencies_ms.append(latency_ms)
+            self.messages += messages
+            if error is not None:
+                self.errors[type(error).__name__] += 1
+                return
+            self.statuses[status] += 1
+            if isinstance(body, dict) and body.get('degraded'):
+                self.degraded += 1
+
+
+def send(target, recorder, path, payload, scheduled=None):
+    """Send one request and record it; latency counts from `scheduled` when given"""
+    start = scheduled if scheduled is not None else time.perf_counter()
+    messages = len(payload['messages']) if 'messages' in payload else 1
+    try:
+        status, body, _ = target.request('POST', path, payload)
+    except Exception as e:
+        recorder.record((time.perf_counter() - start) * 1000.0, error=e, messages=messages)
+        return
+    recorder.record((time.perf_counter() - start) * 1000.0, status, body, messages=messages)
+
+
+def message_payloads(messages, batch_size, rng):
+    """Endless (path, payload) requests with bodies sampled from spam.csv"""
+    while True:
+        if batch_size > 1:
+            yield '/predict/batch', {'messages': [rng.choice(messages) for _ in range(batch_size)]}
+        else:
+            yield '/predict', {'message': rng.choice(messages)}
+
+
+def run_open_loop(target, recorder, requests, rate, duration, max_in_flight, poisson, rng):
+    """Send requests on a fixed (or Poisson) schedule of `rate` per second"""
+    start = time.perf_counter()
+    next_time = start
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for path, payload in requests:
+            if next_time - start >= duration:
+                break
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, target, recorder, path, payload, next_time)
+            next_time += rng.expovariate(rate) if poisson else 1.0 / rate
+    return time.perf_counter() - start
+
+
+def run_closed_loop(target, recorder, requests, concurrency, duration, total):
+    """`concurrency` clients each send back-to-back until the duration or request budget runs out"""
+    lock = threading.Lock()
+    sent = [0]
+    deadline = time.perf_counter() + duration
+
+    def client():
+        while time.perf_counter() < deadline:
+            with lock:
+                if total is not None and sent[0] >= total:
+                    return
+                sent[0] += 1
+                path, payload = next(requests)
+            send(target, recorder, path, payload)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def load_replay(path):
+    """
+    Read recorded requests from a JSONL file
+
+    Returns:
+        list: (offset seconds or None, path, payload) in file order
+    """
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            body = entry.get('body', entry)
+            if 'messages' in body:
+                payload = {'messages': list(body['messages'])}
+            elif 'message' in body:
+                payload = {'message': body['message']}
+            else:
+                raise ValueError(f"{path}:{line_number}: expected 'message' or 'messages'")
+            default_path = '/predict/batch' if 'messages' in payload else '/predict'
+            records.append((entry.get('offset'), entry.get('path', default_path), payload))
+    return records
+
+
+def run_replay(target, recorder, records, speed, max_in_flight):
+    """Replay records at their recorded offsets (divided by speed); records without one go out at once"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for offset, path, payload in records:
+            scheduled = start + (offset / speed if offset is not None else 0.0)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, target, recorder, path, payload, max(scheduled, start))
+    return time.perf_counter() - start
+
+
+def model_fallback(target):
+    """Whether /health says the server answers with the fallback heuristic (None if unknown)"""
+    try:
+        status, body, _ = target.request('GET', '/health')
+    except Exception:
+        return None
+    return bool(body.get('fallback')) if status == 200 and isinstance(body, dict) else None
+
+
+def summarize(recorder, seconds, fallback_mode):
+    """Build the report dict printed (and optionally saved) at the end of a run"""
+    latencies = np.asarray(recorder.latencies_ms, dtype=np.float64)
+    total = len(latencies)
+    rejected = recorder.statuses.get(429, 0)
+    errors = sum(recorder.errors.values()) + sum(
+        count for status, count in recorder.statuses.items() if status >= 500
+    )
+    histogram = {}
+    previous = 0
+    for bound in LATENCY_BUCKETS_MS:
+        histogram[f"<={bound}ms"] = int(((latencies > previous) & (latencies <= bound)).sum()) if total else 0
+        previous = bound
+    histogram[f">{LATENCY_BUCKETS_MS[-1]}ms"] = int((latencies > previous).sum()) if total else 0
+    if total:
+        histogram[f"<={LATENCY_BUCKETS_MS[0]}ms"] += int((latencies <= 0).sum())
+
+    report = {
+        'requests': total,
+        'messages': recorder.messages,
+        'seconds': seconds,
+        'requests_per_s': total / seconds if seconds else 0.0,
+        'messages_per_s': recorder.messages / seconds if seconds else 0.0,
+        'status_codes': {str(status): count for status, count in sorted(recorder.statuses.items())},
+        'connection_errors': dict(recorder.errors),
+        'error_rate': errors / total if total else 0.0,
+        'rejected_429_rate': rejected / total if total else 0.0,
+        'degraded_responses': recorder.degraded,
+        'model_fallback': fallback_mode,
+        'latency_histogram': histogram,
+    }
+    if total:
+        report.update({
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p90_ms': float(np.percentile(latencies, 90)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(latencies.max()),
+        })
+    return report
+
+
+def print_report(title, report):
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+    print(f"Requests:     {report['requests']} in {report['seconds']:.1f}s "
+          f"({report['requests_per_s']:.1f} req/s, {report['messages_per_s']:.1f} msg/s)")
+    print(f"Status codes: {report['status_codes'] or '-'}"
+          + (f"   connection errors: {report['connection_errors']}" if report['connection_errors'] else ""))
+    print(f"Error rate:   {report['error_rate'] * 100:.2f}%   429 rate: {report['rejected_429_rate'] * 100:.2f}%")
+    fallback = {None: 'unknown', True: 'YES', False: 'no'}[report['model_fallback']]
+    print(f"Fallback:     {report['degraded_responses']} degraded (overload) responses, "
+          f"model fallback mode: {fallback}")
+    if report['requests']:
+        print(f"Latency:      p50 {report['p50_ms']:.1f} ms   p90 {report['p90_ms']:.1f}   "
+              f"p95 {report['p95_ms']:.1f}   p99 {report['p99_ms']:.1f}   max {report['max_ms']:.1f}")
+        peak = max(report['latency_histogram'].values()) or 1
+        for bucket, count in report['latency_histogram'].items():
+            print(f"  {bucket:>10} {count:>8}  {'█' * int(round(40 * count / peak))}")
+    print("=" * 70 + "\n")
+
+
+def run_smoke(target):
+    """Send the five known messages and check their labels"""
+    ok = True
+    print("\n" + "=" * 70)
+    print(f"🧪 SMOKE TEST against {target.name}")
+    print("=" * 70)
+    for name, message, expected in SMOKE_MESSAGES:
+        status, body, _ = target.request('POST', '/predict', {'message': message})
+        prediction = body.get('prediction') if isinstance(body, dict) else None
+        passed = status == 200 and prediction == expected
+        ok = ok and passed
+        confidence = f"{body.get('confidence')}%" if prediction else body
+        print(f"{'✅' if passed else '❌'} {name:<20} expected {expected:<11} got {prediction} ({confidence})")
+    print("=" * 70 + "\n")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpamShield load generator")
+    subparsers = parser.add_subparsers(dest='mode', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--url', default='http://127.0.0.1:5000', help="Server base URL")
+    common.add_argument('--app', action='store_true', help="Drive app.py in-process instead of a server")
+    common.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout (s)")
+    common.add_argument('--output', help="Also write the report to this JSON file")
+
+    generated = argparse.ArgumentParser(add_help=False)
+    generated.add_argument('--duration', type=float, default=30.0, help="Seconds to run")
+    generated.add_argument('--batch-size', type=int, default=1, help="Messages per request (>1 uses /predict/batch)")
+    generated.add_argument('--seed', type=int, default=0, help="Message sampling seed")
+
+    open_loop = subparsers.add_parser('open', parents=[common, generated], help="Fixed request rate")
+    open_loop.add_argument('--rate', type=float, required=True, help="Requests per second")
+    open_loop.add_argument('--poisson', action='store_true', help="Exponential inter-arrival times")
+    open_loop.add_argument('--max-in-flight', type=int, default=256, help="Client threads sending requests")
+
+    closed_loop = subparsers.add_parser('closed', parents=[common, generated], help="Fixed number of clients")
+    closed_loop.add_argument('--concurrency', type=int, default=8)
+    closed_loop.add_argument('--requests', type=int, default=None, help="Stop after this many requests")
+
+    replay = subparsers.add_parser('replay', parents=[common], help="Replay a JSONL traffic file")
+    replay.add_argument('file')
+    replay.add_argument('--speed', type=float, default=1.0, help="Replay speed factor")
+    replay.add_argument('--max-in-flight', type=int, default=256)
+
+    subparsers.add_parser('smoke', parents=[common], help="Check five known messages")
+
+    args = parser.parse_args(argv)
+    target = AppTarget() if args.app else HttpTarget(args.url, timeout=args.timeout)
+
+    if args.mode == 'smoke':
+        return 0 if run_smoke(target) else 1
+
+    recorder = Recorder()
+    if args.mode == 'replay':
+        records = load_replay(args.file)
+        title = f"REPLAY of {len(records)} requests from {args.file} at {args.speed:g}x against {target.name}"
+        seconds = run_replay(target, recorder, records, args.speed, args.max_in_flight)
+    else:
+        requests = message_payloads(load_spam_messages(), args.batch_size, random.Random(args.seed))
+        if args.mode == 'open':
+            title = f"OPEN LOOP at {args.rate:g} req/s for {args.duration:g}s against {target.name}"
+            seconds = run_open_loop(target, recorder, requests, args.rate, args.duration,
+                                    args.max_in_flight, args.poisson, random.Random(args.seed))
+        else:
+            title = f"CLOSED LOOP with {args.concurrency} clients against {target.name}"
+            seconds = run_closed_loop(target, recorder, requests, args.concurrency, args.duration, args.requests)
+
+    report = summarize(recorder, seconds, model_fallback(target))
+    print_report(title, report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ This script runs the entire SMS Spam Detection pipeline:
 1. Data Ingestion
 2. Data Transformation
 3. Model Training (with MLflow tracking)
+4. Model Quantization (int8 serving artifact)
 
 Usage:
     python run_pipeline.py
@@ -114,6 +115,50 @@ def run_model_training(train_seq_path, test_seq_path):
         logging.error(f"❌ Model Training failed: {str(e)}")
         raise e
 
+def run_model_quantization(model_path, test_seq_path):
+    """
+    Run int8 post-training quantization stage
+    """
+    logging.info("\n" + "=" * 70)
+    logging.info("STAGE 4: MODEL QUANTIZATION (int8)")
+    logging.info("=" * 70)
+    
+    try:
+        from src.components.model_quantizer import ModelQuantizer
+        
+        quantizer = ModelQuantizer()
+        quantized_path, metrics_path = quantizer.initiate_model_quantization(model_path, test_seq_path)
+        
+        logging.info("✅ Model Quantization completed successfully")
+        return quantized_path, metrics_path
+        
+    except Exception as e:
+        logging.error(f"❌ Model Quantization failed: {str(e)}")
+        raise e
+
+def run_cascade_training(train_path, test_path, test_seq_path, model_path):
+    """
+    Run cascade first-tier training stage
+    """
+    logging.info("\n" + "=" * 70)
+    logging.info("STAGE 5: CASCADE FIRST TIER")
+    logging.info("=" * 70)
+    
+    try:
+        from src.components.cascade_trainer import CascadeTrainer
+        
+        trainer = CascadeTrainer()
+        tier_path, metrics_path = trainer.initiate_cascade_training(
+            train_path, test_path, test_seq_path, model_path, os.path.join("artifacts", "vocab.json")
+        )
+        
+        logging.info("✅ Cascade Training completed successfully")
+        return tier_path, metrics_path
+        
+    except Exception as e:
+        logging.error(f"❌ Cascade Training failed: {str(e)}")
+        raise e
+
 def display_results():
     """
     Display pipeline results and next steps
@@ -127,6 +172,10 @@ def display_results():
     logging.info("\n📊 Results saved in:")
     logging.info("   - artifacts/best_model.h5 (Trained model)")
     logging.info("   - artifacts/metrics.json (Performance metrics)")
+    logging.info("   - artifacts/model_int8.npz (Int8 serving model)")
+    logging.info("   - artifacts/quantization_metrics.json (float32 vs int8 report)")
+    logging.info("   - artifacts/cascade_tier1.npz (Cascade first tier)")
+    logging.info("   - artifacts/cascade_metrics.json (LSTM skip fraction and throughput)")
     logging.info("   - artifacts/training_history.png (Training plots)")
     logging.info("   - artifacts/confusion_matrix.png (Confusion matrix)")
     
@@ -172,6 +221,12 @@ def main():
         # Stage 3: Model Training
         model_path = run_model_training(train_seq_path, test_seq_path)
         
+        # Stage 4: Model Quantization
+        run_model_quantization(model_path, test_seq_path)
+        
+        # Stage 5: Cascade First Tier
+        run_cascade_training(train_path, test_path, test_seq_path, model_path)
+        
         # Display results
         end_time = datetime.now()
         duration = end_time - start_time
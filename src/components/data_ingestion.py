@@ -1,22 +1,149 @@
 import os
+import glob
+import sqlite3
+import hashlib
+import tempfile
+import numpy as np
 import pandas as pd
+import yaml
 from sklearn.model_selection import train_test_split
+from src.components.split_store import ShardWriter
 import logging
 
-logging.basicConfig(level=logging.INFO)
+
+class DedupIndex:
+    """
+    Set of 64-bit row fingerprints with bounded memory
+
+    Fingerprints live in a Python set until it holds max_memory_entries,
+    then move to an on-disk SQLite index, so memory stays bounded however
+    many unique rows arrive. (Two different rows share a fingerprint with
+    probability ~n²/2⁶⁵: about 3e-6 for 10 million rows.)
+
+    Args:
+        max_memory_entries (int): Fingerprints kept in memory before
+            switching to SQLite (0 = SQLite from the start)
+        directory (str): Where the SQLite file goes (default: temp dir)
+    """
+
+    def __init__(self, max_memory_entries=1000000, directory=None):
+        self.max_memory_entries = int(max_memory_entries)
+        self.directory = directory
+        self.seen = set()
+        self.db = None
+        self.db_path = None
+        if self.max_memory_entries <= 0:
+            self._open_db()
+
+    def _open_db(self):
+        handle, self.db_path = tempfile.mkstemp(prefix='ingestion-dedup-', suffix='.sqlite', dir=self.directory)
+        os.close(handle)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.execute("PRAGMA journal_mode=OFF")
+        self.db.execute("PRAGMA synchronous=OFF")
+        self.db.execute("CREATE TABLE seen (fingerprint INTEGER PRIMARY KEY) WITHOUT ROWID")
+        if self.seen:
+            self.db.executemany("INSERT INTO seen VALUES (?)", ((fp,) for fp in self.seen))
+            self.seen = set()
+        logging.info(f"🗄️  Deduplication index moved to disk: {self.db_path}")
+
+    def add_new(self, fingerprints):
+        """
+        Record fingerprints
+
+        Args:
+            fingerprints (list): Signed 64-bit ints, one per row
+
+        Returns:
+            list: True for rows seen for the first time (including earlier
+                in this same list)
+        """
+        if self.db is None:
+            seen = self.seen
+            is_new = []
+            for fingerprint in fingerprints:
+                new = fingerprint not in seen
+                if new:
+                    seen.add(fingerprint)
+                is_new.append(new)
+            if len(seen) > self.max_memory_entries:
+                self._open_db()
+            return is_new
+
+        known = set()
+        unique = list(set(fingerprints))
+        for start in range(0, len(unique), 500):
+            batch = unique[start:start + 500]
+            placeholders = ','.join('?' * len(batch))
+            known.update(row[0] for row in self.db.execute(
+                f"SELECT fingerprint FROM seen WHERE fingerprint IN ({placeholders})", batch
+            ))
+        is_new = []
+        added = []
+        for fingerprint in fingerprints:
+            new = fingerprint not in known
+            if new:
+                known.add(fingerprint)
+                added.append((fingerprint,))
+            is_new.append(new)
+        self.db.executemany("INSERT INTO seen VALUES (?)", added)
+        return is_new
+
+    def close(self):
+        """Drop the index (and its SQLite file)"""
+        self.seen = set()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            os.remove(self.db_path)
+
+
+def row_digests(labels, texts, random_state):
+    """
+    Deduplication fingerprints and split slots of rows
+
+    Both come from one keyed BLAKE2b hash of (label, text), so a message
+    gets the same slot in every run, whatever file or position it is in.
+
+    Returns:
+        tuple: (list of signed 64-bit fingerprints, np.ndarray of slots in [0, 1))
+    """
+    key = str(random_state).encode('utf-8')
+    fingerprints = []
+    slots = np.empty(len(texts), dtype=np.float64)
+    for index, (label, text) in enumerate(zip(labels, texts)):
+        digest = hashlib.blake2b(f"{label}\x1f{text}".encode('utf-8'), digest_size=16, key=key).digest()
+        fingerprints.append(int.from_bytes(digest[:8], 'little', signed=True))
+        slots[index] = int.from_bytes(digest[8:], 'little') / 2.0 ** 64
+    return fingerprints, slots
+
 
 class DataIngestion:
     """
     SMS Spam Data Ingestion Component
     
     Connection Flow:
-    1. Reads: notebook/spam.csv (Real SMS dataset - 5572 messages)
+    1. Reads: data_ingestion.raw_data_path in params.yaml (spam.csv, the
+       real SMS dataset - 5572 messages)
     2. Cleans: Removes unnecessary columns (Unnamed: 2, 3, 4)
     3. Renames: v1 → label, v2 → text
     4. Splits: 80% train, 20% test (stratified)
     5. Outputs: artifacts/raw.csv, train.csv, test.csv
     6. Next: data_transform.py uses these CSVs
     
+    Streaming mode (data_ingestion.streaming: true) is for corpora that do
+    not fit in memory:
+    1. Reads: every file matching raw_data_path (a file, a directory of
+       .csv files or a glob), in chunks of chunk_size rows
+    2. Deduplicates: with DedupIndex (bounded memory, spills to SQLite)
+    3. Splits: by a keyed hash of each row, so every label is split
+       test_size / (1 - test_size) in expectation and a message always
+       lands on the same side
+    4. Outputs: artifacts/train/, artifacts/test/ (CSV shards + manifest,
+       see split_store.py); no raw.csv
+    Peak memory depends on chunk_size, not on the size of the corpus. (The
+    later stages still load each split whole: see split_store.read_split.)
+    
     Dataset Format:
     - v1: label (spam/ham)
     - v2: text (SMS content)
@@ -24,8 +151,41 @@ class DataIngestion:
     """
     
     def __init__(self):
-        self.raw_data_path = "C:\\Users\\navee\\Cisco Packet Tracer 8.2.2\\saves\\deep\\spam.csv"
-        self.artifacts_dir = "artifacts"
+        # Load parameters from params.yaml
+        try:
+            with open('params.yaml', 'r') as f:
+                params = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            logging.warning("params.yaml not found, using default parameters")
+            params = {}
+        self.params = params.get('data_ingestion', {})
+        self.raw_data_path = self.params.get('raw_data_path', 'spam.csv')
+        self.artifacts_dir = self.params.get('artifacts_dir', 'artifacts')
+        self.test_size = self.params.get('test_size', 0.2)
+        self.random_state = self.params.get('random_state', 42)
+        self.streaming = bool(self.params.get('streaming', False))
+        
+    def split_paths(self):
+        """
+        Where this configuration writes the splits
+        
+        data_ingestion.train_path / test_path when set (dvc.yaml reads the
+        same keys), otherwise artifacts/train.csv, test.csv, or the
+        artifacts/train/, test/ shard directories in streaming mode.
+        
+        Returns:
+            tuple: (train_path, test_path): CSV files, or shard
+                directories in streaming mode
+        """
+        if self.streaming:
+            paths = (self.params.get('train_path') or os.path.join(self.artifacts_dir, "train"),
+                     self.params.get('test_path') or os.path.join(self.artifacts_dir, "test"))
+            if any(path.endswith('.csv') for path in paths):
+                raise ValueError("Streaming ingestion writes shard directories: set data_ingestion.train_path "
+                                 "and test_path to directories (e.g. artifacts/train, artifacts/test)")
+            return paths
+        return (self.params.get('train_path') or os.path.join(self.artifacts_dir, "train.csv"),
+                self.params.get('test_path') or os.path.join(self.artifacts_dir, "test.csv"))
         
     def initiate_data_ingestion(self):
         """
@@ -34,6 +194,9 @@ class DataIngestion:
         Returns:
             tuple: (train_path, test_path)
         """
+        if self.streaming:
+            return self.initiate_streaming_ingestion()
+        
         logging.info("=" * 70)
         logging.info("SMS SPAM DETECTION - DATA INGESTION STARTED")
         logging.info(f"User: Naveenkumar5151 | Date: 2025-01-11 18:58:34")
@@ -84,14 +247,13 @@ class DataIngestion:
             # Stratified split (80% train, 20% test)
             train_df, test_df = train_test_split(
                 df, 
-                test_size=0.2, 
-                random_state=42,
+                test_size=self.test_size, 
+                random_state=self.random_state,
                 stratify=df['label']
             )
             
             # Save train and test sets
-            train_path = os.path.join(self.artifacts_dir, "train.csv")
-            test_path = os.path.join(self.artifacts_dir, "test.csv")
+            train_path, test_path = self.split_paths()
             
             train_df.to_csv(train_path, index=False)
             test_df.to_csv(test_path, index=False)
@@ -124,12 +286,109 @@ class DataIngestion:
             
         except FileNotFoundError:
             logging.error(f"❌ Error: File not found - {self.raw_data_path}")
-            logging.error("Please ensure 'spam.csv' is in the 'notebook/' directory")
+            logging.error("Please set data_ingestion.raw_data_path in params.yaml")
             raise
         except Exception as e:
             logging.error(f"❌ Error in data ingestion: {str(e)}")
             raise e
+    
+    def input_files(self):
+        """Files matching raw_data_path (a file, a directory of .csv files or a glob), in sorted order"""
+        pattern = self.raw_data_path
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.csv')
+        files = sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+        if not files:
+            raise FileNotFoundError(self.raw_data_path)
+        return files
+    
+    def initiate_streaming_ingestion(self):
+        """
+        Chunked ingestion with bounded memory (data_ingestion.streaming: true)
+        
+        Returns:
+            tuple: (train_dir, test_dir) shard directories
+        """
+        logging.info("=" * 70)
+        logging.info("SMS SPAM DETECTION - STREAMING DATA INGESTION STARTED")
+        logging.info("=" * 70)
+        
+        chunk_size = int(self.params.get('chunk_size', 100000))
+        label_column = self.params.get('label_column', 'v1')
+        text_column = self.params.get('text_column', 'v2')
+        encoding = self.params.get('encoding', 'latin-1')
+        
+        dedup = None
+        try:
+            files = self.input_files()
+            logging.info(f"📂 Reading {len(files)} file(s) matching: {self.raw_data_path} "
+                         f"({chunk_size} rows per chunk)")
+            
+            os.makedirs(self.artifacts_dir, exist_ok=True)
+            train_path, test_path = self.split_paths()
+            shard_rows = int(self.params.get('shard_rows', 500000))
+            train_writer = ShardWriter(train_path, shard_rows)
+            test_writer = ShardWriter(test_path, shard_rows)
+            dedup = DedupIndex(
+                max_memory_entries=int(self.params.get('dedup_memory_entries', 1000000)),
+                directory=self.params.get('dedup_dir')
+            )
+            
+            rows_read = 0
+            missing = 0
+            duplicates = 0
+            for path in files:
+                reader = pd.read_csv(
+                    path, encoding=encoding, usecols=[label_column, text_column],
+                    dtype=str, chunksize=chunk_size
+                )
+                for chunk in reader:
+                    chunk = chunk[[label_column, text_column]]
+                    chunk.columns = ['label', 'text']
+                    rows_read += len(chunk)
+                    
+                    # Handle missing values
+                    complete = chunk.dropna()
+                    missing += len(chunk) - len(complete)
+                    
+                    # Remove duplicates (within the chunk and against every earlier chunk)
+                    fingerprints, slots = row_digests(complete['label'], complete['text'], self.random_state)
+                    is_new = np.fromiter(dedup.add_new(fingerprints), dtype=bool, count=len(fingerprints))
+                    duplicates += int((~is_new).sum())
+                    
+                    # Hash-based split
+                    is_test = slots < self.test_size
+                    train_writer.write(complete[is_new & ~is_test])
+                    test_writer.write(complete[is_new & is_test])
+                logging.info(f"   ✅ {path}: {rows_read} rows read so far")
+            
+            train_writer.close()
+            test_writer.close()
+            
+            logging.info(f"🧹 Removed {duplicates} duplicates and {missing} rows with missing values")
+            logging.info(f"✨ Kept {train_writer.num_rows + test_writer.num_rows} of {rows_read} rows")
+            for name, writer, path in (('📚 Train', train_writer, train_path), ('📖 Test', test_writer, test_path)):
+                logging.info(f"{name} data: {writer.num_rows} rows in {len(writer.shards)} shard(s) → {path}")
+                for label, count in sorted(writer.label_counts.items()):
+                    logging.info(f"   - {label}: {count}")
+            
+            logging.info("\n" + "=" * 70)
+            logging.info("✅ STREAMING DATA INGESTION COMPLETED SUCCESSFULLY")
+            logging.info("=" * 70 + "\n")
+            
+            return train_path, test_path
+            
+        except FileNotFoundError:
+            logging.error(f"❌ Error: No input files match - {self.raw_data_path}")
+            raise
+        except Exception as e:
+            logging.error(f"❌ Error in streaming data ingestion: {str(e)}")
+            raise e
+        finally:
+            if dedup is not None:
+                dedup.close()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     obj = DataIngestion()
     train_path, test_path = obj.initiate_data_ingestion()
\ No newline at end of file
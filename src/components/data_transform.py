@@ -1,35 +1,79 @@
 import os
-import re
 import numpy as np
 import pandas as pd
 import joblib
-import nltk
+import yaml
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.preprocessing import LabelEncoder
 from keras_preprocessing.text import Tokenizer
 from keras_preprocessing.sequence import pad_sequences
+from src.components.sequence_store import save_sequences
+from src.components.split_store import read_split
+from src.pipeline.text_cleaner import clean_text, clean_texts
+from src.pipeline.vocab_tokenizer import VocabTokenizer, save_vocab
 import logging
 
-# Download NLTK data
-try:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('punkt', quiet=True)
-except:
-    pass
+# Tokenizer of a sequencing worker process (set by _init_sequence_worker)
+_worker_tokenizer = None
+_worker_max_length = None
 
-from nltk.corpus import stopwords
 
-logging.basicConfig(level=logging.INFO)
+def _fit_chunk(tokenizer, texts):
+    """
+    Clean a chunk and count its words (parallel mode, runs in a worker)
+    
+    Args:
+        tokenizer (Tokenizer): Unfitted tokenizer with the stage's settings
+        texts (list): Raw texts
+        
+    Returns:
+        tuple: (cleaned texts, document_count, word_counts, word_docs)
+    """
+    cleaned = clean_texts(texts)
+    tokenizer.fit_on_texts(cleaned)
+    return cleaned, tokenizer.document_count, tokenizer.word_counts, tokenizer.word_docs
+
+
+def _init_sequence_worker(tokenizer, max_length):
+    global _worker_tokenizer, _worker_max_length
+    _worker_tokenizer = tokenizer
+    _worker_max_length = max_length
+
+
+def _sequence_chunk(texts, clean=False):
+    """
+    Padded sequences of a chunk (parallel mode, runs in a worker)
+    
+    Args:
+        texts (list): Cleaned texts, or raw texts with clean=True
+        clean (bool): Clean the texts first
+        
+    Returns:
+        np.ndarray: int32 (len(texts), max_length)
+    """
+    if clean:
+        texts = clean_texts(texts)
+    return pad_sequences(
+        _worker_tokenizer.texts_to_sequences(texts),
+        maxlen=_worker_max_length,
+        padding='post',
+        truncating='post'
+    )
+
 
 class DataTransformation:
     """
     SMS Text Preprocessing for TensorFlow/Keras Deep Learning
     
     Connection Flow:
-    1. Reads: artifacts/train.csv, test.csv (from data_ingestion.py)
-    2. Cleans: Text preprocessing (lowercase, remove special chars)
+    1. Reads: artifacts/train.csv, test.csv (from data_ingestion.py; or
+       the artifacts/train/, test/ shard directories in streaming mode)
+    2. Cleans: Text preprocessing (lowercase, remove special chars) via
+       src/pipeline/text_cleaner.py, shared with predict_pipeline.py
     3. Tokenizes: TensorFlow Tokenizer (converts words to integers)
     4. Sequences: Creates padded sequences for LSTM
-    5. Outputs: preprocessing.pkl, train_sequences.pkl, test_sequences.pkl
+    5. Outputs: preprocessing.pkl, vocab.json (serving vocabulary),
+       train_sequences/, test_sequences/ (.npy arrays + manifest.json)
     6. Next: model_trainer.py uses these for TensorFlow training
     
     Preprocessing Steps:
@@ -38,22 +82,66 @@ class DataTransformation:
     - Remove stopwords
     - TensorFlow Tokenization
     - Padding to max_length=100
+    
+    Parallel mode (data_transformation.n_jobs > 1 in params.yaml) splits the
+    texts into chunks of chunk_size and cleans, counts and sequences them in
+    a process pool. Chunk results are merged in order, so the sequences and
+    vocabulary are identical to the serial path.
     """
     
     def __init__(self):
         self.artifacts_dir = "artifacts"
-        self.label_encoder = LabelEncoder()
-        self.tokenizer = Tokenizer(num_words=10000, oov_token='<OOV>')
-        self.max_length = 100
         
+        # Load parameters from params.yaml
         try:
-            self.stop_words = set(stopwords.words('english'))
-        except:
-            self.stop_words = set()
+            with open('params.yaml', 'r') as f:
+                params = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            logging.warning("params.yaml not found, using default parameters")
+            params = {}
+        self.params = params.get('data_transformation', {})
+        
+        self.label_encoder = LabelEncoder()
+        self.tokenizer = self._new_tokenizer()
+        self.max_length = self.params.get('max_length', 100)
+        self._stop_words = None
+        
+        n_jobs = int(self.params.get('n_jobs', 1))
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs < 1 else n_jobs
+        self.chunk_size = int(self.params.get('chunk_size', 50000))
+        if self.chunk_size < 1:
+            raise ValueError("data_transformation.chunk_size must be at least 1")
+    
+    def _new_tokenizer(self):
+        return Tokenizer(
+            num_words=self.params.get('max_words', 10000),
+            oov_token=self.params.get('oov_token', '<OOV>')
+        )
+    
+    @property
+    def stop_words(self):
+        """
+        English stopwords, loaded (and downloaded if missing) on first use
+        
+        Importing this module no longer touches the network, so an offline
+        machine cannot hang on nltk.download.
+        """
+        if self._stop_words is None:
+            try:
+                import nltk
+                from nltk.corpus import stopwords
+                try:
+                    self._stop_words = set(stopwords.words('english'))
+                except LookupError:
+                    nltk.download('stopwords', quiet=True)
+                    self._stop_words = set(stopwords.words('english'))
+            except Exception:
+                self._stop_words = set()
+        return self._stop_words
         
     def clean_text(self, text):
         """
-        Clean SMS/Email text
+        Clean SMS/Email text (shared with the serving pipeline)
         
         Args:
             text (str): Raw text
@@ -61,30 +149,11 @@ class DataTransformation:
         Returns:
             str: Cleaned text
         """
-        # Convert to string (handle any non-string values)
-        text = str(text)
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # Remove extra whitespaces
-        text = ' '.join(text.split())
-        
         # Remove stopwords (optional - may reduce accuracy for short SMS)
         # Uncomment below if needed:
-        # words = text.split()
-        # text = ' '.join([w for w in words if w not in self.stop_words])
-        
-        return text
+        # words = clean_text(text).split()
+        # return ' '.join([w for w in words if w not in self.stop_words])
+        return clean_text(text)
     
     def preprocess_data(self, df, is_train=True):
         """
@@ -97,33 +166,29 @@ class DataTransformation:
         Returns:
             tuple: (sequences, labels)
         """
-        # Clean texts
-        texts = df['text'].apply(self.clean_text).tolist()
         labels = df['label'].tolist()
         
-        # Tokenize texts
-        if is_train:
-            self.tokenizer.fit_on_texts(texts)
-            logging.info(f"📚 Vocabulary size: {len(self.tokenizer.word_index)}")
-            
-            # Show most common words
-            word_counts = sorted(
-                self.tokenizer.word_counts.items(), 
-                key=lambda x: x[1], 
-                reverse=True
-            )[:10]
-            logging.info(f"🔤 Top 10 words: {[w[0] for w in word_counts]}")
-        
-        # Convert to sequences
-        sequences = self.tokenizer.texts_to_sequences(texts)
-        
-        # Pad sequences
-        padded_sequences = pad_sequences(
-            sequences, 
-            maxlen=self.max_length, 
-            padding='post', 
-            truncating='post'
-        )
+        if self.n_jobs > 1 and len(df) > self.chunk_size:
+            padded_sequences = self._preprocess_parallel(df['text'].tolist(), is_train)
+        else:
+            # Clean texts
+            texts = clean_texts(df['text'])
+            
+            # Tokenize texts
+            if is_train:
+                self.tokenizer.fit_on_texts(texts)
+                self._log_vocabulary()
+            
+            # Convert to sequences
+            sequences = self.tokenizer.texts_to_sequences(texts)
+            
+            # Pad sequences
+            padded_sequences = pad_sequences(
+                sequences, 
+                maxlen=self.max_length, 
+                padding='post', 
+                truncating='post'
+            )
         
         # Encode labels (spam=1, ham=0)
         if is_train:
@@ -133,6 +198,69 @@ class DataTransformation:
         
         return padded_sequences, encoded_labels
     
+    def _log_vocabulary(self):
+        logging.info(f"📚 Vocabulary size: {len(self.tokenizer.word_index)}")
+        
+        # Show most common words
+        word_counts = sorted(
+            self.tokenizer.word_counts.items(), 
+            key=lambda x: x[1], 
+            reverse=True
+        )[:10]
+        logging.info(f"🔤 Top 10 words: {[w[0] for w in word_counts]}")
+    
+    def _preprocess_parallel(self, texts, is_train):
+        """
+        Clean, fit and sequence texts in a process pool
+        
+        Training data takes two passes. Workers first clean their chunk and
+        count its words; the counts are merged in chunk order, which gives
+        word_counts the same insertion order as a serial fit (and so the
+        same word_index, since the ranking sort is stable). Workers then
+        sequence the cleaned chunks with the fitted tokenizer. Test data
+        takes one pass (clean and sequence).
+        
+        Args:
+            texts (list): Raw texts
+            is_train (bool): Fit the tokenizer first
+            
+        Returns:
+            np.ndarray: Padded sequences, in input order
+        """
+        chunks = [texts[start:start + self.chunk_size] for start in range(0, len(texts), self.chunk_size)]
+        workers = min(self.n_jobs, len(chunks))
+        logging.info(f"⚡ Preprocessing {len(texts)} texts in {len(chunks)} chunks on {workers} processes")
+        
+        clean = True
+        if is_train:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                fitted = list(pool.map(_fit_chunk, [self._new_tokenizer()] * len(chunks), chunks))
+            
+            word_counts = self.tokenizer.word_counts
+            word_docs = self.tokenizer.word_docs
+            chunks = []
+            for cleaned, document_count, chunk_counts, chunk_docs in fitted:
+                chunks.append(cleaned)
+                self.tokenizer.document_count += document_count
+                for word, count in chunk_counts.items():
+                    word_counts[word] = word_counts.get(word, 0) + count
+                for word, count in chunk_docs.items():
+                    word_docs[word] += count
+            del fitted
+            # Fitting on no texts rebuilds word_index, index_word and
+            # index_docs from the merged counts
+            self.tokenizer.fit_on_texts([])
+            self._log_vocabulary()
+            clean = False
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_sequence_worker,
+            initargs=(self.tokenizer, self.max_length)
+        ) as pool:
+            sequences = list(pool.map(_sequence_chunk, chunks, [clean] * len(chunks)))
+        return np.concatenate(sequences)
+    
     def initiate_data_transformation(self, train_path, test_path):
         """
         Main transformation pipeline
@@ -150,8 +278,8 @@ class DataTransformation:
         
         try:
             # Load data
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            train_df = read_split(train_path)
+            test_df = read_split(test_path)
             
             logging.info(f"📊 Train shape: {train_df.shape}")
             logging.info(f"📊 Test shape: {test_df.shape}")
@@ -179,19 +307,17 @@ class DataTransformation:
             joblib.dump(preprocessing_obj, preprocessing_path)
             logging.info(f"💾 Preprocessing objects saved to: {preprocessing_path}")
             
-            # Save sequences
-            train_seq_path = os.path.join(self.artifacts_dir, "train_sequences.pkl")
-            test_seq_path = os.path.join(self.artifacts_dir, "test_sequences.pkl")
+            # Save the compact, pickle-free vocabulary used for serving
+            vocab_path = os.path.join(self.artifacts_dir, "vocab.json")
+            save_vocab(vocab_path, VocabTokenizer.from_keras(self.tokenizer), self.max_length)
+            logging.info(f"💾 Serving vocabulary saved to: {vocab_path}")
             
-            joblib.dump({
-                'X': X_train,
-                'y': y_train
-            }, train_seq_path)
+            # Save sequences (.npy + manifest, memory-mapped by the trainer)
+            train_seq_path = os.path.join(self.artifacts_dir, "train_sequences")
+            test_seq_path = os.path.join(self.artifacts_dir, "test_sequences")
             
-            joblib.dump({
-                'X': X_test,
-                'y': y_test
-            }, test_seq_path)
+            save_sequences(train_seq_path, X_train, y_train)
+            save_sequences(test_seq_path, X_test, y_test)
             
             logging.info(f"💾 Train sequences saved to: {train_seq_path}")
             logging.info(f"💾 Test sequences saved to: {test_seq_path}")
@@ -219,6 +345,7 @@ class DataTransformation:
             raise e
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     from src.components.data_ingestion import DataIngestion
     
     # Run data ingestion first
@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import numpy as np
+import logging
+import yaml
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+from src.components.sequence_store import load_sequences
+from src.pipeline.numpy_engine import NumpyLSTMEngine, read_h5_model
+from src.pipeline.quantization import Int8LSTMEngine, save_int8_model
+
+class ModelQuantizer:
+    """
+    Int8 Post-Training Quantization for the LSTM Model
+
+    Connection Flow:
+    1. Reads: best_model.h5 (from model_trainer.py), test_sequences/
+    2. Quantizes: every kernel/embedding to int8 with per-channel scales
+    3. Calibrates: activation ranges on the test sequences (optional)
+    4. Evaluates: float vs int8 accuracy, precision, recall, F1,
+       p50/p99 latency and model size
+    5. Outputs: model_int8.npz, quantization_metrics.json
+    6. Next: predict_pipeline.py serves it with INFERENCE_ENGINE=int8
+
+    Quantization Details:
+    - Weights: symmetric int8, one scale per embedding row / kernel column
+    - Biases: float32
+    - Activations (quantize_activations: true): static per-tensor int8
+      scales for the LSTM state and the Dense inputs, from max |x| seen
+      on the calibration sequences
+    """
+
+    def __init__(self):
+        self.artifacts_dir = "artifacts"
+
+        # Load parameters from params.yaml
+        try:
+            with open('params.yaml', 'r') as f:
+                params = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            logging.warning("params.yaml not found, using default parameters")
+            params = {}
+        self.params = params.get('model_quantization', {})
+
+    def calibrate(self, engine, X):
+        """
+        Collect static activation scales
+
+        Args:
+            engine (NumpyLSTMEngine): Float engine
+            X (np.ndarray): Calibration sequences
+
+        Returns:
+            dict: Activation name → int8 scale (max |x| / 127)
+        """
+        max_abs = {}
+
+        def observe(name, values):
+            max_abs[name] = max(max_abs.get(name, 0.0), float(np.max(np.abs(values))))
+
+        engine.activation_observer = observe
+        try:
+            engine.predict_proba(X)
+        finally:
+            engine.activation_observer = None
+
+        return {name: (value / 127.0 if value > 0 else 1.0) for name, value in max_abs.items()}
+
+    def evaluate(self, engine, X, y):
+        """Classification metrics of an engine on labelled sequences"""
+        y_pred = (engine.predict_proba(X) > 0.5).astype(int)
+        return {
+            'accuracy': float(accuracy_score(y, y_pred)),
+            'precision': float(precision_score(y, y_pred)),
+            'recall': float(recall_score(y, y_pred)),
+            'f1_score': float(f1_score(y, y_pred))
+        }
+
+    def measure_latency(self, engine, X):
+        """Single-message p50/p99 latency in milliseconds"""
+        samples = X[:self.params.get('latency_samples', 200)]
+        engine.predict_proba(samples[:1])
+        latencies = []
+        for row in samples:
+            start = time.perf_counter()
+            engine.predict_proba(row[None, :])
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        return {
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p99_ms': float(np.percentile(latencies, 99))
+        }
+
+    def initiate_model_quantization(self, model_path, test_seq_path):
+        """
+        Main quantization pipeline
+
+        Args:
+            model_path (str): Path to best_model.h5
+            test_seq_path (str): Calibration/evaluation sequence directory
+
+        Returns:
+            tuple: (quantized model path, metrics path)
+        """
+        logging.info("=" * 70)
+        logging.info("SMS SPAM DETECTION - MODEL QUANTIZATION STARTED")
+        logging.info("=" * 70)
+
+        try:
+            X_test, y_test = load_sequences(test_seq_path)
+            X_test = np.asarray(X_test, dtype=np.int32)
+            max_length = X_test.shape[1]
+
+            float_engine = NumpyLSTMEngine(model_path, max_length)
+
+            # Calibrate activation ranges
+            quantize_activations = self.params.get('quantize_activations', False)
+            calibration_samples = self.params.get('calibration_samples', 512)
+            activation_scales = None
+            if quantize_activations:
+                logging.info(f"🎯 Calibrating activations on {min(calibration_samples, len(X_test))} sequences...")
+                activation_scales = self.calibrate(float_engine, X_test[:calibration_samples])
+                logging.info(f"   Activation scales: {activation_scales}")
+
+            # Quantize weights and save the serving artifact
+            logging.info("🔢 Quantizing weights to int8...")
+            quantized_path = os.path.join(self.artifacts_dir, "model_int8.npz")
+            save_int8_model(quantized_path, read_h5_model(model_path), activation_scales)
+            int8_engine = Int8LSTMEngine(quantized_path, max_length)
+            logging.info(f"💾 Int8 model saved to: {quantized_path}")
+
+            # Compare float and int8 models
+            logging.info("📈 Evaluating float32 vs int8...")
+            report = {}
+            for label, engine, path in (
+                ('float32', float_engine, model_path),
+                ('int8', int8_engine, quantized_path)
+            ):
+                report[label] = self.evaluate(engine, X_test, y_test)
+                report[label].update(self.measure_latency(engine, X_test))
+                report[label]['size_bytes'] = os.path.getsize(path)
+
+            report['delta'] = {
+                key: report['int8'][key] - report['float32'][key]
+                for key in ('accuracy', 'precision', 'recall', 'f1_score', 'p50_ms', 'p99_ms')
+            }
+            report['size_ratio'] = report['int8']['size_bytes'] / report['float32']['size_bytes']
+            report['quantize_activations'] = bool(quantize_activations)
+            report['calibration_samples'] = int(min(calibration_samples, len(X_test))) if quantize_activations else 0
+
+            metrics_path = os.path.join(self.artifacts_dir, "quantization_metrics.json")
+            with open(metrics_path, 'w') as f:
+                json.dump(report, f, indent=4)
+
+            logging.info("\n" + "=" * 70)
+            logging.info("📊 QUANTIZATION RESULTS (float32 → int8):")
+            for key in ('accuracy', 'precision', 'recall', 'f1_score'):
+                logging.info(f"   {key:<10} {report['float32'][key]:.4f} → {report['int8'][key]:.4f} "
+                             f"({report['delta'][key]:+.4f})")
+            logging.info(f"   p50 ms     {report['float32']['p50_ms']:.2f} → {report['int8']['p50_ms']:.2f}")
+            logging.info(f"   p99 ms     {report['float32']['p99_ms']:.2f} → {report['int8']['p99_ms']:.2f}")
+            logging.info(f"   size       {report['float32']['size_bytes'] / 1e6:.2f} MB → "
+                         f"{report['int8']['size_bytes'] / 1e6:.2f} MB")
+            logging.info("=" * 70)
+            logging.info(f"💾 Quantization metrics saved to: {metrics_path}")
+
+            logging.info("\n" + "=" * 70)
+            logging.info("✅ MODEL QUANTIZATION COMPLETED SUCCESSFULLY")
+            logging.info("=" * 70 + "\n")
+
+            return quantized_path, metrics_path
+
+        except Exception as e:
+            logging.error(f"❌ Error in model quantization: {str(e)}")
+            raise e
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    quantizer = ModelQuantizer()
+    quantizer.initiate_model_quantization(
+        os.path.join("artifacts", "best_model.h5"),
+        os.path.join("artifacts", "test_sequences")
+    )
@@ -13,14 +13,60 @@ import mlflow
 import mlflow.tensorflow
 import yaml
 
-logging.basicConfig(level=logging.INFO)
+from src.components.sequence_store import load_sequences
+
+
+class SequenceBatches(keras.utils.PyDataset):
+    """
+    Batches of memory-mapped sequences for fit / evaluate / predict
+    
+    Keras copies NumPy inputs into one in-memory tensor before training,
+    memory-mapped or not. This dataset slices the arrays one batch at a
+    time instead, so only the batch being trained on is read into memory.
+    
+    Args:
+        X (np.ndarray): Padded sequences (usually a read-only memmap)
+        y (np.ndarray): Labels, or None for predict
+        batch_size (int): Samples per batch
+        shuffle (bool): Draw a new sample order every epoch (training)
+    """
+    
+    def __init__(self, X, y=None, batch_size=64, shuffle=False):
+        super().__init__()
+        self.X = X
+        self.y = y
+        self.batch_size = int(batch_size)
+        self.shuffle = shuffle
+        self.order = None
+        self.on_epoch_end()
+    
+    def __len__(self):
+        return (len(self.X) + self.batch_size - 1) // self.batch_size
+    
+    def __getitem__(self, index):
+        start = index * self.batch_size
+        stop = min(start + self.batch_size, len(self.X))
+        if self.order is None:
+            rows = slice(start, stop)
+        else:
+            # Sorted, so each batch reads the file front to back
+            rows = np.sort(self.order[start:stop])
+        X = np.asarray(self.X[rows])
+        if self.y is None:
+            return X
+        return X, np.asarray(self.y[rows])
+    
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.order = np.random.permutation(len(self.X))
+
 
 class ModelTrainer:
     """
     TensorFlow/Keras LSTM Model Trainer for SMS Spam Detection
     
     Connection Flow:
-    1. Reads: train_sequences.pkl, test_sequences.pkl (from data_transform.py)
+    1. Reads: train_sequences/, test_sequences/ (from data_transform.py)
     2. Builds: LSTM model with Embedding → Bidirectional LSTM → Dense layers
     3. Trains: For 20 epochs with early stopping
     4. Evaluates: Accuracy, Precision, Recall, F1-Score
@@ -168,8 +214,8 @@ class ModelTrainer:
         Train LSTM model with MLflow tracking
         
         Args:
-            train_seq_path (str): Path to training sequences
-            test_seq_path (str): Path to test sequences
+            train_seq_path (str): Training sequence directory (or legacy .pkl)
+            test_seq_path (str): Test sequence directory (or legacy .pkl)
             
         Returns:
             str: Path to saved model
@@ -193,14 +239,10 @@ class ModelTrainer:
         # Start MLflow run
         with mlflow.start_run(run_name=mlflow_params.get('run_name_prefix', 'lstm_model')):
             try:
-                # Load sequences
-                train_data = joblib.load(train_seq_path)
-                test_data = joblib.load(test_seq_path)
-                
-                X_train = train_data['X']
-                y_train = train_data['y']
-                X_test = test_data['X']
-                y_test = test_data['y']
+                # Open sequences memory-mapped; SequenceBatches below reads them
+                # one batch at a time, so the corpus never has to fit in RAM
+                X_train, y_train = load_sequences(train_seq_path)
+                X_test, y_test = load_sequences(test_seq_path)
                 
                 logging.info(f"📊 Training samples: {X_train.shape[0]}")
                 logging.info(f"📊 Test samples: {X_test.shape[0]}")
@@ -262,11 +304,12 @@ class ModelTrainer:
                 
                 # Train model
                 logging.info("\n🚀 Training model...")
+                train_batches = SequenceBatches(X_train, y_train, batch_size, shuffle=True)
+                test_batches = SequenceBatches(X_test, y_test, batch_size)
                 history = model.fit(
-                    X_train, y_train,
+                    train_batches,
                     epochs=epochs,
-                    batch_size=batch_size,
-                    validation_data=(X_test, y_test),
+                    validation_data=test_batches,
                     callbacks=[early_stopping, checkpoint],
                     verbose=1
                 )
@@ -280,10 +323,10 @@ class ModelTrainer:
                 
                 # Evaluate model
                 logging.info("\n📈 Evaluating model...")
-                test_loss, test_accuracy = model.evaluate(X_test, y_test, verbose=0)
+                test_loss, test_accuracy = model.evaluate(test_batches, verbose=0)
                 
                 # Predictions
-                y_pred_proba = model.predict(X_test, verbose=0)
+                y_pred_proba = model.predict(SequenceBatches(X_test, batch_size=batch_size), verbose=0)
                 y_pred = (y_pred_proba > 0.5).astype(int).flatten()
                 
                 # Calculate metrics
@@ -366,6 +409,7 @@ class ModelTrainer:
                 raise e
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     from src.components.data_ingestion import DataIngestion
     from src.components.data_transform import DataTransformation
     
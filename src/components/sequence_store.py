@@ -0,0 +1,87 @@
+import os
+import json
+import numpy as np
+import joblib
+
+SEQUENCES_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+def save_sequences(directory, X, y):
+    """
+    Write padded sequences and labels as .npy files with a manifest
+
+    Layout:
+        <directory>/X.npy          int32 (samples, max_length)
+        <directory>/y.npy          labels (samples,)
+        <directory>/manifest.json  format version, sample count, shapes
+
+    Args:
+        directory (str): Output directory, e.g. artifacts/train_sequences
+        X (np.ndarray): Padded sequences
+        y (np.ndarray): Encoded labels
+
+    Returns:
+        str: The output directory
+    """
+    X = np.ascontiguousarray(X, dtype=np.int32)
+    y = np.ascontiguousarray(y)
+    if X.ndim != 2 or len(X) != len(y):
+        raise ValueError(f"Expected X (samples, max_length) and y (samples,), got {X.shape} and {y.shape}")
+
+    os.makedirs(directory, exist_ok=True)
+    arrays = {}
+    for name, array in (('X', X), ('y', y)):
+        file_name = f"{name}.npy"
+        np.save(os.path.join(directory, file_name), array)
+        arrays[name] = {'file': file_name, 'dtype': str(array.dtype), 'shape': list(array.shape)}
+
+    manifest = {
+        'format_version': SEQUENCES_FORMAT_VERSION,
+        'num_samples': int(X.shape[0]),
+        'max_length': int(X.shape[1]),
+        'arrays': arrays
+    }
+    # Written last: a directory with a manifest is a complete artifact
+    with open(os.path.join(directory, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return directory
+
+
+def load_sequences(path, mmap_mode='r'):
+    """
+    Open sequences written by save_sequences
+
+    The arrays are memory-mapped (read-only by default), so opening is
+    near-instant and pages are read from disk only when touched. Legacy
+    joblib pickles ({'X': ..., 'y': ...}) are still accepted and are
+    loaded fully into memory.
+
+    Args:
+        path (str): Sequence directory, or a legacy .pkl file
+        mmap_mode (str): np.load mmap mode; None loads into memory
+
+    Returns:
+        tuple: (X, y)
+    """
+    if os.path.isfile(path):
+        data = joblib.load(path)
+        return np.asarray(data['X']), np.asarray(data['y'])
+
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Sequence manifest not found: {manifest_path}")
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    version = manifest.get('format_version')
+    if version != SEQUENCES_FORMAT_VERSION:
+        raise ValueError(f"Unsupported sequence artifact version: {version}")
+
+    loaded = {}
+    for name in ('X', 'y'):
+        spec = manifest['arrays'][name]
+        array = np.load(os.path.join(path, spec['file']), mmap_mode=mmap_mode, allow_pickle=False)
+        if list(array.shape) != spec['shape'] or str(array.dtype) != spec['dtype']:
+            raise ValueError(f"{spec['file']} does not match its manifest entry")
+        loaded[name] = array
+    return loaded['X'], loaded['y']
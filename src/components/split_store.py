@@ -0,0 +1,125 @@
+import os
+import json
+import pandas as pd
+
+SPLIT_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+SPLIT_COLUMNS = ['label', 'text']
+
+
+class ShardWriter:
+    """
+    Streams label/text rows into numbered CSV shards
+
+    Layout:
+        <directory>/part-00000.csv  label,text (same CSV dialect as train.csv)
+        <directory>/part-00001.csv  ...
+        <directory>/manifest.json   format version, shards, row and label counts
+
+    Rows are appended as they arrive, so memory use does not depend on the
+    size of the split.
+
+    Args:
+        directory (str): Output directory, e.g. artifacts/train
+        shard_rows (int): Rows per shard before a new one is started
+    """
+
+    def __init__(self, directory, shard_rows=500000):
+        if shard_rows < 1:
+            raise ValueError("shard_rows must be at least 1")
+        self.directory = directory
+        self.shard_rows = int(shard_rows)
+        self.shards = []
+        self.num_rows = 0
+        self.label_counts = {}
+        self._rows_in_shard = 0
+
+        os.makedirs(directory, exist_ok=True)
+        # A manifest marks a complete split: drop the old one (and its shards)
+        # first so a failed run cannot leave a mix of old and new files behind
+        for name in os.listdir(directory):
+            if name == MANIFEST_NAME or (name.startswith('part-') and name.endswith('.csv')):
+                os.remove(os.path.join(directory, name))
+
+    def write(self, df):
+        """
+        Append rows
+
+        Args:
+            df (pd.DataFrame): Rows with 'label' and 'text' columns
+        """
+        start = 0
+        while start < len(df):
+            if not self.shards or self._rows_in_shard >= self.shard_rows:
+                self.shards.append({'file': f"part-{len(self.shards):05d}.csv", 'num_rows': 0})
+                self._rows_in_shard = 0
+            shard = self.shards[-1]
+            rows = df.iloc[start:start + self.shard_rows - self._rows_in_shard]
+            rows[SPLIT_COLUMNS].to_csv(
+                os.path.join(self.directory, shard['file']),
+                mode='a', index=False, header=shard['num_rows'] == 0
+            )
+            shard['num_rows'] += len(rows)
+            self._rows_in_shard += len(rows)
+            self.num_rows += len(rows)
+            for label, count in rows['label'].value_counts().items():
+                self.label_counts[label] = self.label_counts.get(label, 0) + int(count)
+            start += len(rows)
+
+    def close(self):
+        """
+        Write the manifest (last: a directory with a manifest is complete)
+
+        Returns:
+            str: The output directory
+        """
+        manifest = {
+            'format_version': SPLIT_FORMAT_VERSION,
+            'num_rows': self.num_rows,
+            'label_counts': self.label_counts,
+            'shards': self.shards
+        }
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=4)
+        return self.directory
+
+
+def split_files(path):
+    """
+    CSV files of a split, in order
+
+    Args:
+        path (str): A CSV file (train.csv) or a shard directory (artifacts/train)
+
+    Returns:
+        list: File paths
+    """
+    if os.path.isfile(path):
+        return [path]
+    manifest_path = os.path.join(path, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Split manifest not found: {manifest_path}")
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    version = manifest.get('format_version')
+    if version != SPLIT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported split artifact version: {version}")
+    return [os.path.join(path, shard['file']) for shard in manifest['shards']]
+
+
+def read_split(path):
+    """
+    Load a split written by data ingestion (CSV file or shard directory)
+
+    The whole split is loaded into memory: streaming ingestion bounds its
+    own memory use, but data transformation and cascade training still
+    need RAM for the full training split (use split_files to stream the
+    shards instead).
+
+    Returns:
+        pd.DataFrame: label and text columns, shards concatenated in order
+    """
+    frames = [pd.read_csv(file_path) for file_path in split_files(path)]
+    if not frames:
+        return pd.DataFrame(columns=SPLIT_COLUMNS)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
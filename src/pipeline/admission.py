@@ -0,0 +1,167 @@
+import os
+import time
+import threading
+
+from src.pipeline.metrics import metrics_registry, format_labels
+
+OVERLOAD_ACTIONS = ('reject', 'fallback')
+
+
+class Overloaded(Exception):
+    """Raised when a request cannot get an inference slot in time"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Server overloaded ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded inference concurrency with a bounded wait queue
+
+    Connection Flow:
+    1. Receives: every /predict and /predict/batch request right before
+       inference (app.py), after input validation; with micro-batching,
+       each flushed micro-batch instead of each /predict request
+       (MicroBatcher)
+    2. Admits: up to max_concurrency requests at a time; the next
+       max_queue_size wait (oldest first) for at most queue_timeout
+    3. Rejects: immediately when the queue is full, or when the wait
+       times out, by raising Overloaded; app.py answers 429 with
+       Retry-After, or the fallback heuristic when overload_action is
+       'fallback'
+    4. Exports: in-flight and queue-depth gauges, the queue wait histogram
+       and rejection counters on /metrics
+
+    Without a limit, overload makes every request slower until they all
+    time out; with one, the admitted requests keep their normal latency
+    and the excess fails fast.
+
+    Args:
+        max_concurrency (int): Inferences running at once in this process
+        max_queue_size (int): Requests allowed to wait for a slot
+        queue_timeout (float): Seconds a request may wait for a slot
+        overload_action (str): 'reject' (429) or 'fallback' (heuristic answer)
+        retry_after (int): Seconds sent in the Retry-After header
+    """
+
+    def __init__(self, max_concurrency, max_queue_size=16, queue_timeout=1.0,
+                 overload_action='reject', retry_after=1):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size cannot be negative")
+        if overload_action not in OVERLOAD_ACTIONS:
+            raise ValueError(f"Unknown overload action '{overload_action}'. Choose from: {', '.join(OVERLOAD_ACTIONS)}")
+        self.max_concurrency = int(max_concurrency)
+        self.max_queue_size = int(max_queue_size)
+        self.queue_timeout = float(queue_timeout)
+        self.overload_action = overload_action
+        self.retry_after = int(retry_after)
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = {'queue_full': 0, 'timeout': 0}
+        self._condition = threading.Condition()
+        self._rejection_keys = {
+            reason: format_labels(reason=reason, action=overload_action) for reason in self.rejected
+        }
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build the controller configured by INFERENCE_MAX_CONCURRENCY and friends
+
+        Returns:
+            AdmissionController: or None when INFERENCE_MAX_CONCURRENCY=0
+        """
+        max_concurrency = int(os.environ.get('INFERENCE_MAX_CONCURRENCY', str(os.cpu_count() or 1)))
+        if max_concurrency <= 0:
+            return None
+        return cls(
+            max_concurrency,
+            max_queue_size=int(os.environ.get('INFERENCE_QUEUE_SIZE', '16')),
+            queue_timeout=float(os.environ.get('INFERENCE_QUEUE_TIMEOUT_MS', '1000')) / 1000.0,
+            overload_action=os.environ.get('OVERLOAD_ACTION', 'reject').lower(),
+            retry_after=int(os.environ.get('OVERLOAD_RETRY_AFTER', '1'))
+        )
+
+    def _publish(self):
+        # Called with the condition held
+        metrics_registry.set_gauge('spamshield_inference_in_flight', self.in_flight)
+        metrics_registry.set_gauge('spamshield_inference_queue_depth', self.waiting)
+
+    def _reject(self, reason):
+        # Called with the condition held
+        self.rejected[reason] += 1
+        metrics_registry.inc('spamshield_admission_rejections_total', self._rejection_keys[reason])
+        raise Overloaded(reason, self.retry_after)
+
+    def acquire(self):
+        """
+        Take an inference slot, waiting in the queue if needed
+
+        Raises:
+            Overloaded: The queue is full or the wait timed out
+        """
+        started = time.perf_counter()
+        with self._condition:
+            if self.in_flight >= self.max_concurrency or self.waiting > 0:
+                if self.waiting >= self.max_queue_size:
+                    self._reject('queue_full')
+                self.waiting += 1
+                self._publish()
+                try:
+                    admitted = self._condition.wait_for(
+                        lambda: self.in_flight < self.max_concurrency, timeout=self.queue_timeout
+                    )
+                finally:
+                    self.waiting -= 1
+                if not admitted:
+                    self._publish()
+                    self._reject('timeout')
+            self.in_flight += 1
+            self.admitted += 1
+            self._publish()
+        metrics_registry.observe('spamshield_admission_queue_wait_seconds', time.perf_counter() - started)
+
+    def reject(self, reason):
+        """
+        Turn a request away without queueing it for a slot (the micro-batcher's
+        pending limit), counted like the controller's own rejections
+
+        Raises:
+            Overloaded: Always
+        """
+        with self._condition:
+            self._reject(reason)
+
+    def release(self):
+        """Give the slot back and wake the oldest waiting request"""
+        with self._condition:
+            self.in_flight -= 1
+            self._publish()
+            self._condition.notify()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+        return False
+
+    def stats(self):
+        """Current load and rejection counters for /health"""
+        with self._condition:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'max_queue_size': self.max_queue_size,
+                'queue_timeout_ms': self.queue_timeout * 1000.0,
+                'overload_action': self.overload_action,
+                'in_flight': self.in_flight,
+                'queue_depth': self.waiting,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected)
+            }
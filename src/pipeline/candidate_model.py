@@ -0,0 +1,312 @@
+import os
+import zlib
+import queue
+import threading
+import time
+import logging
+import numpy as np
+
+from src.pipeline.inference_engine import create_engine
+from src.pipeline.metrics import Histogram
+from src.pipeline.vocab_tokenizer import load_vocab
+
+MODEL_LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+CANDIDATE_MODES = ('shadow', 'ab')
+
+_STOP = object()
+
+
+def traffic_slot(cleaned_text):
+    """Stable position of a message in [0, 1) used to split traffic"""
+    return (zlib.crc32(cleaned_text.encode('utf-8')) % 10000) / 10000.0
+
+
+class CandidateModel:
+    """
+    Second (candidate) model evaluated on live traffic next to the primary
+
+    Connection Flow:
+    1. Loads: a candidate model (e.g. a retrained best_model.h5 or
+       model_int8.npz) through any inference engine, with the primary's
+       vocabulary unless its own vocab.json is given
+    2. Routes: a share of the messages that reach the LSTM, picked by a
+       hash of the cleaned text (so a message always takes the same path
+       and cached answers stay consistent)
+       - shadow: the primary answers; the candidate scores a copy in a
+         background thread, so responses never wait for it
+       - ab: the candidate answers its share; the primary scores a copy
+         in the background
+    3. Records: per-model latency of each model call, and the agreement
+       rate (same label) and mean |Δp| between the two models
+    4. Used by: predict_pipeline.py (predict.candidate), reported on /health
+
+    A candidate that fails to load is disabled and the primary serves
+    everything. Warmup loads it before the first request; otherwise the
+    first request starts load_in_background() and the primary serves
+    everything until the candidate is ready.
+
+    Args:
+        engine_name (str): Inference engine for the candidate
+        model_path (str): Candidate model artifact
+        mode (str): 'shadow' or 'ab'
+        traffic_share (float): Share of messages mirrored (shadow) or
+            answered by the candidate (ab)
+        vocab_path (str): Candidate vocab.json; None shares the primary's
+        max_queue_size (int): Background comparisons waiting at most;
+            beyond that they are dropped instead of delaying anything
+    """
+
+    def __init__(self, engine_name, model_path, mode='shadow', traffic_share=1.0,
+                 vocab_path=None, max_queue_size=1000):
+        if mode not in CANDIDATE_MODES:
+            raise ValueError(f"Unknown candidate mode '{mode}'. Choose from: {', '.join(CANDIDATE_MODES)}")
+        if not 0.0 <= traffic_share <= 1.0:
+            raise ValueError("traffic_share must be between 0 and 1")
+        self.engine_name = engine_name
+        self.model_path = model_path
+        self.mode = mode
+        self.traffic_share = float(traffic_share)
+        self.vocab_path = vocab_path
+        self.max_queue_size = int(max_queue_size)
+
+        self.engine = None
+        self.tokenizer = None
+        self.max_length = None
+        self.error = None
+        self._load_lock = threading.Lock()
+
+        self.latency_ms = {
+            'primary': Histogram(MODEL_LATENCY_BUCKETS_MS),
+            'candidate': Histogram(MODEL_LATENCY_BUCKETS_MS)
+        }
+        self.messages = {'primary': 0, 'candidate': 0}
+        self.compared = 0
+        self.agreed = 0
+        self.abs_diff_sum = 0.0
+        self.dropped = 0
+        self.failures = 0
+        self._stats_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._loader = None
+        self._loader_pid = None
+
+    @classmethod
+    def from_env(cls, default_model_path, default_engine):
+        """
+        Build the candidate configured by CANDIDATE_* variables
+
+        Returns:
+            CandidateModel: or None when neither CANDIDATE_ENGINE nor
+                CANDIDATE_MODEL_PATH is set
+        """
+        engine_name = os.environ.get('CANDIDATE_ENGINE')
+        model_path = os.environ.get('CANDIDATE_MODEL_PATH')
+        if not engine_name and not model_path:
+            return None
+        return cls(
+            engine_name or default_engine,
+            model_path or default_model_path,
+            mode=os.environ.get('CANDIDATE_MODE', 'shadow').lower(),
+            traffic_share=float(os.environ.get('CANDIDATE_TRAFFIC_SHARE', '1.0')),
+            vocab_path=os.environ.get('CANDIDATE_VOCAB_PATH') or None,
+            max_queue_size=int(os.environ.get('CANDIDATE_QUEUE_SIZE', '1000'))
+        )
+
+    def load(self, max_length):
+        """
+        Load the candidate engine (once)
+
+        Args:
+            max_length (int): Primary padded length, used with the shared vocabulary
+
+        Returns:
+            bool: True when the candidate is usable
+        """
+        if self.engine is not None or self.error is not None:
+            return self.engine is not None
+        with self._load_lock:
+            if self.engine is not None or self.error is not None:
+                return self.engine is not None
+            try:
+                tokenizer = None
+                if self.vocab_path is not None:
+                    tokenizer, max_length = load_vocab(self.vocab_path)
+                engine = create_engine(self.engine_name, self.model_path, max_length)
+                engine.predict_proba(np.zeros((1, max_length), dtype=np.int32))
+                self.tokenizer = tokenizer
+                self.max_length = max_length
+                self.engine = engine
+                # The int8 engine reads model_int8.npz next to model_path
+                self.model_path = engine.model_path
+                logging.info(f"🧪 Candidate model loaded ({self.mode}, '{self.engine_name}' engine, "
+                             f"{self.traffic_share * 100:.0f}% of traffic): {engine.model_path}")
+            except Exception as e:
+                self.error = str(e)
+                logging.error(f"❌ Candidate model disabled, serving the primary only: {e}")
+        return self.engine is not None
+
+    def ready(self):
+        """True when the candidate is loaded (never blocks)"""
+        return self.engine is not None
+
+    def load_in_background(self, max_length):
+        """
+        Start load() on a background thread (once per process)
+
+        Args:
+            max_length (int): Primary padded length, used with the shared vocabulary
+        """
+        if self.engine is not None or self.error is not None:
+            return
+        if self._loader is not None and self._loader_pid == os.getpid():
+            return
+        with self._lock:
+            # A loader thread started before a gunicorn fork does not exist in the child
+            if self._loader is None or self._loader_pid != os.getpid():
+                self._loader_pid = os.getpid()
+                self._loader = threading.Thread(
+                    target=self.load, args=(max_length,), name='candidate-loader', daemon=True
+                )
+                self._loader.start()
+
+    def routes_to_candidate(self, cleaned_text):
+        """True when the candidate should answer this message (ab mode)"""
+        return self.mode == 'ab' and traffic_slot(cleaned_text) < self.traffic_share
+
+    def is_sampled(self, cleaned_text):
+        """True when this message is part of the evaluated share"""
+        return traffic_slot(cleaned_text) < self.traffic_share
+
+    def record_latency(self, model, seconds, count):
+        """Record one model call of `count` messages"""
+        self.latency_ms[model].observe(seconds * 1000.0)
+        with self._stats_lock:
+            self.messages[model] += count
+
+    def predict_proba(self, cleaned_texts, tokenizer, max_length):
+        """
+        Score cleaned texts with the candidate
+
+        Args:
+            cleaned_texts (list): Cleaned messages
+            tokenizer (VocabTokenizer): Primary tokenizer (used unless the
+                candidate has its own vocabulary)
+            max_length (int): Primary padded length
+
+        Returns:
+            np.ndarray: float32 spam probabilities
+        """
+        if self.tokenizer is not None:
+            tokenizer, max_length = self.tokenizer, self.max_length
+        padded, _ = tokenizer.texts_to_array(cleaned_texts, max_length)
+        start = time.perf_counter()
+        proba = self.engine.predict_proba(padded)
+        self.record_latency('candidate', time.perf_counter() - start, len(cleaned_texts))
+        return proba
+
+    def _ensure_worker(self):
+        """Start the comparison thread lazily, and again after a gunicorn fork"""
+        if self._thread is not None and self._pid == os.getpid():
+            return self._queue
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name='candidate-model',
+                    daemon=True
+                )
+                self._thread.start()
+        return self._queue
+
+    def compare_later(self, served_by, cleaned_texts, served_proba, state):
+        """
+        Queue a background run of the model that did not answer
+
+        Never blocks: when the queue is full the comparison is dropped.
+
+        Args:
+            served_by (str): 'primary' or 'candidate'
+            cleaned_texts (list): Cleaned messages that were scored
+            served_proba (np.ndarray): Probabilities returned to the caller
+            state (ModelState): Primary model version that served the request
+        """
+        if not cleaned_texts:
+            return
+        try:
+            self._ensure_worker().put_nowait((served_by, list(cleaned_texts), np.asarray(served_proba), state))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += len(cleaned_texts)
+
+    def _run(self, work_queue):
+        while True:
+            item = work_queue.get()
+            if item is _STOP:
+                return
+            served_by, cleaned_texts, served_proba, state = item
+            try:
+                if served_by == 'primary':
+                    other_proba = self.predict_proba(cleaned_texts, state.tokenizer, state.max_length)
+                else:
+                    padded, _ = state.tokenizer.texts_to_array(cleaned_texts, state.max_length)
+                    start = time.perf_counter()
+                    other_proba = state.engine.predict_proba(padded)
+                    self.record_latency('primary', time.perf_counter() - start, len(cleaned_texts))
+                self.record_agreement(served_proba, other_proba)
+            except Exception as e:
+                self.record_failure()
+                logging.error(f"❌ Candidate comparison failed: {e}")
+
+    def record_failure(self):
+        """Count a failed candidate call or comparison"""
+        with self._stats_lock:
+            self.failures += 1
+
+    def record_agreement(self, proba_a, proba_b):
+        """Count label agreement and |Δp| between the two models"""
+        proba_a = np.asarray(proba_a, dtype=np.float64)
+        proba_b = np.asarray(proba_b, dtype=np.float64)
+        agreed = int(((proba_a > 0.5) == (proba_b > 0.5)).sum())
+        with self._stats_lock:
+            self.compared += len(proba_a)
+            self.agreed += agreed
+            self.abs_diff_sum += float(np.abs(proba_a - proba_b).sum())
+
+    def close(self):
+        """Stop the comparison thread after the queued comparisons are done"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(_STOP)
+                self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Agreement and per-model latency (ms) for /health"""
+        with self._stats_lock:
+            compared = self.compared
+            stats = {
+                'mode': self.mode,
+                'engine': self.engine_name,
+                'model_path': self.model_path,
+                'traffic_share': self.traffic_share,
+                'loaded': self.engine is not None,
+                'loading': self.engine is None and self._loader is not None and self._loader.is_alive(),
+                'compared': compared,
+                'agreement_rate': self.agreed / compared if compared else None,
+                'mean_abs_diff': self.abs_diff_sum / compared if compared else None,
+                'dropped': self.dropped,
+                'failures': self.failures,
+                'pending': self._queue.qsize() if self._queue is not None else 0,
+                'messages': dict(self.messages)
+            }
+        if self.error is not None:
+            stats['error'] = self.error
+        stats['latency_ms'] = {model: histogram.snapshot() for model, histogram in self.latency_ms.items()}
+        return stats
@@ -0,0 +1,147 @@
+import os
+import logging
+import numpy as np
+
+from src.pipeline.numpy_engine import NumpyLSTMEngine
+from src.pipeline.quantization import Int8LSTMEngine
+
+
+def bucket_sizes(max_bucket):
+    """Powers of two from 1 up to (and including) max_bucket"""
+    sizes = [1]
+    while sizes[-1] * 2 <= max_bucket:
+        sizes.append(sizes[-1] * 2)
+    return sizes
+
+
+class KerasPredictEngine:
+    """
+    Reference engine: the high-level model.predict API
+
+    Kept for comparison and as a safe fallback. Every call pays for the
+    Keras data adapter and predict loop setup.
+    """
+
+    name = 'keras'
+
+    def __init__(self, model_path, max_length):
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        tf.get_logger().setLevel('ERROR')
+
+        self.model_path = model_path
+        self.max_length = max_length
+        # Inference never uses the optimizer, so skip compile()
+        self.model = load_model(model_path, compile=False)
+
+    def predict_proba(self, padded_sequences):
+        """
+        Score padded sequences
+
+        Args:
+            padded_sequences (np.ndarray): int array of shape (n, max_length)
+
+        Returns:
+            np.ndarray: float32 spam probabilities of shape (n,)
+        """
+        proba = self.model.predict(
+            padded_sequences,
+            batch_size=len(padded_sequences),
+            verbose=0
+        )
+        return np.asarray(proba, dtype=np.float32).reshape(-1)
+
+
+class CompiledKerasEngine(KerasPredictEngine):
+    """
+    Low-overhead engine built on shape-stable tf.function graphs
+
+    At load time one concrete function is traced and warmed up for each
+    batch bucket (powers of two up to max_bucket). Requests are padded up
+    to the next bucket, so no call ever retraces; batches larger than the
+    biggest bucket are split into max_bucket chunks.
+    """
+
+    name = 'compiled'
+
+    def __init__(self, model_path, max_length, max_bucket=64):
+        super().__init__(model_path, max_length)
+        import tensorflow as tf
+
+        self.buckets = bucket_sizes(max_bucket)
+        self.max_bucket = self.buckets[-1]
+
+        model = self.model
+        forward = tf.function(lambda x: model(x, training=False))
+        self._functions = {}
+        for size in self.buckets:
+            self._functions[size] = forward.get_concrete_function(
+                tf.TensorSpec([size, max_length], tf.int32)
+            )
+            # Warm up so the first request does not pay graph initialisation
+            self._functions[size](tf.zeros([size, max_length], tf.int32))
+        logging.info(f"⚡ Compiled inference buckets: {self.buckets}")
+
+    def _bucket_for(self, n):
+        for size in self.buckets:
+            if size >= n:
+                return size
+        return self.max_bucket
+
+    def predict_proba(self, padded_sequences):
+        padded_sequences = np.asarray(padded_sequences, dtype=np.int32)
+        outputs = []
+        for start in range(0, len(padded_sequences), self.max_bucket):
+            chunk = padded_sequences[start:start + self.max_bucket]
+            n = len(chunk)
+            size = self._bucket_for(n)
+            if size != n:
+                chunk = np.concatenate(
+                    [chunk, np.zeros((size - n, chunk.shape[1]), dtype=np.int32)]
+                )
+            proba = self._functions[size](chunk).numpy()
+            outputs.append(proba[:n, 0])
+        return np.concatenate(outputs).astype(np.float32)
+
+
+ENGINES = {
+    KerasPredictEngine.name: KerasPredictEngine,
+    CompiledKerasEngine.name: CompiledKerasEngine,
+    NumpyLSTMEngine.name: NumpyLSTMEngine,
+    Int8LSTMEngine.name: Int8LSTMEngine,
+}
+
+DEFAULT_ENGINE = CompiledKerasEngine.name
+
+
+def create_engine(name, model_path, max_length):
+    """
+    Build an inference engine by name
+
+    Args:
+        name (str): One of ENGINES ('compiled', 'keras', 'numpy', 'int8')
+        model_path (str): Path to the saved Keras model. The int8 engine
+            reads model_int8.npz from the same directory instead, unless
+            QUANTIZED_MODEL_PATH is set
+        max_length (int): Padded sequence length
+
+    Returns:
+        Engine exposing predict_proba(padded_sequences)
+    """
+    name = (name or DEFAULT_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{name}'. Choose from: {', '.join(ENGINES)}")
+    if name == Int8LSTMEngine.name:
+        model_path = os.environ.get(
+            'QUANTIZED_MODEL_PATH',
+            os.path.join(os.path.dirname(model_path), 'model_int8.npz')
+        )
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model artifact missing: {model_path}")
+    if name == CompiledKerasEngine.name:
+        max_bucket = int(os.environ.get('INFERENCE_MAX_BUCKET', '64'))
+        return CompiledKerasEngine(model_path, max_length, max_bucket=max_bucket)
+    if issubclass(ENGINES[name], NumpyLSTMEngine):
+        length_aware = os.environ.get('LENGTH_AWARE_INFERENCE', '1').lower() not in ('0', 'false', 'no', 'off')
+        return ENGINES[name](model_path, max_length, length_aware=length_aware)
+    return ENGINES[name](model_path, max_length)
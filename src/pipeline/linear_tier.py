@@ -0,0 +1,117 @@
+import zlib
+import numpy as np
+
+LINEAR_TIER_FORMAT_VERSION = 1
+
+
+class HashedNgramClassifier:
+    """
+    First cascade tier: logistic regression on hashed word n-grams
+
+    Features are the distinct word n-grams of the cleaned text, hashed
+    with CRC32 (stable across processes, unlike hash()) into n_features
+    buckets, binary and L2-normalized. Scoring is one weight gather and
+    a sum per message, so no scikit-learn is needed at serving time.
+
+    Messages scoring at or below low_threshold are answered as
+    legitimate and at or above high_threshold as spam; everything in
+    between is escalated to the LSTM.
+
+    Args:
+        weights (np.ndarray): float32 weights, one per hash bucket
+        bias (float): Intercept
+        ngram_range (tuple): (min_n, max_n) word n-gram sizes
+        low_threshold (float): Spam probability at or below which the tier answers
+        high_threshold (float): Spam probability at or above which the tier answers
+    """
+
+    def __init__(self, weights, bias, ngram_range=(1, 2), low_threshold=0.0, high_threshold=1.0):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.n_features = len(self.weights)
+        self.bias = float(bias)
+        self.ngram_range = tuple(ngram_range)
+        self.low_threshold = float(low_threshold)
+        self.high_threshold = float(high_threshold)
+
+    def feature_indices(self, cleaned_text):
+        """Distinct hash buckets of a cleaned text's word n-grams"""
+        words = cleaned_text.split()
+        min_n, max_n = self.ngram_range
+        n_features = self.n_features
+        indices = set()
+        for n in range(min_n, max_n + 1):
+            for start in range(len(words) - n + 1):
+                ngram = ' '.join(words[start:start + n])
+                indices.add(zlib.crc32(ngram.encode('utf-8')) % n_features)
+        return sorted(indices)
+
+    def transform(self, cleaned_texts):
+        """
+        CSR components of the feature matrix
+
+        Returns:
+            tuple: (data, indices, indptr) for a (len(texts), n_features) matrix
+        """
+        indptr = [0]
+        indices = []
+        data = []
+        for text in cleaned_texts:
+            row = self.feature_indices(text)
+            if row:
+                indices.extend(row)
+                data.extend([1.0 / len(row) ** 0.5] * len(row))
+            indptr.append(len(indices))
+        return (np.asarray(data, dtype=np.float32),
+                np.asarray(indices, dtype=np.int64),
+                np.asarray(indptr, dtype=np.int64))
+
+    def predict_proba(self, cleaned_texts):
+        """
+        Spam probabilities of cleaned texts
+
+        Returns:
+            np.ndarray: float32 (n,)
+        """
+        data, indices, indptr = self.transform(cleaned_texts)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        scores = np.bincount(rows, weights=self.weights[indices] * data, minlength=len(indptr) - 1)
+        return (1.0 / (1.0 + np.exp(-(scores + self.bias)))).astype(np.float32)
+
+    def decide(self, probabilities):
+        """
+        Which messages the tier answers
+
+        Returns:
+            np.ndarray: bool mask, True where the probability is outside
+                the uncertain band
+        """
+        probabilities = np.asarray(probabilities)
+        return (probabilities <= self.low_threshold) | (probabilities >= self.high_threshold)
+
+
+def save_linear_tier(path, classifier):
+    """Write the first-tier artifact (.npz, no pickle)"""
+    np.savez_compressed(
+        path,
+        format_version=np.array(LINEAR_TIER_FORMAT_VERSION),
+        weights=classifier.weights,
+        bias=np.array(classifier.bias),
+        ngram_range=np.array(classifier.ngram_range),
+        thresholds=np.array([classifier.low_threshold, classifier.high_threshold])
+    )
+
+
+def load_linear_tier(path):
+    """Read a first-tier artifact written by save_linear_tier"""
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['format_version'])
+        if version != LINEAR_TIER_FORMAT_VERSION:
+            raise ValueError(f"Unsupported linear tier artifact version: {version}")
+        low_threshold, high_threshold = data['thresholds'].tolist()
+        return HashedNgramClassifier(
+            data['weights'],
+            float(data['bias']),
+            ngram_range=tuple(data['ngram_range'].tolist()),
+            low_threshold=low_threshold,
+            high_threshold=high_threshold
+        )
@@ -0,0 +1,520 @@
+"""
+Memory footprint report for SpamShield AI serving processes
+
+Breaks resident memory (RSS) down three ways:
+- mapped: RSS of every memory mapping from /proc/self/smaps, by owner
+  (shared libraries and packages such as TensorFlow, NumPy, pandas, Flask,
+  or anonymous memory: the Python heap, array buffers, TensorFlow tensors)
+- python_heap: memory allocated through Python (tracemalloc), by the
+  file that allocated it; only when tracing was started early
+  (MEMORY_DEBUG=trace, or this CLI). Code and module dicts created while
+  importing show up as 'module imports', whatever the package
+- objects: deep size of the objects the predictor holds (model weights,
+  optimizer state, tokenizer, cascade tier, prediction cache, candidate)
+
+Serving exposes it on /debug/memory when MEMORY_DEBUG is set.
+
+Usage:
+    python -m src.pipeline.memory_report                 # load the predictor, then report
+    python -m src.pipeline.memory_report --engine compiled --json
+    python -m src.pipeline.memory_report diet            # measure each memory-saving option
+"""
+
+import os
+import gc
+import sys
+import json
+import types
+import argparse
+import subprocess
+import tracemalloc
+
+# This module only imports the standard library at load time, so tracing
+# can start before NumPy, TensorFlow or pandas are imported
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Owner of a file path, first match wins (packages before the interpreter,
+# whose lib/python3.x directory also contains site-packages)
+COMPONENT_PATTERNS = (
+    ('tensorflow', ('tensorflow', 'keras', 'ml_dtypes', 'tensorboard', '/absl/', '/google/protobuf/', 'libtf')),
+    ('h5py', ('h5py', 'libhdf5')),
+    ('numpy', ('/numpy', 'openblas', 'libgfortran')),
+    ('pandas', ('/pandas', '/pytz/', '/dateutil/')),
+    ('scikit-learn', ('/sklearn', '/scipy', '/joblib/', 'threadpoolctl')),
+    ('flask', ('/flask/', '/werkzeug/', '/jinja2/', '/markupsafe/', '/itsdangerous/', '/click/', '/blinker/')),
+    ('gunicorn', ('/gunicorn/',)),
+)
+
+MB = 1024.0 * 1024.0
+
+# Shared by everything; never counted as held by an object
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def memory_debug_mode():
+    """'' (off), 'on' (/debug/memory) or 'trace' (also tracemalloc) from MEMORY_DEBUG"""
+    value = os.environ.get('MEMORY_DEBUG', '').lower()
+    if value in ('1', 'true', 'yes', 'on'):
+        return 'on'
+    return 'trace' if value == 'trace' else ''
+
+
+def start_tracing_from_env():
+    """Start tracemalloc when MEMORY_DEBUG=trace (call before the heavy imports)"""
+    if memory_debug_mode() == 'trace' and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def component_of(path):
+    """Component owning a file path (library, package or source file)"""
+    if not path:
+        return 'anonymous'
+    if path.startswith('['):
+        return 'anonymous' if path in ('[heap]', '[anon]') else 'other'
+    if path.startswith('<frozen importlib'):
+        # Code objects and module dicts created while importing (any package)
+        return 'module imports'
+    lowered = path.replace('\\', '/').lower()
+    if lowered.startswith(PROJECT_ROOT.replace('\\', '/').lower() + '/') and '/site-packages/' not in lowered:
+        return 'spamshield'
+    for component, patterns in COMPONENT_PATTERNS:
+        if any(pattern in lowered for pattern in patterns):
+            return component
+    if '/site-packages/' in lowered or '/dist-packages/' in lowered:
+        return 'other packages'
+    if 'python' in lowered or path.startswith('<'):
+        return 'python'
+    return 'other'
+
+
+def process_memory():
+    """
+    Resident and peak resident memory of this process
+
+    Returns:
+        dict: rss_mb and peak_rss_mb (None when unknown)
+    """
+    memory = {'rss_mb': None, 'peak_rss_mb': None}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    memory['rss_mb'] = int(line.split()[1]) / 1024.0
+                elif line.startswith('VmHWM:'):
+                    memory['peak_rss_mb'] = int(line.split()[1]) / 1024.0
+    except OSError:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # kilobytes on Linux, bytes on macOS
+            memory['peak_rss_mb'] = peak / MB if sys.platform == 'darwin' else peak / 1024.0
+        except (ImportError, OSError):
+            pass
+    return memory
+
+
+def mapped_memory():
+    """
+    RSS of every mapping in /proc/self/smaps, summed by component
+
+    Shared libraries count in full even when other processes share them
+    (PSS would split them; it is reported alongside).
+
+    Returns:
+        dict: component -> {'rss_mb', 'pss_mb'}, largest first; empty
+            where /proc is unavailable
+    """
+    totals = {}
+    try:
+        with open('/proc/self/smaps') as f:
+            component = None
+            for line in f:
+                first = line.split(None, 1)[0]
+                if not first.endswith(':'):
+                    # Mapping header: address perms offset dev inode [path]
+                    fields = line.split(None, 5)
+                    path = fields[5].strip() if len(fields) > 5 else ''
+                    component = component_of(path)
+                    totals.setdefault(component, [0, 0])
+                elif first == 'Rss:':
+                    totals[component][0] += int(line.split()[1])
+                elif first == 'Pss:':
+                    totals[component][1] += int(line.split()[1])
+    except OSError:
+        return {}
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    return {
+        component: {'rss_mb': round(rss / 1024.0, 2), 'pss_mb': round(pss / 1024.0, 2)}
+        for component, (rss, pss) in ranked if rss
+    }
+
+
+def python_heap(top=10):
+    """
+    Python-allocated memory by component and by file, from tracemalloc
+
+    Returns:
+        dict: tracing flag and, while tracing, traced/peak MB, MB by
+            component and the top allocating files
+    """
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+    statistics = snapshot.statistics('filename')
+    by_component = {}
+    for stat in statistics:
+        component = component_of(stat.traceback[0].filename)
+        by_component[component] = by_component.get(component, 0) + stat.size
+    return {
+        'tracing': True,
+        'traced_mb': round(current / MB, 2),
+        'peak_traced_mb': round(peak / MB, 2),
+        'by_component_mb': {
+            component: round(size / MB, 2)
+            for component, size in sorted(by_component.items(), key=lambda item: item[1], reverse=True)
+        },
+        'top_files': [
+            {'file': short_path(stat.traceback[0].filename), 'mb': round(stat.size / MB, 3), 'blocks': stat.count}
+            for stat in statistics[:top]
+        ]
+    }
+
+
+def short_path(path):
+    """Path relative to site-packages or the project root"""
+    normalized = path.replace('\\', '/')
+    for marker in ('/site-packages/', '/dist-packages/'):
+        if marker in normalized:
+            return normalized.rsplit(marker, 1)[1]
+    if normalized.startswith(PROJECT_ROOT.replace('\\', '/') + '/'):
+        return os.path.relpath(path, PROJECT_ROOT)
+    return path
+
+
+def _is_framework_object(obj):
+    module = type(obj).__module__ or ''
+    return module.startswith(('tensorflow', 'keras', 'tf_keras', 'h5py'))
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Bytes held by obj and everything it references
+
+    NumPy arrays count their buffer once (views count nothing extra);
+    modules, classes, functions and TensorFlow/Keras objects are not
+    walked (use keras_weight_bytes for models).
+    """
+    np = sys.modules.get('numpy')
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, SKIPPED_TYPES):
+            continue
+        # ndarray.__sizeof__ includes the buffer only when the array owns
+        # it; a view's buffer is counted (once) through its base
+        total += sys.getsizeof(item)
+        if np is not None and isinstance(item, np.ndarray):
+            if item.base is not None:
+                stack.append(item.base)
+            if item.dtype == object:
+                stack.extend(item.ravel().tolist())
+            continue
+        if _is_framework_object(item):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        if hasattr(item, '__dict__') and not isinstance(item, type):
+            stack.append(vars(item))
+        for slot in getattr(type(item), '__slots__', ()):
+            if hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
+
+
+def keras_weight_bytes(model):
+    """
+    Bytes of a Keras model's weights and of its optimizer's state
+
+    Returns:
+        tuple: (weight bytes, optimizer bytes)
+    """
+    def variable_bytes(variables):
+        total = 0
+        for variable in variables:
+            count = 1
+            for dim in variable.shape:
+                count *= int(dim)
+            total += count * variable.dtype.size if hasattr(variable.dtype, 'size') else count * 4
+        return total
+
+    weights = variable_bytes(model.weights)
+    optimizer = getattr(model, 'optimizer', None)
+    optimizer_bytes = variable_bytes(optimizer.variables) if optimizer is not None and hasattr(optimizer, 'variables') else 0
+    return weights, optimizer_bytes
+
+
+def engine_bytes(engine):
+    """(weight bytes, optimizer bytes) held by an inference engine"""
+    model = getattr(engine, 'model', None)
+    if model is not None and _is_framework_object(model):
+        weights, optimizer = keras_weight_bytes(model)
+        rest = deep_sizeof({key: value for key, value in vars(engine).items() if key != 'model'})
+        return weights + rest, optimizer
+    return deep_sizeof(engine), 0
+
+
+def predictor_objects(predictor):
+    """
+    Deep sizes (MB) of the objects a predictor holds
+
+    Args:
+        predictor (predict): The serving predictor
+
+    Returns:
+        dict: component -> MB (model weights, optimizer, tokenizer, ...)
+    """
+    objects = {}
+    state = predictor.state
+    if state is not None:
+        seen = set()
+        weights, optimizer = engine_bytes(state.engine)
+        objects['model_weights'] = weights
+        objects['optimizer'] = optimizer
+        objects['tokenizer'] = deep_sizeof(state.tokenizer, seen)
+        if state.linear_tier is not None:
+            objects['cascade_first_tier'] = deep_sizeof(state.linear_tier, seen)
+    if predictor.cache is not None:
+        objects['prediction_cache'] = deep_sizeof(predictor.cache)
+    candidate = predictor.candidate
+    if candidate is not None and candidate.engine is not None:
+        weights, optimizer = engine_bytes(candidate.engine)
+        objects['candidate_model'] = weights + optimizer + (
+            deep_sizeof(candidate.tokenizer) if candidate.tokenizer is not None else 0
+        )
+    return {name: round(size / MB, 3) for name, size in objects.items()}
+
+
+def memory_report(predictor=None, top=10):
+    """
+    Full memory breakdown of this process
+
+    Args:
+        predictor (predict): Serving predictor whose objects are sized
+        top (int): Allocating files listed from tracemalloc
+
+    Returns:
+        dict: rss, mapped, python_heap, objects, modules and gc sections
+    """
+    from src.pipeline.startup import HEAVY_MODULES
+    report = {'pid': os.getpid()}
+    report.update(process_memory())
+    report['mapped'] = mapped_memory()
+    report['python_heap'] = python_heap(top=top)
+    if predictor is not None:
+        report['objects_mb'] = predictor_objects(predictor)
+    report['heavy_modules_loaded'] = [name for name in HEAVY_MODULES if name in sys.modules]
+    report['gc'] = {
+        'tracked_objects': len(gc.get_objects()),
+        'frozen_objects': gc.get_freeze_count() if hasattr(gc, 'get_freeze_count') else None
+    }
+    return report
+
+
+def print_report(report):
+    print("=" * 70)
+    print(f"🧠 MEMORY REPORT (pid {report['pid']})")
+    print("=" * 70)
+    rss = report.get('rss_mb')
+    peak = report.get('peak_rss_mb')
+    print(f"RSS: {rss:.1f} MB   peak: {peak:.1f} MB" if rss is not None else f"Peak RSS: {peak} MB")
+    if report['mapped']:
+        print("\nResident memory by mapping owner (RSS / PSS MB):")
+        for component, sizes in report['mapped'].items():
+            print(f"   {component:<20} {sizes['rss_mb']:>9.1f} {sizes['pss_mb']:>9.1f}")
+    heap = report['python_heap']
+    if heap['tracing']:
+        print(f"\nPython allocations (tracemalloc): {heap['traced_mb']:.1f} MB, peak {heap['peak_traced_mb']:.1f} MB")
+        for component, size in heap['by_component_mb'].items():
+            print(f"   {component:<20} {size:>9.2f}")
+        print("   Top files:")
+        for entry in heap['top_files']:
+            print(f"      {entry['mb']:>8.3f} MB  {entry['file']}")
+    if 'objects_mb' in report:
+        print("\nPredictor objects (deep size, MB):")
+        for name, size in report['objects_mb'].items():
+            print(f"   {name:<20} {size:>9.3f}")
+    print(f"\nHeavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+    print("=" * 70)
+
+
+# Memory-saving options, each measured in a fresh process:
+# (option, heavier scenario, lighter scenario)
+DIET_OPTIONS = (
+    ('Free the optimizer (load_model compile=False)', 'keras-compile', 'keras-no-compile'),
+    ('Drop unused tokenizer state (vocab.json)', 'tokenizer-pickle', 'tokenizer-vocab'),
+    ('Keep pandas off the request path', 'pandas-dataframe', 'plain-text'),
+    ('Skip TensorFlow entirely (numpy engine)', 'keras-no-compile', 'numpy-engine'),
+)
+
+
+def run_scenario(name):
+    """
+    Load one serving component in this (fresh) process and measure it
+
+    Returns:
+        dict: rss_mb before/after and the deep size of what was loaded
+    """
+    import numpy as np
+    from src.pipeline.predict_pipeline import predict, customdata
+    predictor = predict()
+    message = "WINNER!! Claim your free prize now"
+    gc.collect()
+    before = process_memory()['rss_mb']
+    held = None
+    size_mb = None
+
+    if name in ('keras-compile', 'keras-no-compile'):
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        tf.get_logger().setLevel('ERROR')
+        model = load_model(predictor.model_path, compile=name == 'keras-compile')
+        optimizer = getattr(model, 'optimizer', None)
+        if optimizer is not None and len(optimizer.variables) < len(model.trainable_variables):
+            # tf.keras 2 restored the saved Adam slots (optimizer_weights)
+            # at load; Keras 3 creates them on first use, so create them now
+            optimizer.built = False
+            optimizer.build(model.trainable_variables)
+        model(np.zeros((1, 100), dtype=np.int32))
+        weights, optimizer = keras_weight_bytes(model)
+        size_mb = (weights + optimizer) / MB
+        held = model
+    elif name == 'numpy-engine':
+        from src.pipeline.inference_engine import create_engine
+        held = create_engine('numpy', predictor.model_path, 100)
+        held.predict_proba(np.zeros((1, 100), dtype=np.int32))
+        size_mb = deep_sizeof(held) / MB
+    elif name == 'tokenizer-pickle':
+        import joblib
+        held = joblib.load(predictor.preprocessing_path)['tokenizer']
+        size_mb = deep_sizeof(vars(held)) / MB
+    elif name == 'tokenizer-vocab':
+        from src.pipeline.vocab_tokenizer import load_vocab
+        held, _ = load_vocab(predictor.vocab_path)
+        size_mb = deep_sizeof(held) / MB
+    elif name == 'pandas-dataframe':
+        held = customdata(message).data_frame()
+    elif name == 'plain-text':
+        held = customdata(message).message_text
+    else:
+        raise ValueError(f"Unknown scenario '{name}'")
+
+    gc.collect()
+    after = process_memory()['rss_mb']
+    return {
+        'scenario': name,
+        'rss_before_mb': round(before, 1),
+        'rss_after_mb': round(after, 1),
+        'rss_delta_mb': round(after - before, 1),
+        'object_mb': round(size_mb, 3) if size_mb is not None else None,
+        'held': type(held).__name__
+    }
+
+
+def measure_diet():
+    """
+    Measure every DIET_OPTIONS pair, one fresh process per scenario
+
+    Returns:
+        list: one dict per option with both scenarios and the MB saved
+    """
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''),
+               TF_CPP_MIN_LOG_LEVEL='3')
+    env.pop('MEMORY_DEBUG', None)
+    results = {}
+    for _, heavier, lighter in DIET_OPTIONS:
+        for scenario in (heavier, lighter):
+            if scenario in results:
+                continue
+            output = subprocess.run(
+                [sys.executable, '-m', 'src.pipeline.memory_report', 'scenario', scenario],
+                cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+            ).stdout
+            results[scenario] = json.loads(output.strip().splitlines()[-1])
+    options = []
+    for option, heavier, lighter in DIET_OPTIONS:
+        heavy, light = results[heavier], results[lighter]
+        options.append({
+            'option': option,
+            'heavier': heavy,
+            'lighter': light,
+            'rss_saved_mb': round(heavy['rss_delta_mb'] - light['rss_delta_mb'], 1),
+            'object_saved_mb': (round(heavy['object_mb'] - light['object_mb'], 3)
+                                if heavy['object_mb'] is not None and light['object_mb'] is not None else None)
+        })
+    return options
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpamShield memory footprint report")
+    parser.add_argument('command', nargs='?', default='report', choices=('report', 'diet', 'scenario'))
+    parser.add_argument('scenario', nargs='?', help="Scenario name (internal, used by diet)")
+    parser.add_argument('--engine', help="INFERENCE_ENGINE for the report (default: the configured one)")
+    parser.add_argument('--no-trace', action='store_true', help="Skip tracemalloc (faster, no python_heap)")
+    parser.add_argument('--top', type=int, default=10, help="Allocating files listed")
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.command == 'scenario':
+        print(json.dumps(run_scenario(args.scenario)))
+        return
+
+    if args.command == 'diet':
+        options = measure_diet()
+        if args.json:
+            print(json.dumps(options, indent=2))
+            return
+        print("=" * 70)
+        print("🥗 MEMORY DIET: RSS added by each option, measured in fresh processes")
+        print("=" * 70)
+        for entry in options:
+            heavy, light = entry['heavier'], entry['lighter']
+            print(f"{entry['option']}")
+            print(f"   {heavy['scenario']:<18} +{heavy['rss_delta_mb']:>7.1f} MB RSS"
+                  + (f"  ({heavy['object_mb']:.2f} MB of objects)" if heavy['object_mb'] is not None else ""))
+            print(f"   {light['scenario']:<18} +{light['rss_delta_mb']:>7.1f} MB RSS"
+                  + (f"  ({light['object_mb']:.2f} MB of objects)" if light['object_mb'] is not None else ""))
+            print(f"   saved: {entry['rss_saved_mb']:.1f} MB RSS")
+        print("=" * 70)
+        return
+
+    if not args.no_trace:
+        tracemalloc.start()
+    if args.engine:
+        os.environ['INFERENCE_ENGINE'] = args.engine
+    import logging
+    logging.basicConfig(level=logging.WARNING)
+    from src.pipeline.predict_pipeline import predict
+    predictor = predict()
+    predictor.warmup()
+    predictor.get_predict("WINNER!! Claim your free prize now")
+    report = memory_report(predictor, top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
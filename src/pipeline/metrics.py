@@ -0,0 +1,387 @@
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram
+
+    Buckets are upper bounds (inclusive), reported cumulatively like
+    Prometheus histograms with a final '+Inf' bucket.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """Record one observation"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        """
+        Return the current state
+
+        Returns:
+            dict: count, sum and cumulative bucket counts keyed by upper bound
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+            count = self._count
+
+        buckets = {}
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = cumulative + counts[-1]
+
+        return {
+            'count': count,
+            'sum': total,
+            'buckets': buckets
+        }
+
+
+# Prometheus metric families: name -> (type, help)
+METRIC_FAMILIES = {
+    'spamshield_requests_total': ('counter', 'HTTP requests by endpoint and status code'),
+    'spamshield_request_duration_seconds': ('histogram', 'HTTP request handling time by endpoint'),
+    'spamshield_stage_duration_seconds': ('histogram', 'Time spent in each prediction stage'),
+    'spamshield_prediction_errors_total': ('counter', 'Predictions that raised an error'),
+    'spamshield_fallback_predictions_total': ('counter', 'Messages answered by the fallback heuristic'),
+    'spamshield_cache_hits_total': ('counter', 'Prediction cache hits'),
+    'spamshield_cache_misses_total': ('counter', 'Prediction cache misses'),
+    'spamshield_inference_in_flight': ('gauge', 'Requests currently running inference'),
+    'spamshield_inference_queue_depth': ('gauge', 'Requests waiting for an inference slot'),
+    'spamshield_admission_queue_wait_seconds': ('histogram', 'Time admitted requests waited for an inference slot'),
+    'spamshield_admission_rejections_total': ('counter', 'Requests turned away by admission control'),
+    'spamshield_profiled_requests_total': ('counter', 'Requests profiled with cProfile'),
+}
+
+# Seconds, from sub-millisecond stages up to slow batch requests
+DURATION_BUCKETS_SECONDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                            0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_FILE_PREFIX = 'metrics-'
+# Counts of every exited worker, summed into one file
+EXITED_FILE_NAME = f'{METRICS_FILE_PREFIX}exited.json'
+
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(**labels):
+    """Prometheus label set ('a="x",b="y"'), also used as the series key"""
+    return ','.join(f'{name}="{escape_label_value(value)}"' for name, value in sorted(labels.items()))
+
+
+class StageTimer:
+    """Context manager observing the time spent in its block"""
+
+    __slots__ = ('registry', 'name', 'key', 'start')
+
+    def __init__(self, registry, name, key):
+        self.registry = registry
+        self.name = name
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.start, self.key)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and latency histograms, exported for Prometheus
+
+    Connection Flow:
+    1. Records: stage timers and counters from predict_pipeline.py and the
+       request hooks in app.py
+    2. Shares: with METRICS_MULTIPROC_DIR set (gunicorn.conf.py sets it),
+       every worker writes its snapshot to metrics-<pid>.json at most
+       every flush_interval seconds, and at the latest flush_interval
+       after its last request
+    3. Aggregates: /metrics sums the snapshot files of all workers; an
+       exited worker's counters and histograms are folded into
+       metrics-exited.json so counters never go backwards and the
+       directory holds one file per live worker plus one
+    4. Renders: Prometheus text exposition format
+
+    Series are keyed by their formatted label set, so recording is one
+    dict lookup plus the histogram's own lock.
+    """
+
+    def __init__(self, multiproc_dir=None, flush_interval=1.0):
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = float(flush_interval)
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._flush_timer = None
+        self.reset()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            multiproc_dir=os.environ.get('METRICS_MULTIPROC_DIR') or None,
+            flush_interval=float(os.environ.get('METRICS_FLUSH_INTERVAL', '1.0'))
+        )
+
+    def reset(self):
+        """Drop everything recorded so far (e.g. state inherited over fork)"""
+        # A timer thread does not survive fork
+        self._flush_timer = None
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def inc(self, name, key='', amount=1):
+        """Add to a counter series"""
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set_gauge(self, name, value, key=''):
+        """Set a gauge series to its current value"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name, value, key=''):
+        """Record one observation (seconds) in a histogram series"""
+        series = self._histograms.get(name)
+        histogram = series.get(key) if series is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, {}).setdefault(
+                    key, Histogram(DURATION_BUCKETS_SECONDS)
+                )
+        histogram.observe(value)
+
+    def timer(self, name, key=''):
+        """
+        Time a block into a histogram series
+
+        Args:
+            name (str): Histogram family
+            key (str): Label set from format_labels()
+
+        Returns:
+            StageTimer: context manager
+        """
+        return StageTimer(self, name, key)
+
+    def snapshot(self):
+        """
+        Values recorded by this process
+
+        Returns:
+            dict: {'counters': {name: {labels: value}},
+                   'gauges': {name: {labels: value}},
+                   'histograms': {name: {labels: Histogram.snapshot()}}}
+        """
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+        return {
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': {
+                name: {key: histogram.snapshot() for key, histogram in series.items()}
+                for name, series in histograms.items()
+            }
+        }
+
+    def snapshot_path(self, pid=None):
+        return os.path.join(self.multiproc_dir, f"{METRICS_FILE_PREFIX}{pid or os.getpid()}.json")
+
+    def flush(self):
+        """Write this process's snapshot for the other workers (multi-process mode)"""
+        if self.multiproc_dir is None:
+            return
+        self._last_flush = time.monotonic()
+        path = self.snapshot_path()
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temporary, path)
+
+    def maybe_flush(self):
+        """
+        flush() at most once per flush_interval
+
+        Inside the interval a timer flushes at its end instead, so the
+        last requests before a quiet period are not left out of the
+        snapshot.
+        """
+        if self.multiproc_dir is None or self._flush_timer is not None:
+            return
+        remaining = self.flush_interval - (time.monotonic() - self._last_flush)
+        if remaining <= 0:
+            self._safe_flush()
+            return
+        with self._lock:
+            if self._flush_timer is not None:
+                return
+            self._flush_timer = threading.Timer(remaining, self._timed_flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _timed_flush(self):
+        self._flush_timer = None
+        self._safe_flush()
+
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except OSError as e:
+            logging.warning(f"Could not write metrics snapshot: {e}")
+
+    def mark_process_dead(self, pid):
+        """
+        Fold an exited worker's final counts into metrics-exited.json
+
+        Called by the gunicorn master (child_exit). Gauges are dropped:
+        they describe live processes only.
+        """
+        if self.multiproc_dir is None:
+            return
+        path = self.snapshot_path(pid)
+        exited_path = os.path.join(self.multiproc_dir, EXITED_FILE_NAME)
+        with self._lock:
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except FileNotFoundError:
+                return
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read metrics snapshot of exited worker {pid}: {e}")
+                return
+            snapshots = [snapshot]
+            try:
+                with open(exited_path) as f:
+                    snapshots.append(json.load(f))
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read {exited_path}: {e}")
+                return
+            merged = merge_snapshots(snapshots)
+            merged['gauges'] = {}
+            try:
+                temporary = f"{exited_path}.tmp"
+                with open(temporary, 'w') as f:
+                    json.dump(merged, f)
+                os.replace(temporary, exited_path)
+                os.remove(path)
+            except OSError as e:
+                logging.warning(f"Could not fold metrics of exited worker {pid}: {e}")
+
+    def collect(self):
+        """Snapshot summed over every worker (just this process without a shared directory)"""
+        if self.multiproc_dir is None:
+            return self.snapshot()
+        # This process is counted from memory, so a failed write (logged)
+        # only delays its counts for the other workers
+        self._safe_flush()
+        own_file = os.path.basename(self.snapshot_path())
+        snapshots = [self.snapshot()]
+        try:
+            filenames = sorted(os.listdir(self.multiproc_dir))
+        except OSError as e:
+            logging.warning(f"Could not list metrics snapshots: {e}")
+            filenames = []
+        for filename in filenames:
+            if not (filename.startswith(METRICS_FILE_PREFIX) and filename.endswith('.json')) or filename == own_file:
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                # Replaced or removed while reading; its counts come back next scrape
+                continue
+            snapshots.append(snapshot)
+        return merge_snapshots(snapshots)
+
+    def render(self):
+        """All metrics in Prometheus text exposition format (version 0.0.4)"""
+        return render_prometheus(self.collect())
+
+
+def merge_snapshots(snapshots):
+    """Sum MetricsRegistry snapshots series by series"""
+    merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    for snapshot in snapshots:
+        for kind in ('counters', 'gauges'):
+            for name, series in snapshot.get(kind, {}).items():
+                target = merged[kind].setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0) + value
+        for name, series in snapshot.get('histograms', {}).items():
+            target = merged['histograms'].setdefault(name, {})
+            for key, histogram in series.items():
+                total = target.setdefault(key, {'count': 0, 'sum': 0.0, 'buckets': {}})
+                total['count'] += histogram['count']
+                total['sum'] += histogram['sum']
+                for bound, count in histogram['buckets'].items():
+                    total['buckets'][bound] = total['buckets'].get(bound, 0) + count
+    return merged
+
+
+def render_prometheus(snapshot):
+    """Format a (merged) snapshot as Prometheus text"""
+    lines = []
+    for name, (metric_type, help_text) in METRIC_FAMILIES.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        if metric_type in ('counter', 'gauge'):
+            for key, value in sorted(snapshot[metric_type + 's'].get(name, {}).items()):
+                lines.append(f"{name}{{{key}}} {value}" if key else f"{name} {value}")
+            continue
+        for key, histogram in sorted(snapshot['histograms'].get(name, {}).items()):
+            prefix = f"{key}," if key else ""
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+            labels = f"{{{key}}}" if key else ""
+            lines.append(f"{name}_sum{labels} {histogram['sum']}")
+            lines.append(f"{name}_count{labels} {histogram['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+# Shared by the prediction pipeline and app.py
+metrics_registry = MetricsRegistry.from_env()
+
+_stage_keys = {}
+
+
+def stage_timer(path, stage):
+    """
+    Time one prediction stage into spamshield_stage_duration_seconds
+
+    Args:
+        path (str): 'single' (get_predict), 'batch' (get_predict_batch)
+            or 'handler' (the Flask view)
+        stage (str): Stage name, e.g. 'clean', 'tokenize', 'model'
+    """
+    key = _stage_keys.get((path, stage))
+    if key is None:
+        key = _stage_keys[(path, stage)] = format_labels(path=path, stage=stage)
+    return metrics_registry.timer('spamshield_stage_duration_seconds', key)
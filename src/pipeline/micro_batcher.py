@@ -0,0 +1,200 @@
+import os
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import Future
+
+from src.pipeline.metrics import Histogram
+from src.pipeline.admission import Overloaded
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching scheduler in front of predict.get_predict_batch
+
+    Connection Flow:
+    1. Receives: single messages from concurrent request threads (app.py)
+    2. Collects: queued messages into one batch
+    3. Flushes: when max_batch_size messages are queued or the oldest
+       message has waited max_wait_ms
+    4. Admits: each batch through the admission controller, so one slot
+       covers a whole batch rather than one message
+    5. Predicts: one predict.get_predict_batch call per batch
+    6. Returns: each caller's own (prediction, confidence) via a Future
+
+    Admitting per message would cap every batch at the controller's
+    concurrency (one message per batch on a 1-CPU box). Overload is bounded
+    by max_pending instead: a message arriving while that many are already
+    queued is turned away with Overloaded('queue_full'), and every message
+    of a batch that cannot get a slot in time fails with the controller's
+    Overloaded('timeout').
+
+    cProfile only sees the thread that enabled it, so a profiled /predict
+    request would show nothing but the wait for its Future. With a
+    profiler, a sampled share of the batches (the profiler's sample rate),
+    and every batch carrying a message submitted with profile=True, is
+    profiled here instead, in the thread that runs inference, and written
+    as 'micro_batch' profiles.
+    """
+
+    def __init__(self, predictor, max_batch_size=32, max_wait_ms=5.0, profiler=None,
+                 admission=None, max_pending=None):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms cannot be negative")
+        if max_pending is not None and max_pending < 0:
+            raise ValueError("max_pending cannot be negative")
+        self.predictor = predictor
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self.profiler = profiler
+        self.admission = admission
+        # 0 means unbounded; the default holds four full batches
+        self.max_pending = 4 * self.max_batch_size if max_pending is None else int(max_pending)
+        self.rejected = 0
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def _ensure_worker(self):
+        """Start the worker thread lazily, and again after a gunicorn fork"""
+        if self._thread is not None and self._pid == os.getpid():
+            return self._queue
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name='micro-batcher',
+                    daemon=True
+                )
+                self._thread.start()
+        return self._queue
+
+    def submit(self, message_text, profile=False):
+        """
+        Queue one message for the next batch
+
+        Args:
+            message_text (str): Message content
+            profile (bool): Profile the batch that carries this message
+
+        Returns:
+            Future: resolves to a get_predict_batch result dict
+
+        Raises:
+            Overloaded: max_pending messages are already queued
+        """
+        work_queue = self._ensure_worker()
+        if self.max_pending and work_queue.qsize() >= self.max_pending:
+            with self._lock:
+                self.rejected += 1
+            if self.admission is not None:
+                self.admission.reject('queue_full')
+            raise Overloaded('queue_full', 1)
+        future = Future()
+        work_queue.put((message_text, future, time.perf_counter(), profile))
+        return future
+
+    def predict(self, message_text, timeout=None, profile=False):
+        """
+        Predict one message through the shared batch
+
+        Args:
+            message_text (str): Message content
+            timeout (float): Seconds to wait for the result
+            profile (bool): Profile the batch that carries this message
+
+        Returns:
+            tuple: (prediction, confidence)
+        """
+        result = self.submit(message_text, profile).result(timeout=timeout)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        return result['prediction'], result['confidence']
+
+    def _collect(self, work_queue, first):
+        """Gather up to max_batch_size items, waiting at most max_wait after the first"""
+        batch = [first]
+        deadline = first[2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = work_queue.get(timeout=remaining) if remaining > 0 else work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                work_queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self, work_queue):
+        while True:
+            first = work_queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(work_queue, first)
+
+            started = time.perf_counter()
+            self.batch_size_histogram.observe(len(batch))
+            for item in batch:
+                self.queue_wait_histogram.observe((started - item[2]) * 1000.0)
+
+            if self.admission is not None:
+                try:
+                    self.admission.acquire()
+                except Overloaded as oe:
+                    for item in batch:
+                        item[1].set_exception(oe)
+                    continue
+
+            try:
+                messages = [item[0] for item in batch]
+                if self.profiler is not None and (any(item[3] for item in batch) or self.profiler.wants()):
+                    results = self.profiler.run('micro_batch', self.predictor.get_predict_batch, messages)
+                else:
+                    results = self.predictor.get_predict_batch(messages)
+            except Exception as e:
+                logging.error(f"❌ Micro-batch of {len(batch)} failed: {str(e)}")
+                for item in batch:
+                    item[1].set_exception(e)
+                continue
+            finally:
+                if self.admission is not None:
+                    self.admission.release()
+
+            for item, result in zip(batch, results):
+                item[1].set_result(result)
+
+    def close(self):
+        """Stop the worker thread after the queued messages are served"""
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                self._queue.put(_STOP)
+                self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Pending-queue load and the batch-size and queue-wait (ms) histograms"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'max_pending': self.max_pending,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+            'rejected': self.rejected,
+            'batch_size': self.batch_size_histogram.snapshot(),
+            'queue_wait_ms': self.queue_wait_histogram.snapshot()
+        }
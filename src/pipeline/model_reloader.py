@@ -0,0 +1,129 @@
+import os
+import time
+import logging
+import threading
+
+from src.pipeline.predict_pipeline import artifact_version
+
+
+class ModelReloader:
+    """
+    Hot-reloads the predictor when its artifacts change
+
+    A background thread polls the fingerprint (name, size, mtime) of the
+    artifacts the served version was loaded from. A new fingerprint has
+    to be seen on two consecutive polls before it is loaded, so a file
+    still being written by run_pipeline.py is not picked up half-way.
+    The new version is then loaded and warmed next to the old one and
+    swapped in with predict.reload(); requests are never paused. A
+    version that fails to load is not retried until the files change
+    again.
+
+    The thread is started lazily in the process that uses it and
+    restarted after a fork (threads do not survive fork, e.g. gunicorn
+    preload_app).
+
+    Args:
+        predictor (predict): Predictor to keep up to date
+        interval (float): Seconds between polls
+    """
+
+    def __init__(self, predictor, interval=10.0):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.predictor = predictor
+        self.interval = float(interval)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._pending = None
+        self._failed = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_at = None
+        self.last_error = None
+
+    def _ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="model-reloader", daemon=True)
+            self._thread.start()
+
+    def start(self):
+        """Start watching (idempotent, fork-aware)"""
+        self._ensure_started()
+
+    def fingerprint(self):
+        """Current version id of the watched artifacts, or None when missing"""
+        paths = self.predictor.watched_paths()
+        if not paths:
+            return None
+        try:
+            return artifact_version(paths)
+        except FileNotFoundError:
+            # An artifact is being replaced right now
+            return None
+
+    def check(self):
+        """
+        Poll once and reload if a changed version has settled
+
+        Returns:
+            bool: True when a new version was swapped in
+        """
+        current = self.fingerprint()
+        served = self.predictor.model_version
+        if current is None or current == served or current == self._failed:
+            self._pending = None
+            return False
+        if current != self._pending:
+            # First sighting: wait one interval for writes to finish
+            self._pending = current
+            return False
+
+        self._pending = None
+        logging.info(f"🔁 Artifacts changed ({served} → {current}), loading the new version in the background...")
+        try:
+            self.predictor.reload()
+        except Exception as e:
+            self._failed = current
+            self.failures += 1
+            self.last_error = str(e)
+            logging.error(f"❌ Hot reload failed, still serving {served}: {e}")
+            return False
+        self._failed = None
+        self.reloads += 1
+        self.last_reload_at = time.time()
+        self.last_error = None
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"❌ Model reloader error: {e}")
+
+    def close(self):
+        """Stop watching"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            thread.join(timeout=self.interval + 1.0)
+        self._thread = None
+
+    def stats(self):
+        """Reload counters for /health"""
+        return {
+            'interval_seconds': self.interval,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_reload_at': self.last_reload_at,
+            'last_error': self.last_error
+        }
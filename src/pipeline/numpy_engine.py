@@ -0,0 +1,308 @@
+import json
+import logging
+import numpy as np
+
+
+def _sigmoid(x):
+    # tanh form is numerically stable for large |x| and needs a single ufunc
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+def _relu(x):
+    return np.maximum(x, 0.0)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'sigmoid': _sigmoid,
+    'tanh': np.tanh,
+    'relu': _relu,
+    'linear': _linear,
+    None: _linear,
+}
+
+
+def fake_quantize(x, scale):
+    """Round x to the symmetric int8 grid with the given scale, back in float32"""
+    return np.clip(np.rint(x / scale), -127, 127).astype(np.float32) * np.float32(scale)
+
+
+def _as_str(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+def _activation(name):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation for NumPy engine: {name}")
+    return ACTIVATIONS[name]
+
+
+def read_h5_model(model_path):
+    """
+    Read layer configs and weights from a Keras .h5 model file
+
+    Works for files written by Keras 2 (tf.keras) and Keras 3. Weights are
+    returned in the order the Keras loader expects (the 'weight_names'
+    attribute of each layer group).
+
+    Args:
+        model_path (str): Path to best_model.h5
+
+    Returns:
+        list: (class_name, config, weights) per layer, in model order
+    """
+    import h5py
+
+    with h5py.File(model_path, 'r') as f:
+        model_config = json.loads(_as_str(f.attrs['model_config']))
+        weights_group = f['model_weights'] if 'model_weights' in f else f
+        layers = []
+        for layer in model_config['config']['layers']:
+            class_name = layer['class_name']
+            config = layer['config']
+            if class_name == 'InputLayer':
+                continue
+            name = config['name']
+            weights = []
+            if name in weights_group:
+                group = weights_group[name]
+                for weight_name in group.attrs.get('weight_names', []):
+                    weights.append(np.asarray(group[_as_str(weight_name)], dtype=np.float32))
+            layers.append((class_name, config, weights))
+    return layers
+
+
+class NumpyLSTMEngine:
+    """
+    Pure-NumPy forward pass for the Embedding → BiLSTM → Dense network
+
+    Connection Flow:
+    1. Reads: weights and layer config from best_model.h5 (h5py only)
+    2. Fuses: embedding with each LSTM input kernel into a per-token gate
+       table, so the input projection becomes a row gather
+    3. Runs: forward and backward recurrences together as one stacked
+       matmul per timestep
+    4. Returns: sigmoid spam probabilities, matching Keras within float32
+       rounding (see `python benchmark.py parity`)
+
+    With length_aware=True the backward direction only runs over each
+    message's real tokens (see _encode_length_aware).
+
+    Needs no TensorFlow import, so serving workers boot faster and smaller.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, model_path, max_length, max_batch=256, length_aware=False):
+        self.model_path = model_path
+        self.max_length = max_length
+        self.max_batch = max_batch
+        self.length_aware = length_aware
+        self._backward_pad = None
+        self.model = None
+        # Optional static activation scales (see quantization.Int8LSTMEngine)
+        self.state_scale = None
+        self.dense_input_scales = None
+        # Calibration hook: called as observer(name, array) when set
+        self.activation_observer = None
+
+        embedding = None
+        self.dense_layers = []
+        for class_name, config, weights in self._read_layers(model_path):
+            if class_name == 'Embedding':
+                if config.get('mask_zero'):
+                    raise ValueError("NumPy engine does not support mask_zero embeddings")
+                embedding = weights[0]
+            elif class_name == 'Bidirectional':
+                self._load_bidirectional(config, weights, embedding)
+            elif class_name == 'Dense':
+                kernel, bias = weights
+                self.dense_layers.append((kernel, bias, _activation(config.get('activation'))))
+            elif class_name == 'Dropout':
+                continue
+            else:
+                raise ValueError(f"Unsupported layer for NumPy engine: {class_name}")
+
+        logging.info(f"✅ {self.name} engine ready ({self.units} LSTM units, {self.gate_table.shape[1]} tokens)")
+
+    def _read_layers(self, model_path):
+        return read_h5_model(model_path)
+
+    def _load_bidirectional(self, config, weights, embedding):
+        if embedding is None:
+            raise ValueError("Bidirectional layer must follow an Embedding layer")
+        if config.get('merge_mode', 'concat') != 'concat':
+            raise ValueError("NumPy engine only supports merge_mode='concat'")
+
+        forward_config = config['layer']['config']
+        if forward_config.get('return_sequences'):
+            raise ValueError("NumPy engine expects return_sequences=False")
+        if forward_config.get('activation', 'tanh') != 'tanh' or \
+                forward_config.get('recurrent_activation', 'sigmoid') != 'sigmoid':
+            raise ValueError("NumPy engine expects tanh/sigmoid LSTM activations")
+
+        units = forward_config['units']
+        self.units = units
+
+        # Keras gate order is (i, f, c, o); reorder to (i, f, o, c) so one
+        # sigmoid covers the first 3 * units columns and one tanh the rest
+        order = np.concatenate([
+            np.arange(0, 2 * units),
+            np.arange(3 * units, 4 * units),
+            np.arange(2 * units, 3 * units),
+        ])
+
+        tables = []
+        recurrent = []
+        for kernel, recurrent_kernel, bias in (weights[0:3], weights[3:6]):
+            tables.append((embedding @ kernel + bias)[:, order])
+            recurrent.append(recurrent_kernel[:, order])
+
+        # (2, vocab, 4u) token → gate pre-activation, forward then backward
+        self.gate_table = np.ascontiguousarray(np.stack(tables), dtype=np.float32)
+        # (2, u, 4u) recurrent kernels
+        self.recurrent_kernel = np.ascontiguousarray(np.stack(recurrent), dtype=np.float32)
+
+    def _lstm_step(self, z, c):
+        """Gate math for one timestep; z holds (i, f, o, c) pre-activations"""
+        units = self.units
+        gates = _sigmoid(z[..., :3 * units])
+        candidate = np.tanh(z[..., 3 * units:])
+        c = gates[..., units:2 * units] * c + gates[..., :units] * candidate
+        h = gates[..., 2 * units:] * np.tanh(c)
+        return h, c
+
+    def _encode(self, padded_sequences):
+        """Run both LSTM directions and return the concatenated final states"""
+        n, steps = padded_sequences.shape
+        units = self.units
+        forward_inputs = self.gate_table[0][padded_sequences]
+        backward_inputs = self.gate_table[1][padded_sequences[:, ::-1]]
+
+        h = np.zeros((2, n, units), dtype=np.float32)
+        c = np.zeros((2, n, units), dtype=np.float32)
+        z = np.empty((2, n, 4 * units), dtype=np.float32)
+        for t in range(steps):
+            if self.activation_observer is not None:
+                self.activation_observer('lstm_state', h)
+            if self.state_scale is not None:
+                h = fake_quantize(h, self.state_scale)
+            np.matmul(h, self.recurrent_kernel, out=z)
+            z[0] += forward_inputs[:, t]
+            z[1] += backward_inputs[:, t]
+            h, c = self._lstm_step(z, c)
+        return np.concatenate([h[0], h[1]], axis=1)
+
+    def _backward_pad_states(self):
+        """
+        Backward LSTM states after k padding steps from a zero state
+
+        Post-padded rows feed the backward direction their padding first,
+        and that prefix is the same for every message, so the state after
+        k padding steps is computed once for k = 0..max_length.
+
+        Returns:
+            tuple: (h, c) arrays of shape (max_length + 1, units)
+        """
+        if self._backward_pad is None:
+            units = self.units
+            pad_input = self.gate_table[1][0]
+            h = np.zeros(units, dtype=np.float32)
+            c = np.zeros(units, dtype=np.float32)
+            hs, cs = [h], [c]
+            for _ in range(self.max_length):
+                if self.state_scale is not None:
+                    h = fake_quantize(h, self.state_scale)
+                h, c = self._lstm_step(h @ self.recurrent_kernel[1] + pad_input, c)
+                hs.append(h)
+                cs.append(c)
+            self._backward_pad = (np.stack(hs), np.stack(cs))
+        return self._backward_pad
+
+    def _encode_length_aware(self, padded_sequences):
+        """
+        Same result as _encode, skipping backward steps over padding
+
+        Rows are sorted by length (longest first). The backward direction of
+        a row with L real tokens starts from the precomputed state after
+        max_length - L padding steps and runs only L steps, so at step t
+        just the rows with length > t are updated. The forward direction
+        runs every step: with post padding and no masking, its final state
+        depends on the trailing padding too.
+        """
+        n, steps = padded_sequences.shape
+        units = self.units
+
+        nonzero = padded_sequences != 0
+        lengths = np.where(nonzero.any(axis=1), steps - np.argmax(nonzero[:, ::-1], axis=1), 0)
+        order = np.argsort(-lengths, kind='stable')
+        x = padded_sequences[order]
+        lengths = lengths[order]
+        longest = int(lengths[0])
+
+        # Backward input at step t for row i is token L_i - 1 - t
+        positions = lengths[:, None] - 1 - np.arange(longest)[None, :]
+        backward_tokens = np.take_along_axis(x, np.clip(positions, 0, None), axis=1)
+        backward_inputs = self.gate_table[1][backward_tokens]
+        forward_inputs = self.gate_table[0][x]
+        # Rows still running the backward direction at each step
+        active = np.searchsorted(-lengths, -np.arange(steps), side='left')
+
+        pad_h, pad_c = self._backward_pad_states()
+        h = np.empty((2, n, units), dtype=np.float32)
+        c = np.empty((2, n, units), dtype=np.float32)
+        h[0] = 0.0
+        c[0] = 0.0
+        h[1] = pad_h[steps - lengths]
+        c[1] = pad_c[steps - lengths]
+
+        for t in range(steps):
+            m = active[t]
+            state = h if self.state_scale is None else fake_quantize(h, self.state_scale)
+            if m == n:
+                z = np.matmul(state, self.recurrent_kernel)
+                z[0] += forward_inputs[:, t]
+                z[1] += backward_inputs[:, t]
+                h, c = self._lstm_step(z, c)
+                continue
+            z = state[0] @ self.recurrent_kernel[0]
+            z += forward_inputs[:, t]
+            h[0], c[0] = self._lstm_step(z, c[0])
+            if m > 0:
+                z = state[1, :m] @ self.recurrent_kernel[1]
+                z += backward_inputs[:m, t]
+                h[1, :m], c[1, :m] = self._lstm_step(z, c[1, :m])
+
+        encoded = np.empty((n, 2 * units), dtype=np.float32)
+        encoded[order] = np.concatenate([h[0], h[1]], axis=1)
+        return encoded
+
+    def predict_proba(self, padded_sequences):
+        """
+        Score padded sequences
+
+        Args:
+            padded_sequences (np.ndarray): int array of shape (n, max_length)
+
+        Returns:
+            np.ndarray: float32 spam probabilities of shape (n,)
+        """
+        padded_sequences = np.asarray(padded_sequences, dtype=np.intp)
+        outputs = []
+        for start in range(0, len(padded_sequences), self.max_batch):
+            chunk = padded_sequences[start:start + self.max_batch]
+            if self.length_aware and self.activation_observer is None:
+                x = self._encode_length_aware(chunk)
+            else:
+                x = self._encode(chunk)
+            for i, (kernel, bias, activation) in enumerate(self.dense_layers):
+                if self.activation_observer is not None:
+                    self.activation_observer(f'dense_{i}_input', x)
+                if self.dense_input_scales is not None:
+                    x = fake_quantize(x, self.dense_input_scales[i])
+                x = activation(x @ kernel + bias)
+            outputs.append(x[:, 0])
+        return np.concatenate(outputs).astype(np.float32)
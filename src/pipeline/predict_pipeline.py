@@ -1,32 +1,97 @@
 import os
 import re
+import sys
+import hashlib
 import numpy as np
-import pandas as pd
-import joblib
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.sequence import pad_sequences
 import logging
 import warnings
+import time
+import threading
 import traceback
 
+from src.pipeline.candidate_model import CandidateModel
+from src.pipeline.inference_engine import create_engine, DEFAULT_ENGINE
+from src.pipeline.linear_tier import load_linear_tier
+from src.pipeline.metrics import metrics_registry, stage_timer
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.startup import startup_timer, startup_profile_enabled
+from src.pipeline.text_cleaner import clean_text, clean_texts
+from src.pipeline.vocab_tokenizer import VocabTokenizer, load_vocab
+
 # Suppress scikit-learn version warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
 
-logging.basicConfig(level=logging.INFO)
+
+def artifact_version(paths):
+    """
+    Short fingerprint of artifact files (path, size, modification time)
+
+    Args:
+        paths (list): Artifact file paths
+
+    Returns:
+        str: 12-character hex version id
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def is_dataframe(obj):
+    """isinstance(obj, pd.DataFrame) without importing pandas"""
+    # pandas is only imported for training and customdata.data_frame();
+    # if it was never imported, obj cannot be a DataFrame
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(obj, pandas.DataFrame)
+
+
+class ModelState:
+    """
+    Everything a prediction reads from one loaded model version
+
+    Requests take a single reference to the current state and use it to
+    the end, so a hot reload (which replaces predict.state) never mixes a
+    new tokenizer with an old engine and never blocks in-flight requests.
+    """
+
+    def __init__(self, engine, tokenizer, max_length, linear_tier, version, artifact_paths):
+        self.engine = engine
+        self.model = getattr(engine, 'model', None)
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.linear_tier = linear_tier
+        self.version = version
+        self.artifact_paths = artifact_paths
+
+
+def state_attribute(name):
+    """Read-only view of an attribute of the current ModelState (None before loading)"""
+    return property(lambda self: getattr(self.state, name, None))
+
 
 class predict:
     """
     SMS/Email Spam Prediction Pipeline (TensorFlow)
     
     Connection Flow:
-    1. Loads: best_model.h5, preprocessing.pkl (from model_trainer.py)
+    1. Loads: best_model.h5 (from model_trainer.py), vocab.json (from
+       data_transform.py; preprocessing.pkl for older builds)
     2. Receives: SMS/Email text from user (via app.py)
     3. Preprocesses: Cleans, tokenizes, pads sequence
-    4. Predicts: Uses TensorFlow LSTM model
+    4. Predicts: Uses the LSTM model through the configured inference
+       engine (TensorFlow, or pure NumPy with INFERENCE_ENGINE=numpy)
     5. Returns: "Spam" or "Legitimate" with confidence
     6. Used by: app.py for web interface
     """
+
+    engine = state_attribute('engine')
+    model = state_attribute('model')
+    tokenizer = state_attribute('tokenizer')
+    max_length = state_attribute('max_length')
+    linear_tier = state_attribute('linear_tier')
+    model_version = state_attribute('version')
     
     def __init__(self):
         # Resolve artifact paths relative to the project root so deployment
@@ -34,70 +99,255 @@ class predict:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
         self.model_path = os.path.join(project_root, 'artifacts', 'best_model.h5')
         self.preprocessing_path = os.path.join(project_root, 'artifacts', 'preprocessing.pkl')
-        self.model = None
-        self.tokenizer = None
-        self.max_length = None
-    # If model fails to load in deployment (TensorFlow issues), use a simple
-    # heuristic fallback so the web app remains usable.
-    self.fallback = False
+        self.vocab_path = os.path.join(project_root, 'artifacts', 'vocab.json')
+        self.cascade_path = os.path.join(project_root, 'artifacts', 'cascade_tier1.npz')
+        # Engine selected by INFERENCE_ENGINE (see inference_engine.ENGINES)
+        self.engine_name = os.environ.get('INFERENCE_ENGINE', DEFAULT_ENGINE)
+        # Loaded model version (engine, tokenizer, ...), swapped as a whole
+        self.state = None
+        self._load_lock = threading.Lock()
+        # Optional linear first tier in front of the LSTM (CASCADE_ENABLED=1)
+        self.cascade_enabled = os.environ.get('CASCADE_ENABLED', '').lower() in ('1', 'true', 'yes', 'on')
+        self.tier_counts = {'first_tier': 0, 'lstm': 0}
+        self._tier_lock = threading.Lock()
+        # Optional candidate model in shadow or A/B mode (CANDIDATE_* variables)
+        self.candidate = CandidateModel.from_env(self.model_path, self.engine_name)
+        # If model fails to load in deployment (TensorFlow issues), use a simple
+        # heuristic fallback so the web app remains usable.
+        self.fallback = False
+        # Results cache keyed by cleaned text (PREDICTION_CACHE_SIZE=0 disables)
+        cache_size = int(os.environ.get('PREDICTION_CACHE_SIZE', '10000'))
+        cache_ttl = float(os.environ.get('PREDICTION_CACHE_TTL', '0'))
+        self.cache = PredictionCache(cache_size, cache_ttl) if cache_size > 0 else None
         
     def load_model(self):
         """Load TensorFlow model and preprocessing objects"""
-        if self.model is None and not self.fallback:
-            try:
-                # Check if model file exists
-                if not os.path.exists(self.model_path) or not os.path.exists(self.preprocessing_path):
-                    raise FileNotFoundError("Model or preprocessing artifacts missing")
+        if self.state is None and not self.fallback:
+            with self._load_lock:
+                if self.state is not None or self.fallback:
+                    return
+                try:
+                    self.state = self.build_state()
+                except Exception as e:
+                    # Instead of crashing on deployment, enable fallback heuristic so app remains useful.
+                    logging.error(f"❌ Error loading model or preprocessing: {str(e)}")
+                    logging.error(traceback.format_exc())
+                    logging.warning("Switching to fallback heuristic predictor (keyword + URL detection)")
+                    self.fallback = True
+    
+    def build_state(self):
+        """
+        Load the current artifacts into a new ModelState
 
-                logging.info("🔄 Loading TensorFlow model...")
+        Does not touch the state being served, so it can run in the
+        background while requests keep using the old version.
 
-                # Try to import TensorFlow; failures can happen on some deployment platforms
-                try:
-                    import tensorflow as tf
-                    tf.get_logger().setLevel('ERROR')
-                except Exception as tf_import_err:
-                    logging.error(f"TensorFlow import failed: {tf_import_err}")
-                    raise tf_import_err
+        Returns:
+            ModelState: Loaded model version
+        """
+        # Prefer the compact vocabulary; preprocessing.pkl (which needs
+        # keras_preprocessing to unpickle) is only read by older builds
+        tokenizer, max_length, tokenizer_path = self.load_tokenizer()
 
-                # Load the saved Keras model
-                try:
-                    self.model = load_model(self.model_path, compile=False)
-                    # Compile for safe prediction API
-                    self.model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-                    logging.info(f"✅ Model loaded and compiled from: {self.model_path}")
-                except Exception as tf_error:
-                    logging.error(f"TensorFlow model loading error: {tf_error}")
-                    raise tf_error
-
-                # Load preprocessing objects
-                logging.info("🔄 Loading preprocessing objects...")
-                preprocessing_obj = joblib.load(self.preprocessing_path)
-
-                # Validate preprocessing object
-                required_keys = ['tokenizer', 'max_length', 'vocab_size']
-                for key in required_keys:
-                    if key not in preprocessing_obj:
-                        raise KeyError(f"Missing key in preprocessing object: {key}")
-
-                self.tokenizer = preprocessing_obj['tokenizer']
-                self.max_length = preprocessing_obj['max_length']
-                logging.info(f"✅ Tokenizer loaded (vocab size: {preprocessing_obj.get('vocab_size', 'unknown')})")
+        # Build the inference engine (TensorFlow import failures can
+        # happen on some deployment platforms)
+        logging.info(f"🔄 Loading model with '{self.engine_name}' inference engine...")
+        try:
+            with startup_timer.phase(f"load model ({self.engine_name} engine)"):
+                engine = create_engine(self.engine_name, self.model_path, max_length)
+        except Exception as tf_error:
+            logging.error(f"TensorFlow model loading error: {tf_error}")
+            raise tf_error
+        artifact_paths = [engine.model_path, tokenizer_path]
+
+        # Cascade first tier (optional: without it every message goes to the LSTM)
+        linear_tier = None
+        if self.cascade_enabled:
+            if os.path.exists(self.cascade_path):
+                with startup_timer.phase("load cascade first tier"):
+                    linear_tier = load_linear_tier(self.cascade_path)
+                artifact_paths.append(self.cascade_path)
+                logging.info(f"✅ Cascade first tier loaded (escalating "
+                             f"{linear_tier.low_threshold:.4f} < p < {linear_tier.high_threshold:.4f})")
+            else:
+                logging.warning(f"CASCADE_ENABLED is set but {self.cascade_path} is missing; serving LSTM only")
+
+        version = artifact_version(artifact_paths)
+        logging.info(f"✅ Model loaded from: {engine.model_path} (version {version})")
+        return ModelState(engine, tokenizer, max_length, linear_tier, version, artifact_paths)
+    
+    def watched_paths(self):
+        """Artifact files whose changes trigger a hot reload"""
+        state = self.state
+        if state is not None:
+            return list(state.artifact_paths)
+        return [path for path in (self.model_path, self.vocab_path, self.preprocessing_path) if os.path.exists(path)]
+    
+    def reload(self):
+        """
+        Load and warm the current artifacts, then swap them in
 
+        In-flight requests finish on the version they started with; the
+        prediction cache drops its entries on the next lookup because
+        the model version changed. A successful reload also leaves
+        fallback mode.
+
+        Returns:
+            str: The version now served
+
+        Raises:
+            Exception: Any loading error (the served version is unchanged)
+        """
+        state = self.build_state()
+        state.engine.predict_proba(np.zeros((1, state.max_length), dtype=np.int32))
+        with self._load_lock:
+            previous = self.state
+            self.state = state
+            self.fallback = False
+        logging.info(f"♻️  Model hot-reloaded: {previous.version if previous else 'fallback'} → {state.version}")
+        return state.version
+    
+    def load_tokenizer(self):
+        """
+        Load the serving tokenizer
+
+        Reads artifacts/vocab.json when present, otherwise converts the
+        Keras tokenizer pickled in preprocessing.pkl.
+
+        Returns:
+            tuple: (VocabTokenizer, max_length, artifact path)
+        """
+        if os.path.exists(self.vocab_path):
+            logging.info("🔄 Loading serving vocabulary...")
+            with startup_timer.phase("load vocab.json"):
+                tokenizer, max_length = load_vocab(self.vocab_path)
+            logging.info(f"✅ Tokenizer loaded (vocab size: {tokenizer.vocab_size})")
+            return tokenizer, max_length, self.vocab_path
+
+        if not os.path.exists(self.preprocessing_path):
+            raise FileNotFoundError("Preprocessing artifacts missing")
+
+        logging.warning(f"{self.vocab_path} not found, loading the tokenizer from preprocessing.pkl")
+        with startup_timer.phase("load preprocessing.pkl"):
+            import joblib
+            preprocessing_obj = joblib.load(self.preprocessing_path)
+
+        # Validate preprocessing object
+        required_keys = ['tokenizer', 'max_length', 'vocab_size']
+        for key in required_keys:
+            if key not in preprocessing_obj:
+                raise KeyError(f"Missing key in preprocessing object: {key}")
+
+        tokenizer = VocabTokenizer.from_keras(preprocessing_obj['tokenizer'])
+        logging.info(f"✅ Tokenizer loaded (vocab size: {preprocessing_obj.get('vocab_size', 'unknown')})")
+        return tokenizer, preprocessing_obj['max_length'], self.preprocessing_path
+    
+    def score_first_tier(self, linear_tier, cleaned_texts):
+        """
+        Score cleaned texts with the cascade's linear first tier
+
+        Returns:
+            tuple: (spam probabilities, bool mask of messages the tier answers)
+        """
+        probabilities = linear_tier.predict_proba(cleaned_texts)
+        answered = linear_tier.decide(probabilities)
+        answered_count = int(answered.sum())
+        with self._tier_lock:
+            self.tier_counts['first_tier'] += answered_count
+            self.tier_counts['lstm'] += len(cleaned_texts) - answered_count
+        return probabilities, answered
+    
+    def cascade_stats(self):
+        """How many scored messages each cascade tier answered"""
+        with self._tier_lock:
+            counts = dict(self.tier_counts)
+        total = counts['first_tier'] + counts['lstm']
+        linear_tier = self.linear_tier
+        stats = {
+            'enabled': linear_tier is not None,
+            'answered_by_first_tier': counts['first_tier'],
+            'escalated_to_lstm': counts['lstm'],
+            'skip_fraction': counts['first_tier'] / total if total else 0.0
+        }
+        if linear_tier is not None:
+            stats['low_threshold'] = linear_tier.low_threshold
+            stats['high_threshold'] = linear_tier.high_threshold
+        return stats
+    
+    def score_model(self, state, cleaned_texts, padded_sequences):
+        """
+        Score padded sequences with the primary engine, or the candidate for its A/B share
+
+        Without a candidate this is just state.engine.predict_proba. With
+        one, the model that did not answer scores the sampled messages in
+        the background, so agreement is measured without slowing the
+        response.
+
+        Args:
+            state (ModelState): Primary model version serving the request
+            cleaned_texts (list): Cleaned messages, one per padded row
+            padded_sequences (np.ndarray): Primary tokenizer output
+
+        Returns:
+            np.ndarray: Spam probabilities returned to the caller
+        """
+        candidate = self.candidate
+        if candidate is None:
+            return state.engine.predict_proba(padded_sequences)
+        if not candidate.ready():
+            # Without warmup, load off the request path; the primary answers meanwhile
+            candidate.load_in_background(state.max_length)
+            return state.engine.predict_proba(padded_sequences)
+
+        routed = np.array([candidate.routes_to_candidate(text) for text in cleaned_texts], dtype=bool)
+        sampled = np.array([candidate.is_sampled(text) for text in cleaned_texts], dtype=bool)
+        proba = np.empty(len(cleaned_texts), dtype=np.float32)
+
+        if routed.any():
+            routed_texts = [text for text, keep in zip(cleaned_texts, routed) if keep]
+            try:
+                proba[routed] = candidate.predict_proba(routed_texts, state.tokenizer, state.max_length)
+                candidate.compare_later('candidate', routed_texts, proba[routed], state)
             except Exception as e:
-                # Instead of crashing on deployment, enable fallback heuristic so app remains useful.
-                logging.error(f"❌ Error loading model or preprocessing: {str(e)}")
-                logging.error(traceback.format_exc())
-                logging.warning("Switching to fallback heuristic predictor (keyword + URL detection)")
-                self.fallback = True
+                # The candidate never fails a request: the primary answers instead
+                logging.error(f"❌ Candidate model failed, answering with the primary: {e}")
+                candidate.record_failure()
+                routed[:] = False
+
+        primary = ~routed
+        if primary.any():
+            start = time.perf_counter()
+            proba[primary] = state.engine.predict_proba(padded_sequences[primary])
+            candidate.record_latency('primary', time.perf_counter() - start, int(primary.sum()))
+            mirrored = primary & sampled
+            candidate.compare_later(
+                'primary', [text for text, keep in zip(cleaned_texts, mirrored) if keep], proba[mirrored], state
+            )
+        return proba
+    
+    def warmup(self):
+        """
+        Load the model and run one inference outside the request path
+
+        Bypasses the prediction cache. Returns True when the model is
+        loaded, False when serving from the fallback heuristic.
+        """
+        self.load_model()
+        state = self.state
+        if state is None:
+            return False
+        with startup_timer.phase("warmup inference"):
+            state.engine.predict_proba(np.zeros((1, state.max_length), dtype=np.int32))
+        if self.candidate is not None:
+            with startup_timer.phase("load candidate model"):
+                self.candidate.load(state.max_length)
+        if startup_profile_enabled():
+            startup_timer.log_report()
+        return True
     
     def clean_text(self, text):
-        """Clean text"""
-        text = str(text).lower()
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        text = ' '.join(text.split())
-        return text
+        """Clean text the same way the training data was cleaned"""
+        return clean_text(text)
     
     def get_predict(self, message_text):
         """
@@ -115,7 +365,7 @@ class predict:
                 raise ValueError("Message text cannot be None")
             
             # Extract text if DataFrame
-            if isinstance(message_text, pd.DataFrame):
+            if is_dataframe(message_text):
                 if 'text' not in message_text.columns:
                     raise KeyError("DataFrame must contain 'text' column")
                 if len(message_text) == 0:
@@ -127,53 +377,74 @@ class predict:
             if len(message_text) == 0:
                 raise ValueError("Message text is empty")
             
-            logging.info(f"\n🔍 Analyzing message: {message_text[:100]}...")
+            # Per-message details are DEBUG (and not formatted unless enabled);
+            # app.py writes one sampled, redacted record per request
+            logging.debug("🔍 Analyzing message (%d chars)", len(message_text))
             
             # Load model if not loaded
             self.load_model()
             
-            # Validate model components
-            if self.model is None:
+            # Validate model components (one consistent version for the whole request)
+            state = self.state
+            if state is None:
                 raise RuntimeError("Model failed to load")
-            if self.tokenizer is None:
+            if state.tokenizer is None:
                 raise RuntimeError("Tokenizer failed to load")
-            if self.max_length is None:
+            if state.max_length is None:
                 raise RuntimeError("Max length not set")
             
             # Preprocess text
-            cleaned_text = self.clean_text(message_text)
+            with stage_timer('single', 'clean'):
+                cleaned_text = self.clean_text(message_text)
             if len(cleaned_text.strip()) == 0:
                 logging.warning("Text became empty after cleaning, using original text")
                 cleaned_text = message_text
             
-            # Tokenize and pad
-            sequence = self.tokenizer.texts_to_sequences([cleaned_text])
-            
-            # Check if tokenization produced any sequences
-            if len(sequence) == 0 or len(sequence[0]) == 0:
-                logging.warning("Tokenization produced empty sequence")
-                # Return a default prediction for unknown text
-                return "Legitimate", 0.5
-            
-            padded_sequence = pad_sequences(
-                sequence, 
-                maxlen=self.max_length, 
-                padding='post', 
-                truncating='post'
-            )
-            
-            # Validate padded sequence
-            if padded_sequence is None or len(padded_sequence) == 0:
-                raise RuntimeError("Padding failed")
-            
-            # Predict
-            prediction_proba = self.model.predict(padded_sequence, verbose=0)
+            # Serve repeated messages from the cache
+            cache_key = None
+            if self.cache is not None:
+                with stage_timer('single', 'cache_lookup'):
+                    self.cache.sync_version(state.version)
+                    cache_key = self.cache.make_key(cleaned_text)
+                    cached = self.cache.get(cache_key, state.version)
+                if cached is not None:
+                    metrics_registry.inc('spamshield_cache_hits_total')
+                    logging.debug("⚡ Cache hit: %s", cached[0])
+                    return cached
+                metrics_registry.inc('spamshield_cache_misses_total')
             
-            # Validate prediction output
-            if prediction_proba is None or len(prediction_proba) == 0:
-                raise RuntimeError("Model prediction failed")
+            # Cascade: the linear first tier answers confidently scored messages
+            prediction_proba = None
+            if state.linear_tier is not None:
+                with stage_timer('single', 'first_tier'):
+                    tier_proba, answered = self.score_first_tier(state.linear_tier, [cleaned_text])
+                if answered[0]:
+                    prediction_proba = float(tier_proba[0])
             
-            prediction_proba = float(prediction_proba[0][0])
+            if prediction_proba is None:
+                # Tokenize and pad
+                with stage_timer('single', 'tokenize'):
+                    padded_sequence, lengths = state.tokenizer.texts_to_array([cleaned_text], state.max_length)
+                
+                # Check if tokenization produced any tokens
+                if lengths[0] == 0:
+                    logging.warning("Tokenization produced empty sequence")
+                    # Return a default prediction for unknown text
+                    return "Legitimate", 0.5
+                
+                # Validate padded sequence
+                if padded_sequence is None or len(padded_sequence) == 0:
+                    raise RuntimeError("Padding failed")
+                
+                # Predict (the candidate model answers its A/B share, if configured)
+                with stage_timer('single', 'model'):
+                    prediction_proba = self.score_model(state, [cleaned_text], padded_sequence)
+                
+                # Validate prediction output
+                if prediction_proba is None or len(prediction_proba) == 0:
+                    raise RuntimeError("Model prediction failed")
+                
+                prediction_proba = float(prediction_proba[0])
             
             # Ensure probability is in valid range
             prediction_proba = max(0.0, min(1.0, prediction_proba))
@@ -186,8 +457,10 @@ class predict:
                 prediction = "Legitimate"
                 confidence = 1 - prediction_proba
             
-            logging.info(f"✅ Prediction: {prediction}")
-            logging.info(f"📊 Confidence: {confidence:.4f}")
+            logging.debug("✅ Prediction: %s (confidence %.4f)", prediction, confidence)
+            
+            if cache_key is not None:
+                self.cache.put(cache_key, (prediction, float(confidence)), state.version)
             
             return prediction, float(confidence)
             
@@ -197,24 +470,200 @@ class predict:
             # If fallback is enabled, attempt heuristic prediction instead of raising
             if self.fallback:
                 logging.info("Using fallback heuristic to classify message")
-                text = str(message_text)
-                lowered = text.lower()
-                # Simple heuristics: URLs, typical spam words
-                spam_keywords = ['win', 'free', 'congrat', 'urgent', 'verify', 'password', 'click', 'bank', 'prize']
-                has_url = bool(re.search(r'http[s]?://|www\.|bit\.ly|\b\w+\.\w{2,3}\b', lowered))
-                score = 0.0
-                if has_url:
-                    score += 0.5
-                for kw in spam_keywords:
-                    if kw in lowered:
-                        score += 0.15
-                score = min(0.99, score)
-                if score > 0.5:
-                    return "Spam", float(score)
-                else:
-                    return "Legitimate", float(1 - score)
+                metrics_registry.inc('spamshield_fallback_predictions_total')
+                return self.fallback_predict(message_text)
+            metrics_registry.inc('spamshield_prediction_errors_total')
             # If not fallback, propagate the exception so caller can handle
             raise e
+    
+    def fallback_predict(self, message_text):
+        """
+        Keyword + URL heuristic used when the model cannot be loaded
+
+        Args:
+            message_text (str): Message content
+
+        Returns:
+            tuple: (prediction, confidence)
+        """
+        text = str(message_text)
+        lowered = text.lower()
+        # Simple heuristics: URLs, typical spam words
+        spam_keywords = ['win', 'free', 'congrat', 'urgent', 'verify', 'password', 'click', 'bank', 'prize']
+        has_url = bool(re.search(r'http[s]?://|www\.|bit\.ly|\b\w+\.\w{2,3}\b', lowered))
+        score = 0.0
+        if has_url:
+            score += 0.5
+        for kw in spam_keywords:
+            if kw in lowered:
+                score += 0.15
+        score = min(0.99, score)
+        if score > 0.5:
+            return "Spam", float(score)
+        else:
+            return "Legitimate", float(1 - score)
+    
+    def fallback_predict_counted(self, message_text):
+        """fallback_predict, counted in the fallback metric (used when the model is overloaded)"""
+        metrics_registry.inc('spamshield_fallback_predictions_total')
+        return self.fallback_predict(message_text)
+    
+    def fallback_predict_batch(self, messages):
+        """
+        Answer a batch with the fallback heuristic only
+
+        Same result format and per-message validation as get_predict_batch.
+        """
+        results = []
+        for message_text in messages:
+            if message_text is None:
+                results.append({'error': "Message text cannot be None"})
+                continue
+            message_text = str(message_text).strip()
+            if len(message_text) == 0:
+                results.append({'error': "Message text is empty"})
+                continue
+            prediction, confidence = self.fallback_predict_counted(message_text)
+            results.append({'prediction': prediction, 'confidence': confidence})
+        return results
+    
+    def get_predict_batch(self, messages):
+        """
+        Predict a batch of messages with a single model call
+
+        Every message is cleaned, tokenized and padded, then all of them are
+        scored together. Invalid messages (None, empty) are reported in their
+        own slot without failing the rest of the batch.
+
+        Args:
+            messages (list or pd.DataFrame): Message contents, or a DataFrame
+                with a 'text' column
+
+        Returns:
+            list: One dict per message, in input order. Either
+                {'prediction': str, 'confidence': float} or {'error': str}
+        """
+        if messages is None:
+            raise ValueError("Messages cannot be None")
+        if is_dataframe(messages):
+            if 'text' not in messages.columns:
+                raise KeyError("DataFrame must contain 'text' column")
+            messages = messages['text'].tolist()
+        elif isinstance(messages, str):
+            raise ValueError("Expected a list of messages, got a single string")
+        messages = list(messages)
+
+        results = [None] * len(messages)
+        valid_indices = []
+        texts = []
+        for i, message_text in enumerate(messages):
+            if message_text is None:
+                results[i] = {'error': "Message text cannot be None"}
+                continue
+            message_text = str(message_text).strip()
+            if len(message_text) == 0:
+                results[i] = {'error': "Message text is empty"}
+                continue
+            valid_indices.append(i)
+            texts.append(message_text)
+
+        if not texts:
+            return results
+
+        logging.debug("🔍 Analyzing batch of %d messages", len(texts))
+
+        try:
+            self.load_model()
+
+            # One consistent model version for the whole batch
+            state = self.state
+            if state is None:
+                raise RuntimeError("Model failed to load")
+            if state.tokenizer is None:
+                raise RuntimeError("Tokenizer failed to load")
+            if state.max_length is None:
+                raise RuntimeError("Max length not set")
+
+            with stage_timer('batch', 'clean'):
+                cleaned_texts = [
+                    cleaned_text if len(cleaned_text.strip()) > 0 else text
+                    for text, cleaned_text in zip(texts, clean_texts(texts))
+                ]
+
+            # Serve repeated messages from the cache; only misses are scored
+            pending = list(range(len(texts)))
+            cache_keys = None
+            if self.cache is not None:
+                with stage_timer('batch', 'cache_lookup'):
+                    self.cache.sync_version(state.version)
+                    cache_keys = [self.cache.make_key(cleaned_text) for cleaned_text in cleaned_texts]
+                    pending = []
+                    for k, cache_key in enumerate(cache_keys):
+                        cached = self.cache.get(cache_key, state.version)
+                        if cached is None:
+                            pending.append(k)
+                        else:
+                            results[valid_indices[k]] = {'prediction': cached[0], 'confidence': cached[1]}
+                metrics_registry.inc('spamshield_cache_hits_total', amount=len(texts) - len(pending))
+                metrics_registry.inc('spamshield_cache_misses_total', amount=len(pending))
+
+            def store(k, proba):
+                proba = max(0.0, min(1.0, float(proba)))
+                if proba > 0.5:
+                    result = {'prediction': "Spam", 'confidence': proba}
+                else:
+                    result = {'prediction': "Legitimate", 'confidence': 1 - proba}
+                results[valid_indices[k]] = result
+                if cache_keys is not None:
+                    self.cache.put(cache_keys[k], (result['prediction'], result['confidence']), state.version)
+
+            # Cascade: the linear first tier answers confidently scored
+            # messages; only the uncertain ones reach the LSTM
+            if state.linear_tier is not None and pending:
+                with stage_timer('batch', 'first_tier'):
+                    tier_proba, answered = self.score_first_tier(state.linear_tier, [cleaned_texts[k] for k in pending])
+                for k, proba, done in zip(pending, tier_proba, answered):
+                    if done:
+                        store(k, proba)
+                pending = [k for k, done in zip(pending, answered) if not done]
+
+            # Tokenize straight into one padded array
+            with stage_timer('batch', 'tokenize'):
+                padded_sequences, lengths = state.tokenizer.texts_to_array(
+                    [cleaned_texts[k] for k in pending], state.max_length
+                )
+
+            # Messages without any known token get the same default answer as get_predict
+            has_tokens = lengths > 0
+            scored = [k for k, keep in zip(pending, has_tokens) if keep]
+            for k in pending:
+                results[valid_indices[k]] = {'prediction': "Legitimate", 'confidence': 0.5}
+
+            if scored:
+                padded_sequences = padded_sequences[has_tokens]
+                with stage_timer('batch', 'model'):
+                    prediction_proba = self.score_model(state, [cleaned_texts[k] for k in scored], padded_sequences)
+                if prediction_proba is None or len(prediction_proba) != len(scored):
+                    raise RuntimeError("Model prediction failed")
+
+                for k, proba in zip(scored, prediction_proba):
+                    store(k, proba)
+
+            logging.debug("✅ Batch prediction complete: %d messages", len(texts))
+            return results
+
+        except Exception as e:
+            logging.error(f"❌ Error in batch prediction: {str(e)}")
+            logging.error(traceback.format_exc())
+            if self.fallback:
+                logging.info("Using fallback heuristic to classify batch")
+                metrics_registry.inc('spamshield_fallback_predictions_total', amount=len(texts))
+                for i, text in zip(valid_indices, texts):
+                    prediction, confidence = self.fallback_predict(text)
+                    results[i] = {'prediction': prediction, 'confidence': confidence}
+                return results
+            metrics_registry.inc('spamshield_prediction_errors_total')
+            raise e
 
 class customdata:
     """
@@ -236,6 +685,7 @@ class customdata:
     def data_frame(self):
         """Convert input to DataFrame"""
         try:
+            import pandas as pd
             df = pd.DataFrame({"text": [self.message_text]})
             if len(df) == 0:
                 raise ValueError("Failed to create DataFrame")
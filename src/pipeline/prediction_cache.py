@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results
+
+    Keys are hashes of the cleaned message text, so messages that
+    normalize to the same text share one entry. Entries are tied to the
+    model version that produced them: when the predictor reports a new
+    version the whole cache is dropped, and get/put carry the version of
+    the model state the caller scored with, so a request that started
+    before a hot swap can neither read nor write across it.
+
+    Args:
+        max_size (int): Maximum number of entries (least recently used
+            entries are evicted first)
+        ttl_seconds (float): Optional entry lifetime; None or 0 disables expiry
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=None):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = int(max_size)
+        self.ttl_seconds = float(ttl_seconds) if ttl_seconds else None
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_writes = 0
+
+    @staticmethod
+    def make_key(cleaned_text):
+        """Compact hash of the cleaned message text"""
+        return hashlib.blake2b(cleaned_text.encode('utf-8'), digest_size=16).digest()
+
+    def sync_version(self, version):
+        """Drop every entry if the model version changed"""
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.version = version
+
+    def get(self, key, version):
+        """
+        Look up a cached result
+
+        Args:
+            key (bytes): make_key of the cleaned text
+            version (str): Version of the model state the caller scores with
+
+        Returns:
+            Cached value, or None on a miss (always a miss when version is
+            not the cache's current version)
+        """
+        with self._lock:
+            entry = self._entries.get(key) if version == self.version else None
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, version):
+        """
+        Store a result, evicting the least recently used entry if full
+
+        Args:
+            key (bytes): make_key of the cleaned text
+            value: Result to cache
+            version (str): Version of the model state that produced value;
+                the write is dropped when the cache moved on to another version
+        """
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if version != self.version:
+                self.stale_writes += 1
+                return
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Size and hit/miss/eviction/stale-write counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale_writes': self.stale_writes,
+                'model_version': self.version
+            }
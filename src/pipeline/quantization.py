@@ -0,0 +1,118 @@
+import json
+import numpy as np
+
+from src.pipeline.numpy_engine import NumpyLSTMEngine
+
+INT8_FORMAT_VERSION = 1
+
+
+def quantize_symmetric(weights, axis):
+    """
+    Symmetric per-channel int8 quantization
+
+    Args:
+        weights (np.ndarray): float weights
+        axis (int): Axis reduced to compute each channel's scale (0 gives
+            one scale per output column of a kernel, 1 one per embedding row)
+
+    Returns:
+        tuple: (int8 values, float32 scales broadcastable to weights)
+    """
+    max_abs = np.max(np.abs(weights), axis=axis, keepdims=True)
+    scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    quantized = np.clip(np.rint(weights / scale), -127, 127).astype(np.int8)
+    return quantized, scale
+
+
+def dequantize(quantized, scale):
+    """Inverse of quantize_symmetric"""
+    return quantized.astype(np.float32) * scale
+
+
+def save_int8_model(path, layers, activation_scales=None):
+    """
+    Write an int8 serving artifact (.npz)
+
+    Every weight with two or more dimensions is stored as int8 with
+    per-channel scales (per row for embeddings, per output column for
+    kernels); biases stay float32.
+
+    Args:
+        path (str): Output path, e.g. artifacts/model_int8.npz
+        layers (list): (class_name, config, weights) from read_h5_model
+        activation_scales (dict): Optional static activation scales
+    """
+    arrays = {}
+    layer_specs = []
+    for i, (class_name, config, weights) in enumerate(layers):
+        weight_specs = []
+        for k, weight in enumerate(weights):
+            key = f"w{i}_{k}"
+            if weight.ndim >= 2:
+                axis = 1 if class_name == 'Embedding' else 0
+                arrays[key], arrays[f"{key}_scale"] = quantize_symmetric(weight, axis)
+                weight_specs.append({'key': key, 'quantized': True})
+            else:
+                arrays[key] = weight.astype(np.float32)
+                weight_specs.append({'key': key, 'quantized': False})
+        layer_specs.append({'class_name': class_name, 'config': config, 'weights': weight_specs})
+
+    arrays['format_version'] = np.array(INT8_FORMAT_VERSION)
+    arrays['layers'] = np.array(json.dumps(layer_specs))
+    if activation_scales:
+        arrays['activation_scales'] = np.array(json.dumps(activation_scales))
+    np.savez_compressed(path, **arrays)
+
+
+def load_int8_model(path):
+    """
+    Read an int8 serving artifact written by save_int8_model
+
+    Returns:
+        tuple: (layers with dequantized float32 weights, activation scales or None)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['format_version'])
+        if version != INT8_FORMAT_VERSION:
+            raise ValueError(f"Unsupported int8 artifact version: {version}")
+        layers = []
+        for spec in json.loads(str(data['layers'])):
+            weights = []
+            for weight in spec['weights']:
+                if weight['quantized']:
+                    weights.append(dequantize(data[weight['key']], data[f"{weight['key']}_scale"]))
+                else:
+                    weights.append(data[weight['key']].astype(np.float32))
+            layers.append((spec['class_name'], spec['config'], weights))
+        activation_scales = None
+        if 'activation_scales' in data:
+            activation_scales = json.loads(str(data['activation_scales']))
+    return layers, activation_scales
+
+
+class Int8LSTMEngine(NumpyLSTMEngine):
+    """
+    NumPy engine serving the int8 post-training-quantized artifact
+
+    Weights are stored as int8 and dequantized once at load time, so the
+    forward pass keeps using float32 BLAS. When the artifact carries
+    calibrated activation scales, the LSTM state and the dense layer
+    inputs are rounded to the int8 grid as well (quantize-dequantize),
+    which reproduces int8 activation numerics; NumPy has no int8 GEMM, so
+    this does not change latency.
+    """
+
+    name = 'int8'
+
+    def _read_layers(self, model_path):
+        layers, activation_scales = load_int8_model(model_path)
+        self._activation_scales = activation_scales
+        return layers
+
+    def __init__(self, model_path, max_length, max_batch=256, length_aware=False):
+        super().__init__(model_path, max_length, max_batch=max_batch, length_aware=length_aware)
+        if self._activation_scales:
+            self.state_scale = self._activation_scales['lstm_state']
+            self.dense_input_scales = [
+                self._activation_scales[f'dense_{i}_input'] for i in range(len(self.dense_layers))
+            ]
@@ -0,0 +1,276 @@
+"""
+Sampled per-request profiling for SpamShield AI
+
+With PROFILE_SAMPLE_RATE > 0 (or PROFILE_HEADER_TOKEN set and a request
+carrying a matching X-Profile header), prediction requests run under
+cProfile and each profile is written as a .prof file (pstats format: load
+it with `python -m pstats`, snakeviz or gprof2dot). /admin/profiles sums
+the most recent files from all workers into a table of the hottest
+functions (it needs PROFILE_HEADER_TOKEN).
+
+cProfile only sees the thread that enabled it. With micro-batching,
+inference runs in the batcher's thread, so the batcher profiles a sampled
+share of its batches itself ('micro_batch' profiles) and a /predict profile
+shows only the wait: /predict is then not profiled in the request thread,
+and an X-Profile request has the batch carrying its message profiled.
+Candidate-model comparisons run on their own
+background thread and appear in no profile.
+
+Usage:
+    python -m src.pipeline.request_profiler                  # hottest functions in PROFILE_DIR
+    python -m src.pipeline.request_profiler --sort cumulative --limit 40 --json
+"""
+
+import os
+import re
+import glob
+import hmac
+import json
+import time
+import pstats
+import random
+import cProfile
+import logging
+import argparse
+import threading
+
+from src.pipeline.metrics import metrics_registry, format_labels
+
+DEFAULT_PROFILE_DIR = 'profiles'
+SORT_KEYS = ('tottime', 'cumulative', 'calls')
+PROFILE_HEADER = 'X-Profile'
+
+
+class RequestProfiler:
+    """
+    Profiles a sample of prediction requests with cProfile
+
+    Connection Flow:
+    1. Receives: every /predict and /predict/batch call (app.py), only
+       when profiling is configured; otherwise app.py never calls it
+    2. Samples: a random sample_rate share of requests, plus requests whose
+       X-Profile header matches header_token. One request is profiled at a
+       time per process; a sampled request that finds the profiler busy
+       runs unprofiled (cProfile cannot profile two threads at once)
+    3. Writes: <time>-<pid>-<endpoint>-<ms>.prof to output_dir, keeping the
+       newest max_files
+    4. Summarizes: the newest files (any worker) into the hottest functions
+       for /admin/profiles
+    5. Also used by: MicroBatcher, which profiles sampled batches in its own
+       thread (cProfile does not follow work handed to other threads)
+
+    Args:
+        sample_rate (float): Share of requests profiled
+        output_dir (str): Where .prof files go (shared by gunicorn workers)
+        header_token (str): Secret that X-Profile must carry to force a
+            profile; None disables the header
+        max_files (int): Profiles kept on disk
+    """
+
+    def __init__(self, sample_rate=0.0, output_dir=DEFAULT_PROFILE_DIR, header_token=None, max_files=200):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if max_files < 1:
+            raise ValueError("max_files must be at least 1")
+        self.sample_rate = float(sample_rate)
+        self.output_dir = output_dir
+        self.header_token = header_token
+        self.max_files = int(max_files)
+        self.profiled = 0
+        self.skipped_busy = 0
+        self._busy = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build the profiler configured by PROFILE_* variables
+
+        Returns:
+            RequestProfiler: or None when neither PROFILE_SAMPLE_RATE nor
+                PROFILE_HEADER_TOKEN turns profiling on
+        """
+        sample_rate = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+        header_token = os.environ.get('PROFILE_HEADER_TOKEN') or None
+        if sample_rate <= 0 and header_token is None:
+            return None
+        return cls(
+            sample_rate=sample_rate,
+            output_dir=os.environ.get('PROFILE_DIR', DEFAULT_PROFILE_DIR),
+            header_token=header_token,
+            max_files=int(os.environ.get('PROFILE_MAX_FILES', '200'))
+        )
+
+    def forced(self, header_value=None):
+        """True when an X-Profile header value carries the token (compared in constant time)"""
+        if self.header_token is None:
+            return False
+        # Bytes, since compare_digest rejects non-ASCII str
+        return hmac.compare_digest((header_value or '').encode('utf-8'), self.header_token.encode('utf-8'))
+
+    def wants(self, header_value=None):
+        """True when this request should be profiled"""
+        if self.forced(header_value):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def run(self, endpoint, func, *args, **kwargs):
+        """
+        Call func under cProfile and write the profile
+
+        Args:
+            endpoint (str): Used in the file name, e.g. 'predict'
+
+        Returns:
+            Whatever func returns
+        """
+        if not self._busy.acquire(blocking=False):
+            with self._stats_lock:
+                self.skipped_busy += 1
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                self._write(profile, endpoint, time.perf_counter() - start)
+        finally:
+            self._busy.release()
+
+    def _write(self, profile, endpoint, seconds):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            name = (f"{time.strftime('%Y%m%dT%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-"
+                    f"{os.getpid()}-{endpoint}-{seconds * 1000.0:.0f}ms.prof")
+            profile.dump_stats(os.path.join(self.output_dir, name))
+            self._prune()
+        except OSError as e:
+            logging.warning(f"⚠️  Could not write request profile: {e}")
+            return
+        with self._stats_lock:
+            self.profiled += 1
+        metrics_registry.inc('spamshield_profiled_requests_total', format_labels(endpoint=endpoint))
+
+    def _prune(self):
+        files = profile_files(self.output_dir)
+        for path in files[:-self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def summary(self, last=50, sort='tottime', limit=25):
+        """Hottest functions over the newest `last` profiles (see summarize_profiles)"""
+        summary = summarize_profiles(self.output_dir, last=last, sort=sort, limit=limit)
+        summary['this_worker'] = self.stats()
+        return summary
+
+    def stats(self):
+        """Configuration and counters of this process for /health"""
+        with self._stats_lock:
+            return {
+                'pid': os.getpid(),
+                'sample_rate': self.sample_rate,
+                'header_enabled': self.header_token is not None,
+                'output_dir': self.output_dir,
+                'profiled': self.profiled,
+                'skipped_busy': self.skipped_busy
+            }
+
+
+def profile_files(output_dir):
+    """.prof files in output_dir, oldest first (names start with their timestamp)"""
+    return sorted(glob.glob(os.path.join(output_dir, '*.prof')), key=os.path.basename)
+
+
+def describe_function(func):
+    """'file:line(name)' like pstats, with the path shortened to the package"""
+    filename, line, name = func
+    if filename == '~':
+        return name
+    match = re.search(r'^.*[/\\](?:site-packages|python\d[\d.]*)[/\\](.*)$', filename)
+    if match:
+        filename = match.group(1)
+    elif os.path.isabs(filename) and filename.startswith(os.getcwd() + os.sep):
+        filename = os.path.relpath(filename)
+    return f"{filename}:{line}({name})"
+
+
+def summarize_profiles(output_dir, last=50, sort='tottime', limit=25):
+    """
+    Merge the newest profiles and rank functions
+
+    Args:
+        output_dir (str): Directory of .prof files
+        last (int): Newest profiles to merge
+        sort (str): 'tottime' (own time), 'cumulative' (including callees)
+            or 'calls'
+        limit (int): Functions returned
+
+    Returns:
+        dict: profiles merged, their files and the top functions with
+            calls and own/cumulative time (total and per request, ms)
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key '{sort}'. Choose from: {', '.join(SORT_KEYS)}")
+    files = profile_files(output_dir)[-last:] if last > 0 else []
+    summary = {'profiles': 0, 'sort': sort, 'files': [os.path.basename(path) for path in files], 'functions': []}
+    stats = None
+    for path in files:
+        try:
+            if stats is None:
+                stats = pstats.Stats(path)
+            else:
+                stats.add(path)
+            summary['profiles'] += 1
+        except (OSError, EOFError, TypeError, ValueError):
+            # Pruned by another worker, or still being written
+            continue
+    if stats is None:
+        return summary
+
+    column = {'tottime': 2, 'cumulative': 3, 'calls': 1}[sort]
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)[:limit]
+    requests = summary['profiles']
+    summary['total_ms'] = round(stats.total_tt * 1000.0, 3)
+    for func, (primitive_calls, calls, tottime, cumtime, _) in ranked:
+        summary['functions'].append({
+            'function': describe_function(func),
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'tottime_ms': round(tottime * 1000.0, 3),
+            'cumtime_ms': round(cumtime * 1000.0, 3),
+            'tottime_ms_per_request': round(tottime * 1000.0 / requests, 3),
+            'cumtime_ms_per_request': round(cumtime * 1000.0 / requests, 3)
+        })
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize sampled request profiles")
+    parser.add_argument('--dir', default=os.environ.get('PROFILE_DIR', DEFAULT_PROFILE_DIR), help="Profile directory")
+    parser.add_argument('--last', type=int, default=50, help="Newest profiles to merge")
+    parser.add_argument('--sort', choices=SORT_KEYS, default='tottime')
+    parser.add_argument('--limit', type=int, default=25)
+    parser.add_argument('--json', action='store_true', help="Print JSON instead of a table")
+    args = parser.parse_args(argv)
+
+    summary = summarize_profiles(args.dir, last=args.last, sort=args.sort, limit=args.limit)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print("=" * 70)
+    print(f"🔥 HOTTEST FUNCTIONS over {summary['profiles']} profiles in {args.dir} (by {args.sort})")
+    print("=" * 70)
+    print(f"{'calls':>9} {'own ms/req':>11} {'cum ms/req':>11}  function")
+    for entry in summary['functions']:
+        print(f"{entry['calls']:>9} {entry['tottime_ms_per_request']:>11.3f} "
+              f"{entry['cumtime_ms_per_request']:>11.3f}  {entry['function']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
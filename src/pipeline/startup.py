@@ -0,0 +1,119 @@
+"""
+Startup-time breakdown for SpamShield AI
+
+Every import and load step of the serving path is timed with
+startup_timer. With STARTUP_PROFILE=1 the breakdown is logged once the
+model is warm (gunicorn post_fork, or `python app.py`).
+
+Usage:
+    python -m src.pipeline.startup            # cold-start report of this process
+    python -m src.pipeline.startup --json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+
+# Modules whose presence in sys.modules shows what a cold start paid for
+HEAVY_MODULES = ('tensorflow', 'keras', 'pandas', 'sklearn', 'keras_preprocessing', 'nltk', 'h5py', 'joblib')
+
+
+def startup_profile_enabled():
+    """True when STARTUP_PROFILE asks for the startup report"""
+    return os.environ.get('STARTUP_PROFILE', '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class StartupTimer:
+    """
+    Wall time of named startup phases, in the order they finished
+
+    Nested phases are recorded separately, so a phase's time includes the
+    phases run inside it.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with-block as one phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases.append((name, elapsed))
+
+    def report(self):
+        """
+        Startup breakdown
+
+        Returns:
+            dict: phases (name, ms), pid and the heavy modules imported so far
+        """
+        with self._lock:
+            phases = list(self.phases)
+        return {
+            'pid': os.getpid(),
+            'phases': [{'name': name, 'ms': round(seconds * 1000.0, 1)} for name, seconds in phases],
+            'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in sys.modules]
+        }
+
+    def log_report(self):
+        """Log the breakdown as a table"""
+        report = self.report()
+        logging.info("=" * 70)
+        logging.info(f"⏱️  STARTUP BREAKDOWN (pid {report['pid']})")
+        for phase in report['phases']:
+            logging.info(f"   {phase['name']:<40} {phase['ms']:>10.1f} ms")
+        logging.info(f"   Heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+        logging.info("=" * 70)
+
+
+startup_timer = StartupTimer()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure SpamShield AI cold start")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    # Under `python -m` this module runs as __main__; app records into the
+    # imported module's timer
+    from src.pipeline.startup import startup_timer as timer
+
+    start = time.perf_counter()
+    with timer.phase('import app (total)'):
+        import app
+    loaded = app.predictor.warmup()
+    total_ms = (time.perf_counter() - start) * 1000.0
+
+    report = timer.report()
+    report['engine'] = app.predictor.engine_name
+    report['model_loaded'] = loaded
+    report['total_ms'] = round(total_ms, 1)
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+        return 0
+
+    print("\n" + "=" * 60)
+    print(f"COLD START ({report['engine']} engine, model loaded: {loaded})")
+    print("=" * 60)
+    for phase in report['phases']:
+        print(f"{phase['name']:<42} {phase['ms']:>10.1f} ms")
+    print(f"{'total (import + load + first inference)':<42} {report['total_ms']:>10.1f} ms")
+    print(f"Heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+    print("=" * 60 + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
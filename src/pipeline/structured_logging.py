@@ -0,0 +1,220 @@
+import os
+import re
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import random
+import hashlib
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that are not structured fields passed with extra=
+STANDARD_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+REDACTION_PATTERNS = (
+    (re.compile(r'http[s]?://\S+|www\.\S+'), '<url>'),
+    (re.compile(r'\S+@\S+'), '<email>'),
+    (re.compile(r'\d'), '#'),
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records (and counts them) instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """
+        Copy the record without formatting it
+
+        QueueHandler.prepare formats the message and any traceback on the
+        calling (request) thread. Here msg, args and exc_info are passed on
+        as they are, and the listener's handler formats them.
+        """
+        return copy.copy(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class AsyncLogging:
+    """
+    Queue-backed logging for the serving process
+
+    Connection Flow:
+    1. Receives: records from logging.* calls on request threads, which only
+       put them on a bounded in-memory queue (formatting and I/O happen
+       elsewhere; a full queue drops records instead of stalling requests)
+    2. Writes: a QueueListener thread formats them (JSON lines, or the
+       classic text format) and writes them to stderr
+    3. Restarts: the listener after fork (gunicorn workers), since threads
+       do not survive fork
+    4. Stops: at exit, after writing everything still queued
+    """
+
+    def __init__(self, level=logging.INFO, json_format=True, max_queue_size=10000):
+        self.level = level
+        self.json_format = json_format
+        self.max_queue_size = max_queue_size
+        self.handler = None
+        self.listener = None
+
+    def build_output_handler(self):
+        handler = logging.StreamHandler(sys.stderr)
+        if self.json_format:
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        return handler
+
+    def start(self):
+        """Route the root logger through a fresh queue and listener thread"""
+        root = logging.getLogger()
+        if self.handler is not None:
+            root.removeHandler(self.handler)
+        log_queue = queue.Queue(maxsize=self.max_queue_size)
+        self.handler = DroppingQueueHandler(log_queue)
+        self.listener = QueueListener(log_queue, self.build_output_handler(), respect_handler_level=False)
+        self.listener.start()
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+
+    def stop(self):
+        """Write out queued records and stop the listener thread"""
+        listener, self.listener = self.listener, None
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+
+    def dropped(self):
+        return self.handler.dropped if self.handler is not None else 0
+
+
+_async_logging = None
+_configure_lock = threading.Lock()
+
+
+def configure_logging():
+    """
+    Configure serving logs from LOG_LEVEL, LOG_FORMAT and LOG_QUEUE_SIZE
+
+    Replaces any handlers on the root logger. Safe to call more than once;
+    only the first call has an effect.
+
+    Returns:
+        AsyncLogging: The active configuration
+    """
+    global _async_logging
+    with _configure_lock:
+        if _async_logging is not None:
+            return _async_logging
+        level = getattr(logging, os.environ.get('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+        json_format = os.environ.get('LOG_FORMAT', 'json').lower() != 'text'
+        async_logging = AsyncLogging(
+            level=level,
+            json_format=json_format,
+            max_queue_size=int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+        )
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        async_logging.start()
+        atexit.register(shutdown_logging)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=async_logging.start)
+        _async_logging = async_logging
+        return async_logging
+
+
+def shutdown_logging():
+    """Flush and stop the log listener (registered with atexit)"""
+    if _async_logging is not None:
+        _async_logging.stop()
+
+
+def logging_stats():
+    """Dropped-record counter for /health"""
+    return {'dropped_records': _async_logging.dropped() if _async_logging is not None else 0}
+
+
+class RequestLogSampler:
+    """
+    Decides which requests get a per-request log record
+
+    Args:
+        sample_rate (float): Share of successful requests that are logged
+            (errors are always logged)
+        message_mode (str): How message bodies appear in logs:
+            'hash' (length and a short hash), 'truncate' (first
+            message_chars characters with URLs, emails and digits masked)
+            or 'none'
+        message_chars (int): Characters kept by 'truncate'
+    """
+
+    MESSAGE_MODES = ('hash', 'truncate', 'none')
+
+    def __init__(self, sample_rate=1.0, message_mode='hash', message_chars=32):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if message_mode not in self.MESSAGE_MODES:
+            raise ValueError(f"Unknown message mode '{message_mode}'. Choose from: {', '.join(self.MESSAGE_MODES)}")
+        self.sample_rate = float(sample_rate)
+        self.message_mode = message_mode
+        self.message_chars = int(message_chars)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            sample_rate=float(os.environ.get('LOG_SAMPLE_RATE', '1.0')),
+            message_mode=os.environ.get('LOG_MESSAGE_MODE', 'hash').lower(),
+            message_chars=int(os.environ.get('LOG_MESSAGE_CHARS', '32'))
+        )
+
+    def sampled(self, error=False):
+        """True when this request should be logged"""
+        return error or self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def message_fields(self, text):
+        """
+        Log fields describing a message without exposing its content
+
+        Returns:
+            dict: message_chars plus message_sha1 or message_preview
+        """
+        text = str(text)
+        fields = {'message_chars': len(text)}
+        if self.message_mode == 'hash':
+            fields['message_sha1'] = hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+        elif self.message_mode == 'truncate':
+            preview = text[:self.message_chars]
+            for pattern, replacement in REDACTION_PATTERNS:
+                preview = pattern.sub(replacement, preview)
+            fields['message_preview'] = preview + ('…' if len(text) > self.message_chars else '')
+        return fields
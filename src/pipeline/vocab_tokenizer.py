@@ -0,0 +1,180 @@
+import json
+from itertools import repeat
+import numpy as np
+
+# Default filters of keras_preprocessing.text.Tokenizer
+KERAS_FILTERS = '!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n'
+
+VOCAB_FORMAT_VERSION = 1
+
+
+class VocabTokenizer:
+    """
+    Serving-time tokenizer backed by a compact word → id vocabulary
+
+    Produces exactly the ids of keras_preprocessing's Tokenizer
+    (texts_to_sequences) for the same word_index, num_words, oov_token,
+    filters, lower and split settings, but only keeps the num_words ids
+    inference can emit and precomputes the filter translation table.
+
+    Args:
+        word_index (dict): word → id (ids start at 1)
+        num_words (int): Only ids below num_words are kept; other known
+            words map to the OOV id, like Keras
+        oov_token (str): OOV token (its id must be in word_index)
+        filters (str): Characters replaced by `split` before splitting
+        lower (bool): Lowercase texts first
+        split (str): Word separator
+    """
+
+    def __init__(self, word_index, num_words=None, oov_token=None,
+                 filters=KERAS_FILTERS, lower=True, split=' '):
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.filters = filters
+        self.lower = lower
+        self.split = split
+        self.vocab = {
+            word: index for word, index in word_index.items()
+            if not num_words or index < num_words
+        }
+        self.oov_index = word_index.get(oov_token) if oov_token is not None else None
+        self._translation = str.maketrans({c: split for c in filters})
+
+    @classmethod
+    def from_keras(cls, tokenizer):
+        """Build from a fitted keras_preprocessing Tokenizer"""
+        if getattr(tokenizer, 'char_level', False):
+            raise ValueError("Character-level tokenizers are not supported")
+        return cls(
+            tokenizer.word_index,
+            num_words=tokenizer.num_words,
+            oov_token=tokenizer.oov_token,
+            filters=tokenizer.filters,
+            lower=tokenizer.lower,
+            split=tokenizer.split
+        )
+
+    @property
+    def vocab_size(self):
+        """Largest id the tokenizer can emit, plus one"""
+        return max(self.vocab.values(), default=0) + 1
+
+    def words(self, text):
+        """Split one text into words the way Keras text_to_word_sequence does"""
+        if self.lower:
+            text = text.lower()
+        return [word for word in text.translate(self._translation).split(self.split) if word]
+
+    def text_to_sequence(self, text):
+        """Token ids of one text"""
+        words = self.words(text)
+        ids = map(self.vocab.get, words, repeat(self.oov_index, len(words)))
+        if self.oov_index is None:
+            return [i for i in ids if i is not None]
+        return list(ids)
+
+    def texts_to_sequences(self, texts):
+        """Keras-compatible list of id lists"""
+        return [self.text_to_sequence(text) for text in texts]
+
+    def texts_to_array(self, texts, maxlen, out=None):
+        """
+        Tokenize straight into a post-padded, post-truncated int32 array
+
+        Equivalent to pad_sequences(texts_to_sequences(texts), maxlen,
+        padding='post', truncating='post').
+
+        Args:
+            texts (list): Texts to tokenize
+            maxlen (int): Sequence length
+            out (np.ndarray): Optional preallocated int32 (n, maxlen) array
+
+        Returns:
+            tuple: (int32 array of shape (n, maxlen), untruncated token counts)
+        """
+        n = len(texts)
+        if out is None:
+            out = np.zeros((n, maxlen), dtype=np.int32)
+        else:
+            out[:n] = 0
+        lengths = np.zeros(n, dtype=np.int32)
+
+        # Inlined text_to_sequence: this loop is the serving hot path
+        get = self.vocab.get
+        oov_index = self.oov_index
+        translation = self._translation
+        split = self.split
+        lower = self.lower
+        for row, text in enumerate(texts):
+            if lower:
+                text = text.lower()
+            sequence = [get(word, oov_index) for word in text.translate(translation).split(split) if word]
+            if oov_index is None:
+                sequence = [i for i in sequence if i is not None]
+            count = len(sequence)
+            lengths[row] = count
+            if count:
+                if count > maxlen:
+                    sequence = sequence[:maxlen]
+                    count = maxlen
+                out[row, :count] = sequence
+        return out, lengths
+
+
+def save_vocab(path, tokenizer, max_length):
+    """
+    Write the serving vocabulary artifact (JSON, no pickle)
+
+    Holds only what inference needs: the tokenizer settings, max_length
+    and the words the model can see, listed in id order (words[i] has id
+    i + 1).
+
+    Args:
+        path (str): Output path, e.g. artifacts/vocab.json
+        tokenizer (VocabTokenizer): Tokenizer to save
+        max_length (int): Sequence length the model was trained with
+    """
+    words = [None] * (tokenizer.vocab_size - 1)
+    for word, index in tokenizer.vocab.items():
+        words[index - 1] = word
+    if any(word is None for word in words):
+        raise ValueError("Vocabulary ids must be contiguous from 1")
+
+    artifact = {
+        'format_version': VOCAB_FORMAT_VERSION,
+        'max_length': int(max_length),
+        'num_words': tokenizer.num_words,
+        'oov_token': tokenizer.oov_token,
+        'filters': tokenizer.filters,
+        'lower': tokenizer.lower,
+        'split': tokenizer.split,
+        'words': words
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_vocab(path):
+    """
+    Read a vocabulary artifact written by save_vocab
+
+    Returns:
+        tuple: (VocabTokenizer, max_length)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        artifact = json.load(f)
+    version = artifact.get('format_version')
+    if version != VOCAB_FORMAT_VERSION:
+        raise ValueError(f"Unsupported vocabulary artifact version: {version}")
+
+    word_index = {word: index for index, word in enumerate(artifact['words'], start=1)}
+    tokenizer = VocabTokenizer(
+        word_index,
+        num_words=artifact['num_words'],
+        oov_token=artifact['oov_token'],
+        filters=artifact['filters'],
+        lower=artifact['lower'],
+        split=artifact['split']
+    )
+    return tokenizer, artifact['max_length']
@@ -0,0 +1,30 @@
+from src.pipeline.prediction_cache import PredictionCache
+
+
+def test_write_from_before_a_reload_is_dropped():
+    cache = PredictionCache(max_size=10)
+    key = cache.make_key('win a free prize')
+
+    # Request A captured the old model state and missed the cache
+    cache.sync_version('v1')
+    assert cache.get(key, 'v1') is None
+
+    # A hot reload lands and request B syncs the cache to the new model
+    cache.sync_version('v2')
+
+    # A finishes with the old model's answer after the swap
+    cache.put(key, ('Legitimate', 0.9), 'v1')
+
+    assert cache.get(key, 'v2') is None
+    assert cache.stats()['stale_writes'] == 1
+    assert cache.stats()['size'] == 0
+
+
+def test_lookup_from_before_a_reload_misses():
+    cache = PredictionCache(max_size=10)
+    key = cache.make_key('win a free prize')
+    cache.sync_version('v2')
+    cache.put(key, ('Spam', 0.99), 'v2')
+
+    assert cache.get(key, 'v1') is None
+    assert cache.get(key, 'v2') == ('Spam', 0.99)